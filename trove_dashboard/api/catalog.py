@@ -0,0 +1,336 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Cross-request caches of catalog data that rarely changes, and of short
+lived snapshots of the instances, backups, clusters and configuration
+groups of the project.
+
+The data is kept in the Django cache per project and region, so every
+panel and every worker process sharing that cache reuses a single copy
+instead of asking the service for it again on each page load. Entries
+older than their lifetime are fetched again by the next request using
+them, which falls back on the old copy when that fails; they are dropped
+when twice as old.
+"""
+import collections
+import logging
+import time
+from urllib import parse
+
+from django.conf import settings
+from django.core import cache
+from horizon.utils.memoized import memoized
+from novaclient.v2 import flavors as nova_flavors
+from openstack_dashboard.dashboards.project.instances \
+    import utils as instance_utils
+from troveclient.v1 import backups as trove_backups
+from troveclient.v1 import clusters as trove_clusters
+from troveclient.v1 import configurations
+from troveclient.v1 import datastores
+from troveclient.v1 import instances as trove_instances
+
+from trove_dashboard.api import trove
+
+LOG = logging.getLogger(__name__)
+
+# Seconds the flavor list of a project is kept in the cache
+FLAVOR_CACHE_TTL = getattr(settings, 'TROVE_FLAVOR_CACHE_TTL', 600)
+# Seconds datastores, their versions and configuration parameters are
+# kept in the cache
+CATALOG_CACHE_TTL = getattr(settings, 'TROVE_CATALOG_CACHE_TTL', 3600)
+# Seconds the instance snapshot of a project is kept in the cache
+INSTANCE_SNAPSHOT_TTL = getattr(settings, 'TROVE_INSTANCE_SNAPSHOT_TTL', 30)
+# Seconds the backup, cluster and configuration group snapshots of a
+# project are kept in the cache
+SNAPSHOT_TTL = getattr(settings, 'TROVE_SNAPSHOT_TTL', INSTANCE_SNAPSHOT_TTL)
+
+# Resources rebuilt from the cache are detached from any client, their
+# managers are only there to satisfy troveclient.
+_DATASTORES = datastores.Datastores(None)
+_DATASTORE_VERSIONS = datastores.DatastoreVersions(None)
+_CONFIGURATION_PARAMETERS = configurations.ConfigurationParameters(None)
+_INSTANCES = trove_instances.Instances(None)
+_BACKUPS = trove_backups.Backups(None)
+_CLUSTERS = trove_clusters.Clusters(None)
+_CONFIGURATIONS = configurations.Configurations(None)
+
+
+def _cache_key(request, name):
+    return 'trove_dashboard:%s:%s:%s' % (
+        parse.quote(name), parse.quote(request.user.project_id or ''),
+        parse.quote(request.user.services_region or ''))
+
+
+def _fetch(key, fetch, ttl):
+    data = fetch()
+    cache.cache.set(key, {'fetched': time.time(), 'data': data}, ttl * 2)
+    return data
+
+
+def _cached(request, name, fetch, ttl):
+    """Return the cached result of fetch(), which must be picklable."""
+    key = _cache_key(request, name)
+    entry = cache.cache.get(key)
+    if entry is None:
+        return _fetch(key, fetch, ttl)
+    if time.time() - entry['fetched'] > ttl:
+        try:
+            return _fetch(key, fetch, ttl)
+        except Exception as e:
+            LOG.warning('Unable to refresh %(key)s: %(error)s',
+                        {'key': key, 'error': e})
+    return entry['data']
+
+
+def _cached_list(request, name, fetch, ttl):
+    """Return the cached list of dicts fetch() is turned into."""
+    # Only plain dicts are cached, resources hold a reference to their
+    # manager and client which cannot be pickled.
+    return _cached(request, name,
+                   lambda: [item.to_dict() for item in fetch()], ttl)
+
+
+@memoized
+def flavor_index(request):
+    """Return an ordered mapping of flavor id to flavor for the project."""
+    flavors = _cached_list(request, 'flavors',
+                           lambda: trove.flavor_list(request),
+                           FLAVOR_CACHE_TTL)
+    return collections.OrderedDict(
+        (str(info['id']), nova_flavors.Flavor(None, info, loaded=True))
+        for info in flavors)
+
+
+def flavor_list(request):
+    return list(flavor_index(request).values())
+
+
+def flavor_get(request, flavor_id):
+    flavor = flavor_index(request).get(str(flavor_id))
+    if flavor is None:
+        # Flavors created since the list was cached, or not listed for
+        # the project, are still looked up directly.
+        flavor = trove.flavor_get(request, flavor_id)
+    return flavor
+
+
+@memoized
+def datastore_flavor_choices(request, datastore, datastore_version):
+    """Return the sorted (id, label) flavor choices of a datastore version.
+
+    The choices are cached as sorted, the flavor list is neither fetched
+    nor sorted again for every datastore version shown.
+    """
+    def fetch():
+        flavors = trove.datastore_flavors(request, datastore,
+                                          datastore_version)
+        return [tuple(choice) for choice in
+                instance_utils.sort_flavor_list(request, flavors)]
+
+    return _cached(
+        request, 'datastore_flavor_choices:%s:%s' % (datastore,
+                                                     datastore_version),
+        fetch, FLAVOR_CACHE_TTL)
+
+
+@memoized
+def datastore_list(request):
+    datastore_list = _cached_list(request, 'datastores',
+                                  lambda: trove.datastore_list(request),
+                                  CATALOG_CACHE_TTL)
+    return [datastores.Datastore(_DATASTORES, info, loaded=True)
+            for info in datastore_list]
+
+
+@memoized
+def datastore_version_list(request, datastore):
+    versions = _cached_list(
+        request, 'datastore_versions:%s' % datastore,
+        lambda: trove.datastore_version_list(request, datastore),
+        CATALOG_CACHE_TTL)
+    return [datastores.DatastoreVersion(_DATASTORE_VERSIONS, info,
+                                        loaded=True)
+            for info in versions]
+
+
+@memoized
+def configuration_parameters_list(request, datastore, datastore_version):
+    parameters = _cached_list(
+        request, 'configuration_parameters:%s:%s' % (datastore,
+                                                     datastore_version),
+        lambda: trove.configuration_parameters_list(request, datastore,
+                                                    datastore_version),
+        CATALOG_CACHE_TTL)
+    return [configurations.ConfigurationParameter(_CONFIGURATION_PARAMETERS,
+                                                  info, loaded=True)
+            for info in parameters]
+
+
+class ResourceIndex(object):
+    """Resources by id, and by the value of each of their ``keys``.
+
+    ``keys`` maps the name of a key to the function returning its value
+    for a resource. Resources without a value for a key are not indexed
+    on it.
+    """
+    keys = {}
+
+    def __init__(self, resources):
+        self._by_id = collections.OrderedDict(
+            (resource.id, resource) for resource in resources)
+        self._by_key = dict((name, collections.defaultdict(list))
+                            for name in self.keys)
+        for resource in self._by_id.values():
+            for name, key in self.keys.items():
+                try:
+                    value = key(resource)
+                except (AttributeError, KeyError, TypeError):
+                    continue
+                self._by_key[name][value].append(resource)
+
+    def __iter__(self):
+        return iter(self._by_id.values())
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def get(self, resource_id):
+        return self._by_id.get(resource_id)
+
+    def lookup(self, name, value):
+        """Return the resources whose key ``name`` is value, in order."""
+        return list(self._by_key[name].get(value, ()))
+
+    def search(self, name, text):
+        """Return the resources whose key ``name`` contains text, in order.
+
+        The match ignores case and is tested once per distinct value.
+        """
+        text = text.lower()
+        matches = set()
+        for value, resources in self._by_key[name].items():
+            if text in str(value).lower():
+                matches.update(id(resource) for resource in resources)
+        return [resource for resource in self._by_id.values()
+                if id(resource) in matches]
+
+    @classmethod
+    def match(cls, name, resource, text):
+        """Return whether search would find resource for key ``name``."""
+        try:
+            value = cls.keys[name](resource)
+        except (AttributeError, KeyError, TypeError):
+            return False
+        return text.lower() in str(value).lower()
+
+
+class InstanceSnapshot(ResourceIndex):
+    """The instances of a project, indexed by name, status and datastore."""
+    keys = {
+        'name': lambda instance: instance.name,
+        'status': lambda instance: instance.status,
+        'datastore': lambda instance: instance.datastore['type'],
+    }
+
+    def with_status(self, *statuses):
+        """Return the instances in any of the given statuses, in order."""
+        if len(statuses) == 1:
+            return self.lookup('status', statuses[0])
+        return [instance for instance in self
+                if instance.status in statuses]
+
+
+class BackupSnapshot(ResourceIndex):
+    keys = {
+        'name': lambda backup: backup.name,
+        'status': lambda backup: backup.status,
+    }
+
+
+class ClusterSnapshot(ResourceIndex):
+    keys = {
+        'name': lambda cluster: cluster.name,
+        'datastore': lambda cluster: cluster.datastore['type'],
+        'task': lambda cluster: cluster.task['name'],
+    }
+
+
+class ConfigurationSnapshot(ResourceIndex):
+    keys = {
+        'name': lambda configuration: configuration.name,
+        'datastore': lambda configuration: configuration.datastore_name,
+    }
+
+
+@memoized
+def instance_snapshot(request):
+    """Return an InstanceSnapshot of all the instances of the project.
+
+    The snapshot is at most INSTANCE_SNAPSHOT_TTL seconds old, it backs
+    the instance choices of the dialogs and is not meant for the status
+    of a single instance, use trove.instance_get for that.
+    """
+    instances = _cached_list(request, 'instances',
+                             lambda: trove.instance_list_all(request),
+                             INSTANCE_SNAPSHOT_TTL)
+    return InstanceSnapshot(
+        trove_instances.Instance(_INSTANCES, info, loaded=True)
+        for info in instances)
+
+
+def instance_snapshot_invalidate(request):
+    cache.cache.delete(_cache_key(request, 'instances'))
+
+
+@memoized
+def backup_snapshot(request):
+    """Return a BackupSnapshot of all the backups of the project."""
+    backups = _cached_list(request, 'backups',
+                           lambda: trove.backup_list_all(request),
+                           SNAPSHOT_TTL)
+    return BackupSnapshot(trove_backups.Backup(_BACKUPS, info, loaded=True)
+                          for info in backups)
+
+
+def backup_snapshot_invalidate(request):
+    cache.cache.delete(_cache_key(request, 'backups'))
+
+
+@memoized
+def cluster_snapshot(request):
+    """Return a ClusterSnapshot of all the clusters of the project."""
+    clusters = _cached_list(request, 'clusters',
+                            lambda: trove.cluster_list_all(request),
+                            SNAPSHOT_TTL)
+    return ClusterSnapshot(
+        trove_clusters.Cluster(_CLUSTERS, info, loaded=True)
+        for info in clusters)
+
+
+def cluster_snapshot_invalidate(request):
+    cache.cache.delete(_cache_key(request, 'clusters'))
+
+
+@memoized
+def configuration_snapshot(request):
+    """Return a ConfigurationSnapshot of the configuration groups."""
+    configuration_list = _cached_list(
+        request, 'configurations',
+        lambda: trove.configuration_list_all(request), SNAPSHOT_TTL)
+    return ConfigurationSnapshot(
+        configurations.Configuration(_CONFIGURATIONS, info, loaded=True)
+        for info in configuration_list)
+
+
+def configuration_snapshot_invalidate(request):
+    cache.cache.delete(_cache_key(request, 'configurations'))
@@ -0,0 +1,49 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Lazy iteration over the pages of the Trove list calls.
+
+The list calls of trove_dashboard.api.trove return one page at a time, with
+the marker of the next one in ``next``. The generators below only ask for
+a page once the resources of the previous one have been consumed.
+"""
+
+
+def _next_marker(page):
+    # Calls without pagination return plain lists.
+    return getattr(page, 'next', None)
+
+
+def iter_pages(list_page, request, **kwargs):
+    """Yield the pages of ``list_page(request, marker=..., **kwargs)``.
+
+    :param list_page: list call returning a page with the marker of the
+        next one in ``next``.
+    """
+    page = list_page(request, **kwargs)
+    yield page
+    marker = _next_marker(page)
+    while marker:
+        page = list_page(request, marker=marker, **kwargs)
+        yield page
+        marker = _next_marker(page)
+
+
+def paginate(list_page, request, **kwargs):
+    """Yield the resources of every page of ``list_page``.
+
+    See ``iter_pages`` for the arguments.
+    """
+    for page in iter_pages(list_page, request, **kwargs):
+        for resource in page:
+            yield resource
@@ -41,25 +41,48 @@ class Backups(generic.View):
 
     @rest_utils.ajax()
     def get(self, request):
-        """Get a list of the Backups.
+        """Get a page of the Backups.
 
-        The returned result is an object with property 'items' and each
-        item under this is a backup.
+        The listing can be paged with the optional ``limit`` and ``marker``
+        query parameters, ``marker`` being the id of the last backup of the
+        previous page. ``limit`` defaults to the user's page size.
+
+        The returned result is an object with property 'items', each item
+        under this is a backup, and property 'has_more_data' telling
+        whether further pages are available.
         """
-        result = trove.backup_list(request)
+        limit = request.GET.get('limit')
+        if limit:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+            if limit < 1:
+                raise rest_utils.AjaxError(
+                    400, 'limit must be a positive integer')
+        result = trove.backup_list(request,
+                                   marker=request.GET.get('marker'),
+                                   limit=limit or None)
+        # Every instance is looked up once, however many backups it has.
+        # Instances deleted since their backup was taken are reported by
+        # id, like the backups table does.
+        instances = trove.instance_get_many(
+            request, [b.instance_id for b in result if b.instance_id])
         backups = []
         for b in result:
-            instance = trove.instance_get(request, b.instance_id)
+            instance = instances.get(b.instance_id)
             backups.append({'id': b.id,
                             'name': b.name,
                             'datastore': b.datastore.get('type'),
                             'datastoreversion': b.datastore.get('version'),
                             'created': b.created,
-                            'database': instance.name,
-                            'incremental': bool(b.parent_id),
+                            'database': (instance.name if instance
+                                         else b.instance_id),
+                            'incremental': bool(getattr(b, 'parent_id', None)),
                             'status': b.status
                             })
-        return backups
+        return {'items': backups,
+                'has_more_data': bool(result.next)}
 
     @rest_utils.ajax(data_required=True)
     def delete(self, request):
@@ -12,7 +12,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import codecs
+import collections
+import datetime
+import threading
+
 from django.conf import settings
+from django.core import cache
+from django.utils import timezone
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
 from keystoneauth1 import session
@@ -21,7 +28,15 @@ from novaclient import client as nova_client
 from openstack_auth import utils as auth_utils
 from openstack_dashboard.api import base
 from oslo_log import log as logging
+from swiftclient import client as swift_client
+from troveclient import exceptions as trove_exceptions
 from troveclient.v1 import client
+from troveclient.v1 import databases as trove_databases
+
+from trove_dashboard import exceptions
+
+from trove_dashboard.api import pagination
+from trove_dashboard.utils import concurrency
 
 # Supported compute versions
 NOVA_VERSIONS = base.APIVersionManager("compute", preferred_version=2)
@@ -30,28 +45,122 @@ NOVA_VERSIONS.load_supported_version(1.1,
 NOVA_VERSIONS.load_supported_version(2, {"client": nova_client, "version": 2})
 NOVA_VERSION = NOVA_VERSIONS.get_active_version()['version']
 
+# Maximum number of API clients kept alive per process
+CLIENT_POOL_SIZE = getattr(settings, 'TROVE_CLIENT_POOL_SIZE', 100)
+# Seconds the access lists of the users of an instance are cached
+USER_ACCESS_CACHE_TTL = getattr(settings, 'TROVE_USER_ACCESS_CACHE_TTL', 30)
+# Bytes read at once from the end of a published log when tailing it
+LOG_TAIL_BLOCK_SIZE = getattr(settings, 'TROVE_LOG_TAIL_BLOCK_SIZE',
+                              64 * 1024)
+# Bytes of a followed log returned at most by a single poll
+LOG_FOLLOW_MAX_BYTES = getattr(settings, 'TROVE_LOG_FOLLOW_MAX_BYTES',
+                               1024 * 1024)
+
 LOG = logging.getLogger(__name__)
 
+# Databases rebuilt from the cache are detached from any client.
+_DATABASES = trove_databases.Databases(None)
 
-@memoized
-def troveclient(request):
+
+class ClientPool(object):
+    """Bounded, thread-safe LRU pool of API clients.
+
+    Clients are keyed on the token, region and endpoint they were built
+    for, so the keep-alive connections held by their keystoneauth session
+    are reused by later requests of the same user instead of opening a
+    new TLS connection on every call.  An entry expires together with the
+    token it was created with.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._clients = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._clients)
+
+    @staticmethod
+    def _is_expired(expires):
+        if expires is None:
+            return False
+        if timezone.is_naive(expires):
+            expires = timezone.make_aware(expires, datetime.timezone.utc)
+        return expires <= timezone.now()
+
+    def get(self, key, expires, factory):
+        """Return the pooled client for key, building it when missing.
+
+        :param key: hashable (token id, region, endpoint) tuple.
+        :param expires: datetime after which the client must not be used.
+        :param factory: callable without arguments building a new client.
+        """
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is not None and not self._is_expired(entry[1]):
+                self._clients[key] = entry
+                return entry[0]
+
+        # Building a client is purely local work, don't hold the lock
+        # while doing it.
+        new_client = factory()
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is None or self._is_expired(entry[1]):
+                entry = (new_client, expires)
+            self._clients[key] = entry
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+        return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+
+_client_pool = ClientPool(CLIENT_POOL_SIZE)
+
+
+def _client_key(request, endpoint):
+    return (request.user.token.id, request.user.services_region, endpoint)
+
+
+def _keystone_session(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    endpoint_type = getattr(settings, 'OPENSTACK_ENDPOINT_TYPE', 'publicURL')
-    region = request.user.services_region
 
-    endpoint = base.url_for(request, 'database')
     auth_url, _ = auth_utils.fix_auth_url_version_prefix(
         settings.OPENSTACK_KEYSTONE_URL)
     auth = token_endpoint.Token(auth_url, request.user.token.id)
     verify = not insecure and (cacert or True)
+    return session.Session(auth=auth, verify=verify)
+
+
+@memoized
+def troveclient(request):
+    endpoint_type = getattr(settings, 'OPENSTACK_ENDPOINT_TYPE', 'publicURL')
+    region = request.user.services_region
+    endpoint = base.url_for(request, 'database')
 
-    t_client = client.Client(session=session.Session(auth=auth, verify=verify),
+    def _build_client():
+        return client.Client(session=_keystone_session(request),
                              service_type='database',
                              endpoint_type=endpoint_type,
                              region_name=region,
                              endpoint_override=endpoint)
-    return t_client
+
+    return _client_pool.get(_client_key(request, endpoint),
+                            getattr(request.user.token, 'expires', None),
+                            _build_client)
+
+
+def _get_many(get, request, ids, kind):
+    results, errors = concurrency.call_parallel(
+        lambda resource_id: get(request, resource_id), ids)
+    for resource_id, error in errors.items():
+        LOG.warning('Unable to retrieve %(kind)s %(id)s: %(error)s',
+                    {'kind': kind, 'id': resource_id, 'error': error})
+    return results
 
 
 def cluster_list(request, marker=None):
@@ -59,10 +168,22 @@ def cluster_list(request, marker=None):
     return troveclient(request).clusters.list(limit=page_size, marker=marker)
 
 
+def cluster_list_all(request):
+    return list(pagination.paginate(cluster_list, request))
+
+
 def cluster_get(request, cluster_id):
     return troveclient(request).clusters.get(cluster_id)
 
 
+def cluster_get_many(request, cluster_ids):
+    """Return a dict of cluster id to cluster for the given ids.
+
+    See instance_get_many.
+    """
+    return _get_many(cluster_get, request, cluster_ids, 'cluster')
+
+
 def cluster_delete(request, cluster_id):
     return troveclient(request).clusters.delete(cluster_id)
 
@@ -128,22 +249,23 @@ def instance_list(request, marker=None):
 
 
 def instance_list_all(request):
-    instances = instance_list(request)
-    marker = instances.next
-    while marker:
-        temp_instances = instance_list(request, marker=marker)
-        marker = temp_instances.next
-        for instance in temp_instances:
-            instances.append(instance)
-        instances.links = temp_instances.links
-    instances.next = None
-    return instances
+    return list(pagination.paginate(instance_list, request))
 
 
 def instance_get(request, instance_id):
     return troveclient(request).instances.get(instance_id)
 
 
+def instance_get_many(request, instance_ids):
+    """Return a dict of instance id to instance for the given ids.
+
+    The instances are retrieved concurrently. Instances which could not
+    be retrieved, e.g. because they were deleted in the meantime, are
+    left out of the result.
+    """
+    return _get_many(instance_get, request, instance_ids, 'instance')
+
+
 def instance_delete(request, instance_id):
     return troveclient(request).instances.delete(instance_id)
 
@@ -247,17 +369,35 @@ def database_create(request, instance_id, db_name, character_set=None,
 
 
 def database_delete(request, instance_id, db_name):
-    return troveclient(request).databases.delete(instance_id, db_name)
+    result = troveclient(request).databases.delete(instance_id, db_name)
+    user_access_invalidate(request, instance_id)
+    return result
 
 
-def backup_list(request):
-    return troveclient(request).backups.list()
+def backup_list(request, marker=None, limit=None, datastore=None,
+                instance_id=None):
+    limit = limit or utils.get_page_size(request)
+    return troveclient(request).backups.list(limit=limit, marker=marker,
+                                             datastore=datastore,
+                                             instance_id=instance_id)
+
+
+def backup_list_all(request):
+    return list(pagination.paginate(backup_list, request))
 
 
 def backup_get(request, backup_id):
     return troveclient(request).backups.get(backup_id)
 
 
+def backup_get_many(request, backup_ids):
+    """Return a dict of backup id to backup for the given ids.
+
+    See instance_get_many.
+    """
+    return _get_many(backup_get, request, backup_ids, 'backup')
+
+
 def backup_delete(request, backup_id):
     return troveclient(request).backups.delete(backup_id)
 
@@ -285,27 +425,24 @@ def backup_strategy_delete(request, instance_id=None, project_id=None):
         instance_id=instance_id, project_id=project_id)
 
 
+@memoized
 def nova_client_client(request):
-    insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
     endpoint_type = getattr(settings, 'OPENSTACK_ENDPOINT_TYPE', 'publicURL')
     region = request.user.services_region
-
     endpoint = base.url_for(request, 'compute')
-    auth_url, _ = auth_utils.fix_auth_url_version_prefix(
-        settings.OPENSTACK_KEYSTONE_URL)
-    auth = token_endpoint.Token(auth_url, request.user.token.id)
-    verify = not insecure and (cacert or True)
 
-    nova = nova_client.Client(
-        NOVA_VERSION,
-        session=session.Session(auth=auth, verify=verify),
-        endpoint_type=endpoint_type,
-        service_type='compute',
-        region_name=region,
-        endpoint_override=endpoint)
+    def _build_client():
+        return nova_client.Client(
+            NOVA_VERSION,
+            session=_keystone_session(request),
+            endpoint_type=endpoint_type,
+            service_type='compute',
+            region_name=region,
+            endpoint_override=endpoint)
 
-    return nova
+    return _client_pool.get(_client_key(request, endpoint),
+                            getattr(request.user.token, 'expires', None),
+                            _build_client)
 
 
 def flavor_list(request):
@@ -344,11 +481,16 @@ def user_create(request, instance_id, username, password,
     if host:
         user['host'] = host
 
-    return troveclient(request).users.create(instance_id, [user])
+    result = troveclient(request).users.create(instance_id, [user])
+    user_access_invalidate(request, instance_id)
+    return result
 
 
 def user_delete(request, instance_id, user, host=None):
-    return troveclient(request).users.delete(instance_id, user, hostname=host)
+    result = troveclient(request).users.delete(instance_id, user,
+                                               hostname=host)
+    user_access_invalidate(request, instance_id)
+    return result
 
 
 def user_update_attributes(request, instance_id, name, host=None,
@@ -360,8 +502,10 @@ def user_update_attributes(request, instance_id, name, host=None,
         new_attributes['password'] = new_password
     if new_host:
         new_attributes['host'] = new_host
-    return troveclient(request).users.update_attributes(
+    result = troveclient(request).users.update_attributes(
         instance_id, name, newuserattr=new_attributes, hostname=host)
+    user_access_invalidate(request, instance_id)
+    return result
 
 
 def user_list_access(request, instance_id, username, host=None):
@@ -369,14 +513,60 @@ def user_list_access(request, instance_id, username, host=None):
         instance_id, username, hostname=host)
 
 
+def _user_access_cache_key(request, instance_id):
+    return 'trove_dashboard:user_access:%s:%s' % (request.user.project_id,
+                                                  instance_id)
+
+
+def user_list_access_many(request, instance_id, users):
+    """Return the access lists of users of an instance.
+
+    ``users`` are (name, host) tuples, their access lists are retrieved
+    concurrently and cached for USER_ACCESS_CACHE_TTL seconds. Returns a
+    tuple (access, errors) of dicts keyed on the users, respectively to
+    the list of databases they can access and to the exception raised
+    while retrieving it. Users which no longer exist are in neither.
+    """
+    key = _user_access_cache_key(request, instance_id)
+    cached = cache.cache.get(key) or {}
+    missing = [user for user in users if user not in cached]
+    if missing:
+        results, errors = concurrency.call_parallel(
+            lambda user: user_list_access(request, instance_id, user[0],
+                                          host=user[1]),
+            missing)
+        for user, access in results.items():
+            # Only the names are cached, resources cannot be pickled.
+            cached[user] = [db.name for db in access]
+        errors = dict((user, error) for user, error in errors.items()
+                      if not isinstance(error, exceptions.NOT_FOUND))
+        cache.cache.set(key, cached, USER_ACCESS_CACHE_TTL)
+    else:
+        errors = {}
+    access = dict(
+        (user, [trove_databases.Database(_DATABASES, {'name': name},
+                                         loaded=True)
+                for name in cached[user]])
+        for user in users if user in cached)
+    return access, errors
+
+
+def user_access_invalidate(request, instance_id):
+    cache.cache.delete(_user_access_cache_key(request, instance_id))
+
+
 def user_grant_access(request, instance_id, username, databases, host=None):
-    return troveclient(request).users.grant(
+    result = troveclient(request).users.grant(
         instance_id, username, databases, hostname=host)
+    user_access_invalidate(request, instance_id)
+    return result
 
 
 def user_revoke_access(request, instance_id, username, database, host=None):
-    return troveclient(request).users.revoke(
+    result = troveclient(request).users.revoke(
         instance_id, username, database, hostname=host)
+    user_access_invalidate(request, instance_id)
+    return result
 
 
 def user_show_access(request, instance_id, username, host=None):
@@ -417,14 +607,155 @@ def log_discard(request, instance_id, log_name):
 
 
 def log_tail(request, instance_id, log_name, lines, swift=None):
+    if swift is not None:
+        if lines:
+            return lambda: _log_tail_ranges(request, instance_id, log_name,
+                                            lines, swift)
+        return lambda: _log_text(log_stream(request, instance_id, log_name,
+                                            swift))
     return troveclient(request).instances.log_generator(instance_id,
                                                         log_name,
                                                         lines=lines,
                                                         swift=swift)
 
 
-def configuration_list(request):
-    return troveclient(request).configurations.list()
+def _log_objects(request, instance_id, log_name, swift):
+    """Return the container of a published log and its objects, oldest first.
+    """
+    log_info = troveclient(request).instances.log_show(instance_id,
+                                                       log_name)
+    headers, objects = swift.get_container(log_info.container,
+                                           prefix=log_info.prefix)
+    objects = sorted((obj for obj in objects
+                      if obj['name'] != log_info.metafile),
+                     key=lambda obj: obj['last_modified'])
+    return log_info.container, objects
+
+
+def _log_tail_ranges(request, instance_id, log_name, lines, swift):
+    """Yield the last lines of a published log.
+
+    Unlike the troveclient log generator, which downloads every object
+    holding a part of the tail, only the trailing byte ranges of the
+    objects needed for the requested number of lines are read.
+    """
+    try:
+        container, objects = _log_objects(request, instance_id, log_name,
+                                          swift)
+        blocks = []
+        newlines = 0
+        for obj in reversed(objects):
+            end = obj['bytes']
+            # One more newline than lines is needed for the first of them
+            # to be complete.
+            while end > 0 and newlines <= lines:
+                start = max(0, end - LOG_TAIL_BLOCK_SIZE)
+                headers, block = swift.get_object(
+                    container, obj['name'],
+                    headers={'Range': 'bytes=%d-%d' % (start, end - 1)})
+                blocks.append(block)
+                newlines += block.count(b'\n')
+                end = start
+            if newlines > lines:
+                break
+    except swift_client.ClientException as e:
+        if e.http_status == 404:
+            raise trove_exceptions.GuestLogNotFoundError()
+        raise
+    data = b''.join(reversed(blocks)).decode('utf-8', 'replace')
+    tail = data.splitlines()[-lines:]
+    if tail:
+        yield '\n'.join(tail) + '\n'
+
+
+def log_stream(request, instance_id, log_name, swift):
+    """Yield the bytes of a published log as they are read from Swift."""
+    try:
+        container, objects = _log_objects(request, instance_id, log_name,
+                                          swift)
+        for obj in objects:
+            headers, body = swift.get_object(
+                container, obj['name'], resp_chunk_size=LOG_TAIL_BLOCK_SIZE)
+            for chunk in body:
+                yield chunk
+    except swift_client.ClientException as e:
+        if e.http_status == 404:
+            raise trove_exceptions.GuestLogNotFoundError()
+        raise
+
+
+def _log_text(chunks):
+    """Decode the bytes chunks of a log as they are read."""
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+def log_follow(request, instance_id, log_name, swift, cursor=None):
+    """Return the part of a published log written after a cursor.
+
+    A cursor is a tuple (index, offset) of the position in the log objects
+    ordered from the oldest, the returned tuple (data, cursor) holds the
+    new data and the cursor to follow the log from next. Without a cursor
+    no data is returned, only the cursor of the end of the log. At most
+    LOG_FOLLOW_MAX_BYTES are returned at once.
+    """
+    try:
+        container, objects = _log_objects(request, instance_id, log_name,
+                                          swift)
+        if cursor is None:
+            if not objects:
+                return '', (0, 0)
+            return '', (len(objects) - 1, objects[-1]['bytes'])
+
+        index, offset = cursor
+        if index >= len(objects):
+            # The log was discarded since, follow it from its start.
+            index, offset = 0, 0
+        blocks = []
+        remaining = LOG_FOLLOW_MAX_BYTES
+        while index < len(objects) and remaining > 0:
+            size = objects[index]['bytes']
+            if offset >= size:
+                if index == len(objects) - 1:
+                    break
+                index, offset = index + 1, 0
+                continue
+            end = min(size, offset + remaining)
+            headers, block = swift.get_object(
+                container, objects[index]['name'],
+                headers={'Range': 'bytes=%d-%d' % (offset, end - 1)})
+            if not block:
+                break
+            if end < size:
+                # Stop at a line end, the rest is returned by the next poll.
+                if b'\n' in block:
+                    block = block[:block.rindex(b'\n') + 1]
+                elif blocks:
+                    break
+            blocks.append(block)
+            remaining -= len(block)
+            offset += len(block)
+    except swift_client.ClientException as e:
+        if e.http_status == 404:
+            raise trove_exceptions.GuestLogNotFoundError()
+        raise
+    return b''.join(blocks).decode('utf-8', 'replace'), (index, offset)
+
+
+def configuration_list(request, marker=None, limit=None):
+    return troveclient(request).configurations.list(limit=limit,
+                                                    marker=marker)
+
+
+def configuration_list_all(request):
+    return list(pagination.paginate(configuration_list, request,
+                                    limit=utils.get_page_size(request)))
 
 
 def configuration_get(request, group_id):
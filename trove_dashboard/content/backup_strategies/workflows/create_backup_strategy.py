@@ -47,15 +47,15 @@ class BackupStrategyDetailsAction(workflows.Action):
     def populate_instance_choices(self, request, context):
         LOG.info("Obtaining list of instances.")
         try:
-            instances = api.trove.instance_list(request)
+            instances = api.catalog.instance_snapshot(request).with_status(
+                *project_tables.ACTIVE_STATES)
         except Exception:
             instances = []
             msg = _("Unable to list database instances to backup.")
             exceptions.handle(request, msg)
         choises = [(None, "")]
         for i in instances:
-            if i.status in project_tables.ACTIVE_STATES:
-                choises.append((i.id, i.name))
+            choises.append((i.id, i.name))
         return choises
 
 
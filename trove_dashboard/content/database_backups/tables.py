@@ -23,6 +23,7 @@ from horizon import tables
 from horizon.utils import filters
 
 from trove_dashboard import api
+from trove_dashboard.utils import tables as table_utils
 
 
 STATUS_CHOICES = (
@@ -122,34 +123,69 @@ class DeleteBackup(tables.DeleteAction):
 
     def delete(self, request, obj_id):
         api.trove.backup_delete(request, obj_id)
+        api.catalog.backup_snapshot_invalidate(request)
 
 
-class UpdateRow(tables.Row):
-    ajax = True
-
-    def get_data(self, request, backup_id):
-        backup = api.trove.backup_get(request, backup_id)
-        try:
-            backup.instance = api.trove.instance_get(request,
-                                                     backup.instance_id)
-        except Exception:
-            pass
-        return backup
+class BackupRow(table_utils.RowProjection):
+    """A backup as listed in the BackupsTable.
 
+    The source instance is kept by id, the InstanceColumn resolves the
+    instances of the page once for all the rows.
+    """
+    __slots__ = ('id', 'name', 'status', 'datastore', 'created',
+                 'instance_id', 'parent_id', 'locationRef')
 
-def db_link(obj):
-    if not hasattr(obj, 'instance'):
-        return
-    if hasattr(obj.instance, 'name'):
-        return reverse(
-            'horizon:project:databases:detail',
-            kwargs={'instance_id': obj.instance_id})
 
+class UpdateRow(table_utils.BatchUpdateRow):
+    def extra_data(self, request, backup):
+        return BackupRow(backup)
 
-def db_name(obj):
-    if not hasattr(obj, 'instance') or not hasattr(obj.instance, 'name'):
-        return obj.instance_id
-    return obj.instance.name
+    def get_data(self, request, backup_id):
+        return BackupRow(api.trove.backup_get(request, backup_id))
+
+    def get_page_data(self, request, marker=None):
+        return api.trove.backup_list(request, marker=marker)
+
+
+class InstanceColumn(tables.Column):
+    """Column showing the instance a backup was taken from.
+
+    Instances are only looked up when the column is rendered. The first
+    cell resolves the instances of every backup of the table data at once,
+    the page or the rows of a batch update, with one instance_get_many
+    call.
+    """
+
+    _instances = None
+
+    def _get_instance(self, backup):
+        instance_id = backup.instance_id
+        if self._instances is None:
+            self._instances = {}
+        if instance_id and instance_id not in self._instances:
+            instance_ids = set([instance_id])
+            instance_ids.update(datum.instance_id
+                                for datum in self.table.data or []
+                                if datum.instance_id)
+            instance_ids.difference_update(self._instances)
+            instances = api.trove.instance_get_many(self.table.request,
+                                                    instance_ids)
+            for missing_id in instance_ids:
+                # Deleted instances are kept as None and shown by id.
+                self._instances[missing_id] = instances.get(missing_id)
+        return self._instances.get(instance_id)
+
+    def get_raw_data(self, backup):
+        instance = self._get_instance(backup)
+        if instance is None:
+            return backup.instance_id
+        return instance.name
+
+    def get_link_url(self, backup):
+        if self._get_instance(backup) is None:
+            return None
+        return reverse(self.link,
+                       kwargs={'instance_id': backup.instance_id})
 
 
 def get_datastore(obj):
@@ -168,7 +204,15 @@ def is_incremental(obj):
     return hasattr(obj, 'parent_id') and obj.parent_id is not None
 
 
-class BackupsTable(tables.DataTable):
+class BackupsFilterAction(table_utils.SnapshotFilterAction):
+    filter_choices = (('name', _("Name ="), False),
+                      ('datastore', _("Datastore ="), True),
+                      ('instance_id', _("Database ID ="), True),
+                      ('status', _("Status ="), False))
+
+
+class BackupsTable(table_utils.BatchUpdateTableMixin,
+                   tables.DataTable):
     name = tables.Column("name",
                          link="horizon:project:database_backups:detail",
                          verbose_name=_("Name"))
@@ -178,8 +222,9 @@ class BackupsTable(tables.DataTable):
                                       verbose_name=_("Datastore Version"))
     created = tables.Column("created", verbose_name=_("Created"),
                             filters=[filters.parse_isotime])
-    instance = tables.Column(db_name, link=db_link,
-                             verbose_name=_("Database"))
+    instance = InstanceColumn("instance_id",
+                              link="horizon:project:databases:detail",
+                              verbose_name=_("Database"))
     incremental = tables.Column(is_incremental,
                                 verbose_name=_("Incremental"),
                                 filters=(d_filters.yesno,
@@ -195,5 +240,5 @@ class BackupsTable(tables.DataTable):
         verbose_name = _("Backups")
         status_columns = ["status"]
         row_class = UpdateRow
-        table_actions = (LaunchLink, DeleteBackup)
+        table_actions = (BackupsFilterAction, LaunchLink, DeleteBackup)
         row_actions = (RestoreLink, DownloadBackup, DeleteBackup)
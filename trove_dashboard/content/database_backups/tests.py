@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 from unittest import mock
 
 from django.urls import reverse
@@ -34,37 +35,147 @@ RESTORE_URL = reverse('horizon:project:databases:launch')
 class DatabasesBackupsTests(test.TestCase):
     @test.create_mocks({api.trove: ('backup_list', 'instance_get')})
     def test_index(self):
-        self.mock_backup_list.return_value = self.database_backups.list()
+        self.mock_backup_list.return_value = common.Paginated(
+            self.database_backups.list())
         self.mock_instance_get.return_value = self.databases.first()
 
         res = self.client.get(INDEX_URL)
 
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_backup_list.assert_called_once_with(
+            test.IsHttpRequest(), marker=None)
+        # Each distinct instance is looked up once for the whole page.
         self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_instance_get, 3,
+            self.mock_instance_get, 2,
             mock.call(test.IsHttpRequest(), test.IsA(str)))
         self.assertTemplateUsed(res, 'project/database_backups/index.html')
 
+    @test.create_mocks({api.trove: ('backup_list', 'instance_get_many')})
+    def test_index_rows_update(self):
+        backups = self.database_backups.list()
+        self.mock_backup_list.return_value = common.Paginated(backups)
+        self.mock_instance_get_many.return_value = dict(
+            (database.id, database) for database in self.databases.list())
+
+        res = self.client.get(INDEX_URL,
+                              {'action': 'rows_update',
+                               'table': 'backups',
+                               'obj_id': [backup.id for backup in backups]},
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual(set(backup.id for backup in backups),
+                         set(res.json()['rows']))
+        # The instances of all the rows are looked up together.
+        self.mock_instance_get_many.assert_called_once_with(
+            test.IsHttpRequest(),
+            set(backup.instance_id for backup in backups))
+
+    @test.create_mocks({api.trove: ('backup_list', 'instance_get')})
+    def test_index_instance_not_found(self):
+        backups = self.database_backups.list()
+        self.mock_backup_list.return_value = common.Paginated(backups)
+        self.mock_instance_get.side_effect = self.exceptions.trove
+
+        res = self.client.get(INDEX_URL)
+
+        self.assert_mock_multiple_calls_with_same_arguments(
+            self.mock_instance_get, 2,
+            mock.call(test.IsHttpRequest(), test.IsA(str)))
+        self.assertTemplateUsed(res, 'project/database_backups/index.html')
+        self.assertContains(res, backups[0].instance_id)
+        self.assertNotContains(
+            res, reverse('horizon:project:databases:detail',
+                         args=[backups[0].instance_id]))
+
+    @test.create_mocks({api.trove: ('backup_list', 'instance_get')})
+    def test_index_pagination(self):
+        backups = self.database_backups.list()
+        last_record = backups[-1]
+        self.mock_backup_list.return_value = common.Paginated(
+            backups, next_marker="foo")
+        self.mock_instance_get.return_value = self.databases.first()
+
+        res = self.client.get(INDEX_URL)
+
+        self.mock_backup_list.assert_called_once_with(
+            test.IsHttpRequest(), marker=None)
+        self.assertTemplateUsed(res, 'project/database_backups/index.html')
+        self.assertContains(res, 'marker=' + last_record.id)
+
     @test.create_mocks({api.trove: ('backup_list',)})
     def test_index_exception(self):
         self.mock_backup_list.side_effect = self.exceptions.trove
 
         res = self.client.get(INDEX_URL)
 
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_backup_list.assert_called_once_with(
+            test.IsHttpRequest(), marker=None)
         self.assertTemplateUsed(
             res, 'project/database_backups/index.html')
         self.assertEqual(res.status_code, 200)
         self.assertMessageCount(res, error=1)
 
+    @test.create_mocks({api.trove: ('backup_list', 'backup_list_all',
+                                    'backup_get_many', 'instance_get')})
+    def test_index_filter(self):
+        backups = self.database_backups.list()
+        self.mock_backup_list.return_value = common.Paginated(backups)
+        self.mock_backup_list_all.return_value = backups
+        self.mock_backup_get_many.return_value = dict(
+            (backup.id, backup) for backup in backups)
+        self.mock_instance_get.return_value = self.databases.first()
+
+        # Filters supported by Trove are passed to the list call.
+        self.client.post(INDEX_URL, {
+            'backups__filter__q_field': 'datastore',
+            'backups__filter__q': 'mysql'})
+        self.client.get(INDEX_URL)
+        self.mock_backup_list.assert_called_with(
+            test.IsHttpRequest(), marker=None, datastore='mysql')
+        calls = self.mock_backup_list.call_count
+
+        # The others are looked up in the snapshot of the backups.
+        self.client.post(INDEX_URL, {
+            'backups__filter__q_field': 'name',
+            'backups__filter__q': 'INCR'})
+        res = self.client.get(INDEX_URL)
+        self.assertEqual(['backup2-Incr'],
+                         [row.name for row in res.context['table'].data])
+        self.assertEqual(calls, self.mock_backup_list.call_count)
+        self.mock_backup_list_all.assert_called_once_with(
+            test.IsHttpRequest())
+
+    @test.create_mocks({api.trove: ('backup_list_all', 'backup_get_many',
+                                    'instance_get')})
+    def test_index_filter_rechecked(self):
+        backups = copy.deepcopy(self.database_backups.list())
+        for backup in backups:
+            backup._info['status'] = backup.status = 'NEW'
+        self.mock_backup_list_all.return_value = backups
+        # The first backup completed and the last one was deleted since the
+        # snapshot was taken.
+        current = self.database_backups.list()
+        self.mock_backup_get_many.return_value = {
+            current[0].id: current[0], backups[1].id: backups[1]}
+        self.mock_instance_get.return_value = self.databases.first()
+
+        self.client.post(INDEX_URL, {
+            'backups__filter__q_field': 'status',
+            'backups__filter__q': 'new'})
+        res = self.client.get(INDEX_URL)
+
+        self.assertEqual([backups[1].name],
+                         [row.name for row in res.context['table'].data])
+        self.mock_backup_get_many.assert_called_once_with(
+            test.IsHttpRequest(), [backup.id for backup in backups])
+
     @test.create_mocks({
-        api.trove: ('instance_list', 'backup_list', 'backup_create'),
+        api.trove: ('instance_list_all', 'backup_list_all', 'backup_create'),
         policy: ('check',),
     })
     def test_launch_backup(self):
         self.mock_check.return_value = True
-        self.mock_instance_list.return_value = self.databases.list()
-        self.mock_backup_list.return_value = self.database_backups.list()
+        self.mock_instance_list_all.return_value = self.databases.list()
+        self.mock_backup_list_all.return_value = self.database_backups.list()
 
         database = self.databases.first()
         backupName = "NewBackup"
@@ -79,8 +190,9 @@ class DatabasesBackupsTests(test.TestCase):
         res = self.client.post(BACKUP_URL, post)
 
         self.mock_check.assert_called_once_with((), test.IsHttpRequest())
-        self.mock_instance_list.assert_called_once_with(test.IsHttpRequest())
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_instance_list_all.assert_called_once_with(
+            test.IsHttpRequest())
+        self.mock_backup_list_all.assert_called_once_with(test.IsHttpRequest())
         self.mock_backup_create.assert_called_once_with(
             test.IsHttpRequest(),
             backupName,
@@ -92,30 +204,31 @@ class DatabasesBackupsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_mocks({
-        api.trove: ('instance_list', 'backup_list'),
+        api.trove: ('instance_list_all', 'backup_list_all'),
         policy: ('check',),
     })
     def test_launch_backup_exception(self):
         self.mock_check.return_value = True
-        self.mock_instance_list.side_effect = self.exceptions.trove
-        self.mock_backup_list.return_value = self.database_backups.list()
+        self.mock_instance_list_all.side_effect = self.exceptions.trove
+        self.mock_backup_list_all.return_value = self.database_backups.list()
 
         res = self.client.get(BACKUP_URL)
         self.mock_check.assert_called_once_with((), test.IsHttpRequest())
-        self.mock_instance_list.assert_called_once_with(test.IsHttpRequest())
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_instance_list_all.assert_called_once_with(
+            test.IsHttpRequest())
+        self.mock_backup_list_all.assert_called_once_with(test.IsHttpRequest())
         self.assertMessageCount(res, error=1)
         self.assertTemplateUsed(res,
                                 'project/database_backups/backup.html')
 
     @test.create_mocks({
-        api.trove: ('instance_list', 'backup_list', 'backup_create'),
+        api.trove: ('instance_list_all', 'backup_list_all', 'backup_create'),
         policy: ('check',),
     })
     def test_launch_backup_incr(self):
         self.mock_check.return_value = True
-        self.mock_instance_list.return_value = self.databases.list()
-        self.mock_backup_list.return_value = self.database_backups.list()
+        self.mock_instance_list_all.return_value = self.databases.list()
+        self.mock_backup_list_all.return_value = self.database_backups.list()
 
         database = self.databases.first()
         backupName = "NewBackup"
@@ -131,8 +244,9 @@ class DatabasesBackupsTests(test.TestCase):
         res = self.client.post(BACKUP_URL, post)
 
         self.mock_check.assert_called_once_with((), test.IsHttpRequest())
-        self.mock_instance_list.assert_called_once_with(test.IsHttpRequest())
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_instance_list_all.assert_called_once_with(
+            test.IsHttpRequest())
+        self.mock_backup_list_all.assert_called_once_with(test.IsHttpRequest())
         self.mock_backup_create.assert_called_once_with(
             test.IsHttpRequest(),
             backupName,
@@ -184,20 +298,35 @@ class DatabasesBackupsTests(test.TestCase):
             test.IsHttpRequest(), test.IsA(str))
         self.assertTemplateUsed(res, 'project/database_backups/details.html')
 
+    @test.create_mocks({api.trove: ('backup_get', 'instance_get')})
+    def test_detail_backup_incr_parent_error(self):
+        incr_backup = self.database_backups.list()[2]
+
+        self.mock_backup_get.side_effect = [incr_backup,
+                                            self.exceptions.trove]
+        self.mock_instance_get.return_value = self.databases.list()[1]
+
+        url = reverse('horizon:project:database_backups:detail',
+                      args=[incr_backup.id])
+        res = self.client.get(url)
+
+        self.assertEqual(2, self.mock_backup_get.call_count)
+        self.assertRedirectsNoFollow(res, INDEX_URL)
+        self.assertMessageCount(error=1)
+
     @test.create_mocks({
-        api.trove: ('backup_get', 'backup_list', 'configuration_list',
-                    'datastore_flavors', 'datastore_list',
-                    'datastore_version_list', 'instance_list'),
+        api.catalog: ('datastore_list', 'datastore_version_list'),
+        api.trove: ('backup_get', 'backup_list_all', 'configuration_list',
+                    'datastore_flavors', 'instance_list'),
         dash_api.cinder: ('volume_type_list',),
         dash_api.neutron: ('network_list_for_tenant',),
         dash_api.nova: ('availability_zone_list',),
-        policy: ('check',),
-    })
+        policy: ('check',)})
     def test_restore_backup(self):
         backup = self.database_backups.first()
         self.mock_check.return_value = True
         self.mock_backup_get.return_value = self.database_backups.first()
-        self.mock_backup_list.return_value = self.database_backups.list()
+        self.mock_backup_list_all.return_value = self.database_backups.list()
         self.mock_configuration_list.return_value = (
             self.database_configurations.list())
         self.mock_datastore_flavors.return_value = self.flavors.list()
@@ -218,7 +347,7 @@ class DatabasesBackupsTests(test.TestCase):
             self.mock_check, 5, mock.call((), test.IsHttpRequest()))
         self.mock_backup_get.assert_called_once_with(
             test.IsHttpRequest(), test.IsA(str))
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_backup_list_all.assert_called_once_with(test.IsHttpRequest())
         self.mock_configuration_list.assert_called_once_with(
             test.IsHttpRequest())
         self.mock_datastore_flavors.assert_called_once_with(
@@ -19,49 +19,54 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from horizon import exceptions
+from horizon import messages
 from horizon import tables as horizon_tables
 from horizon.utils import filters
 from horizon import views as horizon_views
 from horizon import workflows as horizon_workflows
+from oslo_log import log as logging
 
 from trove_dashboard import api
 from trove_dashboard.content.database_backups import tables
 from trove_dashboard.content.database_backups \
     import workflows
+from trove_dashboard.utils import concurrency
+from trove_dashboard.utils import tables as table_utils
 
+LOG = logging.getLogger(__name__)
 
-class IndexView(horizon_tables.DataTableView):
+
+class IndexView(table_utils.SnapshotFilterMixin,
+                horizon_tables.DataTableView):
     table_class = tables.BackupsTable
     template_name = 'project/database_backups/index.html'
     page_title = _("Backups")
 
-    def _get_extra_data(self, backup):
-        """Apply extra info to the backup."""
-        instance_id = backup.instance_id
-        # TODO(rdopieralski) It's not clear where this attribute is supposed
-        # to come from. At first glance it looks like it will always be {}.
-        if not hasattr(self, '_instances'):
-            self._instances = {}
-        instance = self._instances.get(instance_id)
-        if instance is None:
-            try:
-                instance = api.trove.instance_get(self.request, instance_id)
-            except Exception:
-                instance = _('Not Found')
-        backup.instance = instance
-        return backup
+    def has_more_data(self, table):
+        return self._more
+
+    def get_snapshot(self):
+        return api.catalog.backup_snapshot(self.request)
 
     def get_data(self):
-        # TODO(rmyers) Add pagination support after it is available
-        # https://blueprints.launchpad.net/trove/+spec/paginate-backup-list
+        marker = self.request.GET.get(
+            tables.BackupsTable._meta.pagination_param)
+        snapshot_filter = self.get_snapshot_filter()
         try:
-            backups = api.trove.backup_list(self.request)
-            backups = map(self._get_extra_data, backups)
+            # Source instances are resolved by the table when rendered.
+            if snapshot_filter:
+                backups = self.get_current_data(
+                    *snapshot_filter, get_many=api.trove.backup_get_many)
+            else:
+                backups = api.trove.backup_list(self.request, marker=marker,
+                                                **self.get_filters())
+                self._more = backups.next or False
         except Exception:
+            self._more = False
             backups = []
             msg = _('Error getting database backup list.')
             exceptions.handle(self.request, msg)
-        return backups
+        return [tables.BackupRow(backup) for backup in backups]
 
 
 class BackupView(horizon_workflows.WorkflowView):
@@ -92,19 +97,32 @@ class DetailView(horizon_views.APIView):
             msg = _('Unable to retrieve details for backup: %s') % backup_id
             exceptions.handle(self.request, msg, redirect=redirect)
 
-        try:
-            if hasattr(backup, 'parent_id') and backup.parent_id is not None:
-                backup.parent = api.trove.backup_get(request, backup.parent_id)
-        except Exception:
-            redirect = reverse('horizon:project:database_backups:index')
-            msg = (_('Unable to retrieve details for parent backup: %s')
-                   % backup.parent_id)
-            exceptions.handle(self.request, msg, redirect=redirect)
+        # The parent backup and the instance are retrieved together.
+        parent_id = getattr(backup, 'parent_id', None)
+        fetchers = {
+            'instance': lambda: api.trove.instance_get(request,
+                                                       backup.instance_id),
+        }
+        if parent_id is not None:
+            fetchers['parent'] = lambda: api.trove.backup_get(request,
+                                                              parent_id)
+        results, errors = concurrency.call_parallel(
+            lambda name: fetchers[name](), fetchers)
+        instance = results.get('instance')
+
+        if parent_id is not None:
+            if 'parent' not in results:
+                LOG.warning('Unable to retrieve parent backup %(id)s: '
+                            '%(error)s',
+                            {'id': parent_id, 'error': errors['parent']})
+                messages.error(
+                    request,
+                    _('Unable to retrieve details for parent backup: %s')
+                    % parent_id)
+                raise exceptions.Http302(
+                    reverse('horizon:project:database_backups:index'))
+            backup.parent = results['parent']
 
-        try:
-            instance = api.trove.instance_get(request, backup.instance_id)
-        except Exception:
-            instance = None
         context['backup'] = backup
         context['instance'] = instance
         return context
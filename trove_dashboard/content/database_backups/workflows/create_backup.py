@@ -56,17 +56,17 @@ class BackupDetailsAction(workflows.Action):
     def populate_instance_choices(self, request, context):
         LOG.info("Obtaining list of instances.")
         try:
-            instances = api.trove.instance_list(request)
+            instances = api.catalog.instance_snapshot(request).with_status(
+                *project_tables.ACTIVE_STATES)
         except Exception:
             instances = []
             msg = _("Unable to list database instances to backup.")
             exceptions.handle(request, msg)
-        return [(i.id, i.name) for i in instances
-                if i.status in project_tables.ACTIVE_STATES]
+        return [(i.id, i.name) for i in instances]
 
     def populate_parent_choices(self, request, context):
         try:
-            backups = api.trove.backup_list(request)
+            backups = api.trove.backup_list_all(request)
             choices = [(b.id, b.name) for b in backups
                        if b.status == 'COMPLETED']
         except Exception:
@@ -113,6 +113,7 @@ class CreateBackup(workflows.Workflow):
                                     context['description'],
                                     context['parent'],
                                     context['swift_container'])
+            api.catalog.backup_snapshot_invalidate(request)
             return True
         except Exception:
             LOG.exception("Exception while creating backup")
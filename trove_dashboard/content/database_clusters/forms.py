@@ -230,7 +230,7 @@ class LaunchForm(BaseClusterForm):
     @memoized.memoized_method
     def datastores(self, request):
         try:
-            return trove_api.trove.datastore_list(request)
+            return trove_api.catalog.datastore_list(request)
         except Exception:
             LOG.exception("Exception while obtaining datastores list")
             self._datastores = []
@@ -250,7 +250,7 @@ class LaunchForm(BaseClusterForm):
     @memoized.memoized_method
     def datastore_versions(self, request, datastore):
         try:
-            return trove_api.trove.datastore_version_list(request, datastore)
+            return trove_api.catalog.datastore_version_list(request, datastore)
         except Exception:
             LOG.exception("Exception while obtaining datastore version list")
             self._datastore_versions = []
@@ -404,6 +404,7 @@ class LaunchForm(BaseClusterForm):
                                            root_password=root_password,
                                            locality=self._get_locality(data),
                                            configuration=data['configuration'])
+            trove_api.catalog.cluster_snapshot_invalidate(request)
             messages.success(request,
                              _('Launched cluster "%s"') % data['name'])
             return True
@@ -485,7 +486,7 @@ class ClusterAddInstanceForm(BaseClusterForm):
 
     def handle(self, request, data):
         try:
-            flavor = trove_api.trove.flavor_get(request, data['flavor'])
+            flavor = trove_api.catalog.flavor_get(request, data['flavor'])
             manager = cluster_manager.get(data['cluster_id'])
             manager.add_instance(str(uuid.uuid4()),
                                  data.get('name', None),
@@ -31,6 +31,7 @@ from oslo_log import log as logging
 from trove_dashboard import api
 from trove_dashboard.content.database_clusters import cluster_manager
 from trove_dashboard.content.databases import db_capability
+from trove_dashboard.utils import tables as table_utils
 
 LOG = logging.getLogger(__name__)
 
@@ -62,6 +63,7 @@ class DeleteCluster(tables.BatchAction):
 
     def action(self, request, obj_id):
         api.trove.cluster_delete(request, obj_id)
+        api.catalog.cluster_snapshot_invalidate(request)
 
 
 class LaunchLink(tables.LinkAction):
@@ -117,19 +119,29 @@ class ResetPassword(tables.LinkAction):
         return urls.reverse(self.url, args=[cluster_id])
 
 
-class UpdateRow(tables.Row):
-    ajax = True
+class ClusterRow(table_utils.RowProjection):
+    """A cluster as listed in the ClustersTable."""
+    __slots__ = ('id', 'name', 'datastore', 'task', 'instances',
+                 'full_flavor')
 
-    @memoized.memoized_method
-    def get_data(self, request, cluster_id):
-        cluster = api.trove.cluster_get(request, cluster_id)
+
+class UpdateRow(table_utils.BatchUpdateRow):
+    def extra_data(self, request, cluster):
         try:
             # TODO(michayu): assumption that cluster is homogeneous
             flavor_id = cluster.instances[0]['flavor']['id']
-            cluster.full_flavor = api.trove.flavor_get(request, flavor_id)
+            flavor = api.catalog.flavor_get(request, flavor_id)
         except Exception:
-            pass
-        return cluster
+            return ClusterRow(cluster)
+        return ClusterRow(cluster, full_flavor=flavor)
+
+    @memoized.memoized_method
+    def get_data(self, request, cluster_id):
+        cluster = api.trove.cluster_get(request, cluster_id)
+        return self.extra_data(request, cluster)
+
+    def get_page_data(self, request, marker=None):
+        return api.trove.cluster_list(request, marker=marker)
 
 
 def get_datastore(cluster):
@@ -159,7 +171,14 @@ def get_task(cluster):
     return cluster.task["name"]
 
 
-class ClustersTable(tables.DataTable):
+class ClustersFilterAction(table_utils.SnapshotFilterAction):
+    filter_choices = (('name', _("Cluster Name ="), False),
+                      ('datastore', _("Datastore ="), False),
+                      ('task', _("Current Task ="), False))
+
+
+class ClustersTable(table_utils.BatchUpdateTableMixin,
+                    tables.DataTable):
     TASK_CHOICES = (
         ("none", True),
     )
@@ -184,7 +203,7 @@ class ClustersTable(tables.DataTable):
         verbose_name = _("Clusters")
         status_columns = ["task"]
         row_class = UpdateRow
-        table_actions = (LaunchLink, DeleteCluster)
+        table_actions = (ClustersFilterAction, LaunchLink, DeleteCluster)
         row_actions = (ClusterGrow, ClusterShrink, ResetPassword,
                        DeleteCluster)
 
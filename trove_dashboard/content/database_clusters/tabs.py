@@ -18,6 +18,7 @@ from django import template
 from django.utils.translation import gettext_lazy as _
 
 from horizon import exceptions
+from horizon import messages
 from horizon import tabs
 
 from trove_dashboard import api
@@ -63,26 +64,33 @@ class InstancesTab(tabs.TableTab):
         cluster = self.tab_group.kwargs['cluster']
         data = []
         try:
-            instances = api.trove.cluster_get(self.request,
-                                              cluster.id).instances
-            for instance in instances:
-                instance_info = api.trove.instance_get(self.request,
-                                                       instance['id'])
+            members = cluster.instances
+            instances = api.trove.instance_get_many(
+                self.request, [member['id'] for member in members])
+            for member in members:
+                instance_info = instances.get(member['id'])
+                if instance_info is None:
+                    continue
                 flavor_id = instance_info.flavor['id']
-                instance_info.full_flavor = api.trove.flavor_get(self.request,
-                                                                 flavor_id)
-                if "type" in instance:
-                    instance_info.type = instance["type"]
-                if "ip" in instance:
-                    instance_info.ip = instance["ip"]
-                if "hostname" in instance:
-                    instance_info.hostname = instance["hostname"]
+                instance_info.full_flavor = api.catalog.flavor_get(
+                    self.request, flavor_id)
+                if "type" in member:
+                    instance_info.type = member["type"]
+                if "ip" in member:
+                    instance_info.ip = member["ip"]
+                if "hostname" in member:
+                    instance_info.hostname = member["hostname"]
 
                 data.append(instance_info)
         except Exception:
             msg = _('Unable to get instances data.')
             exceptions.handle(self.request, msg)
             data = []
+        else:
+            if len(data) < len(members):
+                messages.warning(self.request,
+                                 _('Unable to get data for some instances '
+                                   'of this cluster.'))
         return data
 
 
@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import logging
 from unittest import mock
 
@@ -35,8 +36,8 @@ RESET_PASSWORD_VIEWNAME = 'horizon:project:database_clusters:reset_password'
 
 
 class ClustersTests(test.TestCase):
-    @test.create_mocks({trove_api.trove: ('cluster_list',
-                                          'flavor_list')})
+    @test.create_mocks({trove_api.catalog: ('flavor_list',),
+                        trove_api.trove: ('cluster_list',)})
     def test_index(self):
         clusters = common.Paginated(self.trove_clusters.list())
         self.mock_cluster_list.return_value = clusters
@@ -48,8 +49,8 @@ class ClustersTests(test.TestCase):
         self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
         self.assertTemplateUsed(res, 'project/database_clusters/index.html')
 
-    @test.create_mocks({trove_api.trove: ('cluster_list',
-                                          'flavor_list')})
+    @test.create_mocks({trove_api.catalog: ('flavor_list',),
+                        trove_api.trove: ('cluster_list',)})
     def test_index_flavor_exception(self):
         clusters = common.Paginated(self.trove_clusters.list())
         self.mock_cluster_list.return_value = clusters
@@ -72,8 +73,8 @@ class ClustersTests(test.TestCase):
         self.assertTemplateUsed(res, 'project/database_clusters/index.html')
         self.assertMessageCount(res, error=1)
 
-    @test.create_mocks({trove_api.trove: ('cluster_list',
-                                          'flavor_list')})
+    @test.create_mocks({trove_api.catalog: ('flavor_list',),
+                        trove_api.trove: ('cluster_list',)})
     def test_index_pagination(self):
         clusters = self.trove_clusters.list()
         last_record = clusters[1]
@@ -89,10 +90,55 @@ class ClustersTests(test.TestCase):
         self.assertContains(
             res, 'marker=' + last_record.id)
 
-    @test.create_mocks({trove_api.trove: ('datastore_flavors',
-                                          'datastore_list',
-                                          'datastore_version_list'),
-                        api.base: ['is_service_enabled']})
+    @test.create_mocks({trove_api.catalog: ('flavor_list',),
+                        trove_api.trove: ('cluster_list',
+                                          'cluster_list_all',
+                                          'cluster_get_many')})
+    def test_index_filter(self):
+        clusters = self.trove_clusters.list()
+        self.mock_cluster_list_all.return_value = clusters
+        self.mock_cluster_get_many.return_value = dict(
+            (cluster.id, cluster) for cluster in clusters)
+        self.mock_flavor_list.return_value = self.flavors.list()
+
+        self.client.post(INDEX_URL, {
+            'clusters__filter__q_field': 'datastore',
+            'clusters__filter__q': 'vertica'})
+        res = self.client.get(INDEX_URL)
+
+        self.assertEqual(['Test Cluster2'],
+                         [row.name for row in res.context['table'].data])
+        self.mock_cluster_list.assert_not_called()
+        self.mock_cluster_list_all.assert_called_once_with(
+            test.IsHttpRequest())
+
+    @test.create_mocks({trove_api.catalog: ('flavor_list',),
+                        trove_api.trove: ('cluster_list_all',
+                                          'cluster_get_many')})
+    def test_index_filter_rechecked(self):
+        clusters = self.trove_clusters.list()
+        building = [cluster for cluster in clusters
+                    if cluster.task['name'] == 'building']
+        self.mock_cluster_list_all.return_value = clusters
+        # The cluster finished building since the snapshot was taken.
+        built = copy.deepcopy(building[0])
+        built._info['task'] = built.task = {'name': 'NONE'}
+        self.mock_cluster_get_many.return_value = {built.id: built}
+        self.mock_flavor_list.return_value = self.flavors.list()
+
+        self.client.post(INDEX_URL, {
+            'clusters__filter__q_field': 'task',
+            'clusters__filter__q': 'building'})
+        res = self.client.get(INDEX_URL)
+
+        self.assertEqual([], list(res.context['table'].data))
+        self.mock_cluster_get_many.assert_called_once_with(
+            test.IsHttpRequest(), [building[0].id])
+
+    @test.create_mocks({
+        trove_api.catalog: ('datastore_list', 'datastore_version_list'),
+        trove_api.trove: ('datastore_flavors',),
+        api.base: ('is_service_enabled',)})
     def test_launch_cluster(self):
         self.mock_is_service_enabled.return_value = False
         self.mock_datastore_flavors.return_value = self.flavors.list()
@@ -169,10 +215,10 @@ class ClustersTests(test.TestCase):
         self.assertTrue(self._contains_datastore_in_attribute(
             fields['num_instances_vertica'], field_name))
 
-    @test.create_mocks({trove_api.trove: ('datastore_flavors',
-                                          'datastore_list',
-                                          'datastore_version_list'),
-                        api.base: ['is_service_enabled']})
+    @test.create_mocks({
+        trove_api.catalog: ('datastore_list', 'datastore_version_list'),
+        trove_api.trove: ('datastore_flavors',),
+        api.base: ('is_service_enabled',)})
     def launch_cluster_fields_setup(self, datastore, datastore_version):
         self.mock_is_service_enabled.return_value = False
         self.mock_datastore_flavors.return_value = self.flavors.list()
@@ -192,11 +238,10 @@ class ClustersTests(test.TestCase):
             test.IsHttpRequest(), test.IsA(str))
         return res.context_data['form'].fields
 
-    @test.create_mocks({trove_api.trove: ['datastore_flavors',
-                                          'cluster_create',
-                                          'datastore_list',
-                                          'datastore_version_list'],
-                        api.base: ['is_service_enabled']})
+    @test.create_mocks({
+        trove_api.catalog: ('datastore_list', 'datastore_version_list'),
+        trove_api.trove: ('datastore_flavors', 'cluster_create'),
+        api.base: ('is_service_enabled',)})
     def test_create_simple_cluster(self):
         self.mock_is_service_enabled.return_value = False
         self.mock_datastore_flavors.return_value = self.flavors.list()
@@ -250,12 +295,11 @@ class ClustersTests(test.TestCase):
         self.assertNoFormErrors(res)
         self.assertMessageCount(success=1)
 
-    @test.create_mocks({trove_api.trove: ['datastore_flavors',
-                                          'cluster_create',
-                                          'datastore_list',
-                                          'datastore_version_list'],
-                        api.neutron: ['network_list_for_tenant'],
-                        api.base: ['is_service_enabled']})
+    @test.create_mocks({
+        trove_api.catalog: ('datastore_list', 'datastore_version_list'),
+        trove_api.trove: ('datastore_flavors', 'cluster_create'),
+        api.neutron: ('network_list_for_tenant',),
+        api.base: ('is_service_enabled',)})
     def test_create_simple_cluster_neutron(self):
         self.mock_is_service_enabled.return_value = True
         self.mock_network_list_for_tenant.return_value = self.networks.list()
@@ -313,11 +357,10 @@ class ClustersTests(test.TestCase):
         self.assertNoFormErrors(res)
         self.assertMessageCount(success=1)
 
-    @test.create_mocks({trove_api.trove: ['datastore_flavors',
-                                          'cluster_create',
-                                          'datastore_list',
-                                          'datastore_version_list'],
-                        api.neutron: ['network_list_for_tenant']})
+    @test.create_mocks({
+        trove_api.catalog: ('datastore_list', 'datastore_version_list'),
+        trove_api.trove: ('datastore_flavors', 'cluster_create'),
+        api.neutron: ('network_list_for_tenant',)})
     def test_create_simple_cluster_exception(self):
         self.mock_network_list_for_tenant.return_value = self.networks.list()
         self.mock_datastore_flavors.return_value = self.flavors.list()
@@ -371,9 +414,8 @@ class ClustersTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
         self.assertMessageCount(error=1)
 
-    @test.create_mocks({trove_api.trove: ('cluster_get',
-                                          'instance_get',
-                                          'flavor_get',)})
+    @test.create_mocks({trove_api.catalog: ('flavor_get',),
+                        trove_api.trove: ('cluster_get', 'instance_get')})
     def test_details(self):
         cluster = self.trove_clusters.first()
         self.mock_cluster_get.return_value = cluster
@@ -383,9 +425,8 @@ class ClustersTests(test.TestCase):
         details_url = reverse('horizon:project:database_clusters:detail',
                               args=[cluster.id])
         res = self.client.get(details_url)
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_cluster_get, 2,
-            mock.call(test.IsHttpRequest(), cluster.id))
+        self.mock_cluster_get.assert_called_once_with(
+            test.IsHttpRequest(), cluster.id)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_instance_get, 3,
             mock.call(test.IsHttpRequest(), test.IsA(str)))
@@ -395,9 +436,8 @@ class ClustersTests(test.TestCase):
         self.assertTemplateUsed(res, 'horizon/common/_detail.html')
         self.assertContains(res, cluster.ip[0])
 
-    @test.create_mocks({trove_api.trove: ('cluster_get',
-                                          'instance_get',
-                                          'flavor_get',)})
+    @test.create_mocks({trove_api.catalog: ('flavor_get',),
+                        trove_api.trove: ('cluster_get', 'instance_get')})
     def test_details_without_locality(self):
         cluster = self.trove_clusters.list()[1]
         self.mock_cluster_get.return_value = cluster
@@ -407,9 +447,8 @@ class ClustersTests(test.TestCase):
         details_url = reverse('horizon:project:database_clusters:detail',
                               args=[cluster.id])
         res = self.client.get(details_url)
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_cluster_get, 2,
-            mock.call(test.IsHttpRequest(), cluster.id))
+        self.mock_cluster_get.assert_called_once_with(
+            test.IsHttpRequest(), cluster.id)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_instance_get, 3,
             mock.call(test.IsHttpRequest(), test.IsA(str)))
@@ -419,9 +458,8 @@ class ClustersTests(test.TestCase):
         self.assertTemplateUsed(res, 'horizon/common/_detail.html')
         self.assertNotContains(res, "Locality")
 
-    @test.create_mocks({trove_api.trove: ('cluster_get',
-                                          'instance_get',
-                                          'flavor_get',)})
+    @test.create_mocks({trove_api.catalog: ('flavor_get',),
+                        trove_api.trove: ('cluster_get', 'instance_get')})
     def test_details_with_locality(self):
         cluster = self.trove_clusters.first()
         self.mock_cluster_get.return_value = cluster
@@ -431,9 +469,8 @@ class ClustersTests(test.TestCase):
         details_url = reverse('horizon:project:database_clusters:detail',
                               args=[cluster.id])
         res = self.client.get(details_url)
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_cluster_get, 2,
-            mock.call(test.IsHttpRequest(), cluster.id))
+        self.mock_cluster_get.assert_called_once_with(
+            test.IsHttpRequest(), cluster.id)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_instance_get, 3,
             mock.call(test.IsHttpRequest(), test.IsA(str)))
@@ -444,6 +481,33 @@ class ClustersTests(test.TestCase):
                                      '_detail_overview.html')
         self.assertContains(res, "Location Policy")
 
+    @test.create_mocks({trove_api.catalog: ('flavor_get',),
+                        trove_api.trove: ('cluster_get', 'instance_get')})
+    def test_details_instance_exception(self):
+        cluster = self.trove_clusters.first()
+        missing_id = cluster.instances[0]['id']
+
+        def instance_get(request, instance_id):
+            if instance_id == missing_id:
+                raise self.exceptions.trove
+            return self.databases.first()
+
+        self.mock_cluster_get.return_value = cluster
+        self.mock_instance_get.side_effect = instance_get
+        self.mock_flavor_get.return_value = self.flavors.first()
+
+        details_url = reverse('horizon:project:database_clusters:detail',
+                              args=[cluster.id])
+        res = self.client.get(details_url)
+        self.mock_cluster_get.assert_called_once_with(
+            test.IsHttpRequest(), cluster.id)
+        self.assertEqual(3, self.mock_instance_get.call_count)
+        self.assert_mock_multiple_calls_with_same_arguments(
+            self.mock_flavor_get, 3,
+            mock.call(test.IsHttpRequest(), test.IsA(str)))
+        self.assertTemplateUsed(res, 'horizon/common/_detail.html')
+        self.assertMessageCount(res, warning=1)
+
     @test.create_mocks(
         {trove_api.trove: ('cluster_get',
                            'cluster_grow'),
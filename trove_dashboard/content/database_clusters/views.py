@@ -36,12 +36,14 @@ from trove_dashboard.content.database_clusters \
 from trove_dashboard.content.database_clusters import forms
 from trove_dashboard.content.database_clusters import tables
 from trove_dashboard.content.database_clusters import tabs
+from trove_dashboard.utils import tables as table_utils
 
 
 LOG = logging.getLogger(__name__)
 
 
-class IndexView(horizon_tables.DataTableView):
+class IndexView(table_utils.SnapshotFilterMixin,
+                horizon_tables.DataTableView):
     table_class = tables.ClustersTable
     template_name = 'project/database_clusters/index.html'
 
@@ -51,7 +53,7 @@ class IndexView(horizon_tables.DataTableView):
     @memoized.memoized_method
     def get_flavors(self):
         try:
-            flavors = api.trove.flavor_list(self.request)
+            flavors = api.catalog.flavor_list(self.request)
         except Exception:
             flavors = []
             msg = _('Unable to retrieve database size information.')
@@ -65,29 +67,35 @@ class IndexView(horizon_tables.DataTableView):
             flavors = self.get_flavors()
             flavor = flavors.get(cluster_flavor)
             if flavor is not None:
-                cluster.full_flavor = flavor
+                return tables.ClusterRow(cluster, full_flavor=flavor)
         except Exception:
             # ignore any errors and just return cluster unaltered
             pass
-        return cluster
+        return tables.ClusterRow(cluster)
+
+    def get_snapshot(self):
+        return api.catalog.cluster_snapshot(self.request)
 
     def get_data(self):
         marker = self.request.GET.get(
             tables.ClustersTable._meta.pagination_param)
+        snapshot_filter = self.get_snapshot_filter()
         # Gather our clusters
         try:
-            clusters = api.trove.cluster_list(self.request, marker=marker)
-            self._more = clusters.next or False
+            if snapshot_filter:
+                clusters = self.get_current_data(
+                    *snapshot_filter, get_many=api.trove.cluster_get_many)
+            else:
+                clusters = api.trove.cluster_list(self.request,
+                                                  marker=marker)
+                self._more = clusters.next or False
         except Exception:
             self._more = False
             clusters = []
             msg = _('Unable to retrieve database clusters.')
             exceptions.handle(self.request, msg)
 
-        for cluster in clusters:
-            self._extra_data(cluster)
-
-        return clusters
+        return [self._extra_data(cluster) for cluster in clusters]
 
 
 class LaunchClusterView(horizon_forms.ModalFormView):
@@ -123,7 +131,7 @@ class DetailView(horizon_tabs.TabbedTableView):
                     'for database cluster: %s') % cluster_id
             exceptions.handle(self.request, msg, redirect=redirect)
         try:
-            cluster.full_flavor = api.trove.flavor_get(
+            cluster.full_flavor = api.catalog.flavor_get(
                 self.request, cluster.instances[0]["flavor"]["id"])
         except Exception:
             LOG.error('Unable to retrieve flavor details'
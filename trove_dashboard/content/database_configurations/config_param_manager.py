@@ -13,6 +13,8 @@
 #    under the License.
 
 import builtins
+import collections
+import copy
 
 from django.core import cache
 from django.utils.translation import gettext_lazy as _
@@ -62,13 +64,48 @@ def dict_has_changes(original, other):
 
 
 class ConfigParamManager(object):
+    """Configuration group values being edited, kept in the cache.
+
+    ``set_param`` and ``remove_param`` only change the values in memory
+    and mark the manager dirty, ``save`` writes it back to the cache once.
+    Only the values changed since the group was loaded are stored next to
+    the original values, see ``__getstate__``.
+    """
 
     original_configuration_values = None
     configuration = None
+    _dirty = False
 
     def __init__(self, configuration_id):
         self.configuration_id = configuration_id
 
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state.pop('_dirty', None)
+        if self.configuration is not None:
+            original = self.original_configuration_values or {}
+            values = self.configuration.values
+            configuration = copy.copy(self.configuration)
+            del configuration.values
+            state['configuration'] = configuration
+            state['changed_values'] = dict(
+                (name, value) for name, value in values.items()
+                if name not in original or original[name] != value)
+            state['deleted_values'] = [name for name in original
+                                       if name not in values]
+        return state
+
+    def __setstate__(self, state):
+        changed_values = state.pop('changed_values', None)
+        deleted_values = state.pop('deleted_values', None)
+        self.__dict__.update(state)
+        if changed_values is not None:
+            values = dict(self.original_configuration_values or {})
+            for name in deleted_values:
+                values.pop(name, None)
+            values.update(changed_values)
+            self.configuration.values = values
+
     def configuration_get(self, request):
         if self.configuration is None:
             configuration = api.trove.configuration_get(
@@ -95,19 +132,37 @@ class ConfigParamManager(object):
         return ConfigParam(self.configuration_id, name, value)
 
     def get_param(self, name):
-        for key_name in self.configuration.values:
-            if key_name == name:
-                return self.create_config_value(
-                    key_name, self.configuration.values[key_name])
+        if name in self.configuration.values:
+            return self.create_config_value(
+                name, self.configuration.values[name])
         return None
 
+    def get_params(self):
+        return [self.create_config_value(name, value)
+                for name, value in self.configuration.values.items()]
+
+    def set_param(self, name, value):
+        values = self.configuration.values
+        if name not in values or values[name] != value:
+            values[name] = value
+            self._dirty = True
+
+    def remove_param(self, name):
+        del self.configuration.values[name]
+        self._dirty = True
+
+    def save(self):
+        if self._dirty:
+            update(self.configuration_id, self)
+            self._dirty = False
+
     def update_param(self, name, value):
-        self.configuration.values[name] = value
-        update(self.configuration_id, self)
+        self.set_param(name, value)
+        self.save()
 
     def delete_param(self, name):
-        del self.configuration.values[name]
-        update(self.configuration_id, self)
+        self.remove_param(name)
+        self.save()
 
     def add_param(self, name, value):
         self.update_param(name, value)
@@ -173,7 +228,60 @@ def validate_config_param_value(config_param, value):
     return None
 
 
+ParameterMeta = collections.namedtuple('ParameterMeta',
+                                       ['name', 'type', 'min', 'max'])
+
+
+class ParameterCatalog(object):
+    """Configuration parameters of a datastore version indexed by name.
+
+    The validation metadata of a parameter is extracted once, the first
+    time a value is validated or converted for it.
+    """
+
+    def __init__(self, parameters):
+        self._parameters = collections.OrderedDict(
+            (param.name, param) for param in parameters)
+        self._meta = {}
+
+    def __iter__(self):
+        return iter(self._parameters.values())
+
+    def __len__(self):
+        return len(self._parameters)
+
+    def __contains__(self, name):
+        return name in self._parameters
+
+    def get(self, name):
+        return self._parameters.get(name)
+
+    def names(self):
+        return sorted(self._parameters)
+
+    def get_meta(self, name):
+        if name not in self._meta:
+            param = self._parameters.get(name)
+            if param is None:
+                return None
+            self._meta[name] = ParameterMeta(
+                name, getattr(param, "type", None),
+                getattr(param, "min", None), getattr(param, "max", None))
+        return self._meta[name]
+
+    def validate(self, name, value):
+        meta = self.get_meta(name)
+        if meta is None:
+            return None
+        return validate_config_param_value(meta, value)
+
+    def adjust_type(self, name, value):
+        return adjust_type(self.get_meta(name).type, value)
+
+
 def find_parameter(name, config_params):
+    if isinstance(config_params, ParameterCatalog):
+        return config_params.get(name)
     for param in config_params:
         if param.name == name:
             return param
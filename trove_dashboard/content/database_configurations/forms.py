@@ -48,7 +48,7 @@ class CreateConfigurationForm(forms.SelfHandlingForm):
     @memoized.memoized_method
     def datastores(self, request):
         try:
-            return api.trove.datastore_list(request)
+            return api.catalog.datastore_list(request)
         except Exception:
             LOG.exception("Exception while obtaining datastores list")
             redirect = reverse('horizon:project:database_configurations:index')
@@ -59,7 +59,7 @@ class CreateConfigurationForm(forms.SelfHandlingForm):
     @memoized.memoized_method
     def datastore_versions(self, request, datastore):
         try:
-            return api.trove.datastore_version_list(request, datastore)
+            return api.catalog.datastore_version_list(request, datastore)
         except Exception:
             LOG.exception("Exception while obtaining datastore version list")
             redirect = reverse('horizon:project:database_configurations:index')
@@ -105,6 +105,7 @@ class CreateConfigurationForm(forms.SelfHandlingForm):
                                            description=data['description'],
                                            datastore=datastore,
                                            datastore_version=datastore_version)
+            api.catalog.configuration_snapshot_invalidate(request)
 
             messages.success(request, _('Created configuration group'))
         except Exception:
@@ -137,8 +138,9 @@ class AddParameterForm(forms.SelfHandlingForm):
     @memoized.memoized_method
     def parameters(self, request, datastore, datastore_version):
         try:
-            return api.trove.configuration_parameters_list(
-                request, datastore, datastore_version)
+            return config_param_manager.ParameterCatalog(
+                api.catalog.configuration_parameters_list(
+                    request, datastore, datastore_version))
         except Exception:
             LOG.exception(
                 "Exception while obtaining configuration parameter list")
@@ -149,14 +151,9 @@ class AddParameterForm(forms.SelfHandlingForm):
 
     def get_parameters(self, request, datastore, datastore_version):
         try:
-            choices = []
-
             self.parameters = self.parameters(
                 request, datastore, datastore_version)
-            for parameter in self.parameters:
-                choices.append((parameter.name, parameter.name))
-
-            return sorted(choices)
+            return [(name, name) for name in self.parameters.names()]
         except Exception:
             LOG.exception(
                 "Exception while obtaining configuration parameters list")
@@ -169,13 +166,10 @@ class AddParameterForm(forms.SelfHandlingForm):
         cleaned_data = super(AddParameterForm, self).clean()
 
         if "value" in cleaned_data:
-            config_param = config_param_manager.find_parameter(
-                cleaned_data["name"], self.parameters)
-            if config_param:
-                error_msg = config_param_manager.validate_config_param_value(
-                    config_param, cleaned_data["value"])
-                if error_msg:
-                    self._errors['value'] = self.error_class([error_msg])
+            error_msg = self.parameters.validate(cleaned_data["name"],
+                                                 cleaned_data["value"])
+            if error_msg:
+                self._errors['value'] = self.error_class([error_msg])
         return cleaned_data
 
     def handle(self, request, data):
@@ -183,10 +177,8 @@ class AddParameterForm(forms.SelfHandlingForm):
             (config_param_manager
              .get(request, self.initial["configuration_id"])
              .add_param(data["name"],
-                        config_param_manager.adjust_type(
-                            config_param_manager.find_parameter(
-                                data["name"], self.parameters).type,
-                            data["value"])))
+                        self.parameters.adjust_type(data["name"],
+                                                    data["value"])))
 
             new_values = config_param_manager.get(
                 request, self.initial["configuration_id"], use_cache=True
@@ -25,6 +25,7 @@ from oslo_serialization import jsonutils
 from trove_dashboard import api
 from trove_dashboard.content.database_configurations \
     import config_param_manager
+from trove_dashboard.utils import tables as table_utils
 
 
 class CreateConfiguration(tables.LinkAction):
@@ -59,6 +60,12 @@ class DeleteConfiguration(tables.DeleteAction):
 
     def delete(self, request, obj_id):
         api.trove.configuration_delete(request, obj_id)
+        api.catalog.configuration_snapshot_invalidate(request)
+
+
+class ConfigurationsFilterAction(table_utils.SnapshotFilterAction):
+    filter_choices = (('name', _("Configuration Group Name ="), False),
+                      ('datastore', _("Datastore ="), False))
 
 
 class ConfigurationsTable(tables.DataTable):
@@ -79,7 +86,8 @@ class ConfigurationsTable(tables.DataTable):
     class Meta(object):
         name = "configurations"
         verbose_name = _("Configuration Groups")
-        table_actions = [CreateConfiguration, DeleteConfiguration]
+        table_actions = [ConfigurationsFilterAction, CreateConfiguration,
+                         DeleteConfiguration]
         row_actions = [DeleteConfiguration]
 
 
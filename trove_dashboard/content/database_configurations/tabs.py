@@ -40,13 +40,11 @@ class ValuesTab(tabs.TableTab):
     template_name = "project/database_configurations/detail_param.html"
 
     def get_values_data(self):
-        values_data = []
+        # The detail view has just loaded the group into the cache.
         manager = config_param_manager.get(
-            self.request, self.tab_group.kwargs['configuration_id'])
-        for k, v in manager.get_configuration().values.items():
-            manager.add_param(k, v)
-            values_data.append(manager.create_config_value(k, v))
-        return values_data
+            self.request, self.tab_group.kwargs['configuration_id'],
+            use_cache=True)
+        return manager.get_params()
 
 
 class InstancesTab(tabs.TableTab):
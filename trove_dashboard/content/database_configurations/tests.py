@@ -40,6 +40,23 @@ class DatabaseConfigurationsTests(test.TestCase):
         self.assertTemplateUsed(res,
                                 'project/database_configurations/index.html')
 
+    @test.create_mocks({api.trove: ('configuration_list',
+                                    'configuration_list_all')})
+    def test_index_filter(self):
+        self.mock_configuration_list_all.return_value = (
+            self.database_configurations.list())
+
+        self.client.post(INDEX_URL, {
+            'configurations__filter__q_field': 'name',
+            'configurations__filter__q': 'CONFIG2'})
+        res = self.client.get(INDEX_URL)
+
+        self.assertEqual(['config2'],
+                         [row.name for row in res.context['table'].data])
+        self.mock_configuration_list.assert_not_called()
+        self.mock_configuration_list_all.assert_called_once_with(
+            test.IsHttpRequest())
+
     @test.create_mocks({api.trove: ('configuration_list',)})
     def test_index_exception(self):
         self.mock_configuration_list.side_effect = self.exceptions.trove
@@ -52,7 +69,7 @@ class DatabaseConfigurationsTests(test.TestCase):
         self.assertMessageCount(res, error=1)
 
     @test.create_mocks({
-        api.trove: ('datastore_list', 'datastore_version_list')})
+        api.catalog: ('datastore_list', 'datastore_version_list')})
     def test_create_configuration(self):
         self.mock_datastore_list.return_value = self.datastores.list()
         self.mock_datastore_version_list.return_value = (
@@ -65,7 +82,8 @@ class DatabaseConfigurationsTests(test.TestCase):
         self.assertTemplateUsed(res,
                                 'project/database_configurations/create.html')
 
-    @test.create_mocks({api.trove: ('datastore_list',)})
+    @test.create_mocks({
+        api.catalog: ('datastore_list',)})
     def test_create_configuration_exception_on_datastore(self):
         self.mock_datastore_list.side_effect = self.exceptions.trove
         toSuppress = ["trove_dashboard.content."
@@ -90,8 +108,8 @@ class DatabaseConfigurationsTests(test.TestCase):
                 log.setLevel(level)
 
     @test.create_mocks({
-        api.trove: ('datastore_list', 'datastore_version_list',
-                    'configuration_create')})
+        api.catalog: ('datastore_list', 'datastore_version_list'),
+        api.trove: ('configuration_create',)})
     def _test_create_test_configuration(self, config_description=''):
         self.mock_datastore_list.return_value = self.datastores.list()
         self.mock_datastore_version_list.return_value = (
@@ -135,8 +153,8 @@ class DatabaseConfigurationsTests(test.TestCase):
         self._test_create_test_configuration()
 
     @test.create_mocks({
-        api.trove: ('datastore_list', 'datastore_version_list',
-                    'configuration_create')})
+        api.catalog: ('datastore_list', 'datastore_version_list'),
+        api.trove: ('configuration_create',)})
     def test_create_test_configuration_exception(self):
         self.mock_datastore_list.return_value = self.datastores.list()
         self.mock_datastore_version_list.return_value = (
@@ -179,7 +197,9 @@ class DatabaseConfigurationsTests(test.TestCase):
         details_url = self._get_url_with_arg(DETAIL_URL, config.id)
         url = details_url + '?tab=configuration_details__details'
         res = self.client.get(url)
-        self.assertEqual(2, self.mock_configuration_get.call_count)
+        # The values tab reuses the group loaded by the view.
+        self.mock_configuration_get.assert_called_once_with(
+            test.IsHttpRequest(), config.id)
         self.assertTemplateUsed(res,
                                 'project/database_configurations/details.html')
 
@@ -195,9 +215,9 @@ class DatabaseConfigurationsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_mocks({
-        api.trove: ('configuration_parameters_list',),
-        config_param_manager.ConfigParamManager:
-            ('get_configuration', 'configuration_get',)})
+        api.catalog: ('configuration_parameters_list',),
+        config_param_manager.ConfigParamManager: ('get_configuration',
+                                                  'configuration_get')})
     def test_add_parameter(self):
         config = self.database_configurations.first()
         self.mock_get_configuration.return_value = config
@@ -219,9 +239,9 @@ class DatabaseConfigurationsTests(test.TestCase):
             res, 'project/database_configurations/add_parameter.html')
 
     @test.create_mocks({
-        api.trove: ('configuration_parameters_list',),
-        config_param_manager.ConfigParamManager:
-            ('get_configuration', 'configuration_get',)})
+        api.catalog: ('configuration_parameters_list',),
+        config_param_manager.ConfigParamManager: ('get_configuration',
+                                                  'configuration_get')})
     def test_add_parameter_exception_on_parameters(self):
         try:
             config = self.database_configurations.first()
@@ -264,14 +284,10 @@ class DatabaseConfigurationsTests(test.TestCase):
         finally:
             config_param_manager.delete(config.id)
 
-    @test.create_mocks(
-        {
-            api.trove:
-                ('configuration_parameters_list', 'configuration_update',
-                 'configuration_get'),
-            config_param_manager.ConfigParamManager: ('add_param',)
-        }
-    )
+    @test.create_mocks({
+        api.catalog: ('configuration_parameters_list',),
+        api.trove: ('configuration_update', 'configuration_get'),
+        config_param_manager.ConfigParamManager: ('add_param',)})
     def test_add_new_parameter(self):
         config = self.database_configurations.first()
 
@@ -313,7 +329,8 @@ class DatabaseConfigurationsTests(test.TestCase):
             config_param_manager.delete(config.id)
 
     @test.create_mocks({
-        api.trove: ('configuration_get', 'configuration_parameters_list',),
+        api.catalog: ('configuration_parameters_list',),
+        api.trove: ('configuration_get',),
         config_param_manager: ('get',)})
     def test_add_parameter_invalid_value(self):
         try:
@@ -373,8 +390,10 @@ class DatabaseConfigurationsTests(test.TestCase):
             url = details_url + '?tab=configuration_details__instance'
 
             res = self.client.get(url)
-            self.assert_mock_multiple_calls_with_same_arguments(
-                self.mock_get, 2, mock.call(test.IsHttpRequest(), config.id))
+            self.assertEqual(
+                [mock.call(test.IsHttpRequest(), config.id),
+                 mock.call(test.IsHttpRequest(), config.id, use_cache=True)],
+                self.mock_get.call_args_list)
             self.mock_configuration_instances.assert_called_once_with(
                 test.IsHttpRequest(), config.id)
             table_data = res.context['instances_table'].data
@@ -407,8 +426,10 @@ class DatabaseConfigurationsTests(test.TestCase):
             url = details_url + '?tab=configuration_details__instance'
 
             res = self.client.get(url)
-            self.assert_mock_multiple_calls_with_same_arguments(
-                self.mock_get, 2, mock.call(test.IsHttpRequest(), config.id))
+            self.assertEqual(
+                [mock.call(test.IsHttpRequest(), config.id),
+                 mock.call(test.IsHttpRequest(), config.id, use_cache=True)],
+                self.mock_get.call_args_list)
             self.mock_configuration_instances.assert_called_once_with(
                 test.IsHttpRequest(), config.id)
             table_data = res.context['instances_table'].data
@@ -435,3 +456,76 @@ class DatabaseConfigurationsTests(test.TestCase):
                     dsv.name == datastore_version_name):
                 return dsv
         return None
+
+
+class ConfigParamManagerTests(test.TestCase):
+    def _get_manager(self):
+        config = self.database_configurations.first()
+        with mock.patch.object(api.trove, 'configuration_get',
+                               return_value=config):
+            return config_param_manager.get(self.request, config.id)
+
+    def tearDown(self):
+        config_param_manager.delete(
+            self.database_configurations.first().id)
+        super(ConfigParamManagerTests, self).tearDown()
+
+    def test_unchanged_param_not_saved(self):
+        manager = self._get_manager()
+        name, value = list(manager.get_configuration().values.items())[0]
+
+        with mock.patch.object(config_param_manager, 'update') as update:
+            manager.set_param(name, value)
+            manager.save()
+
+        update.assert_not_called()
+        self.assertFalse(manager.has_changes())
+
+    def test_changes_saved_once(self):
+        manager = self._get_manager()
+        names = list(manager.get_configuration().values)
+
+        with mock.patch.object(config_param_manager, 'update') as update:
+            manager.set_param(names[0], 'changed')
+            manager.remove_param(names[1])
+            manager.set_param('new_param', 1)
+            manager.save()
+
+        update.assert_called_once_with(manager.configuration_id, manager)
+
+    def test_cached_state_holds_changes(self):
+        manager = self._get_manager()
+        names = list(manager.get_configuration().values)
+        manager.set_param(names[0], 'changed')
+        manager.remove_param(names[1])
+        manager.save()
+
+        state = manager.__getstate__()
+        self.assertEqual({names[0]: 'changed'}, state['changed_values'])
+        self.assertEqual([names[1]], state['deleted_values'])
+
+        cached = config_param_manager.get(
+            self.request, manager.configuration_id, use_cache=True)
+        self.assertEqual(manager.get_configuration().values,
+                         cached.get_configuration().values)
+        self.assertTrue(cached.has_changes())
+
+    def test_parameter_catalog(self):
+        parameters = self.configuration_parameters.list()
+        catalog = config_param_manager.ParameterCatalog(parameters)
+
+        self.assertEqual(len(parameters), len(catalog))
+        self.assertEqual(sorted(p.name for p in parameters), catalog.names())
+        self.assertEqual(parameters[0], catalog.get(parameters[0].name))
+        self.assertIsNone(catalog.get('unknown'))
+        self.assertEqual(parameters[0], config_param_manager.find_parameter(
+            parameters[0].name, catalog))
+
+        meta = catalog.get_meta('autocommit')
+        self.assertEqual(('integer', 0, 1), (meta.type, meta.min, meta.max))
+        self.assertIs(meta, catalog.get_meta('autocommit'))
+        self.assertIsNone(catalog.validate('autocommit', '1'))
+        self.assertEqual('Value must be a number.',
+                         catalog.validate('autocommit', 'on'))
+        self.assertIsNone(catalog.validate('unknown', 'on'))
+        self.assertEqual(1, catalog.adjust_type('autocommit', '1'))
@@ -31,16 +31,28 @@ from trove_dashboard.content.database_configurations \
     import tables
 from trove_dashboard.content.database_configurations \
     import tabs
+from trove_dashboard.utils import tables as table_utils
 
 
-class IndexView(horizon_tables.DataTableView):
+class IndexView(table_utils.SnapshotFilterMixin,
+                horizon_tables.DataTableView):
     table_class = tables.ConfigurationsTable
     template_name = 'project/database_configurations/index.html'
     page_title = _("Configuration Groups")
 
+    def has_more_data(self, table):
+        return self._more
+
+    def get_snapshot(self):
+        return api.catalog.configuration_snapshot(self.request)
+
     def get_data(self):
+        snapshot_filter = self.get_snapshot_filter()
         try:
-            configurations = api.trove.configuration_list(self.request)
+            if snapshot_filter:
+                configurations = self.get_snapshot_data(*snapshot_filter)
+            else:
+                configurations = api.trove.configuration_list(self.request)
         except Exception:
             configurations = []
             msg = _('Error getting configuration group list.')
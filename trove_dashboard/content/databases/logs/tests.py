@@ -13,6 +13,7 @@
 #    under the License.
 
 import logging
+import time
 from unittest import mock
 
 from django import http
@@ -20,6 +21,7 @@ from django.urls import reverse
 from swiftclient import client as swift_client
 
 from trove_dashboard import api
+from trove_dashboard.content.databases.logs import views
 from trove_dashboard.test import helpers as test
 
 LINES = 50
@@ -27,7 +29,8 @@ LINES = 50
 
 class LogsTests(test.TestCase):
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'root_show')})
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'root_show')})
     def test_log_tab(self):
         database = self.databases.first()
         database_id = database.id
@@ -55,7 +58,8 @@ class LogsTests(test.TestCase):
             res, 'horizon/common/_detail_table.html')
 
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'root_show')})
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'root_show')})
     def test_log_tab_exception(self):
         database = self.databases.first()
         database_id = database.id
@@ -97,7 +101,8 @@ class LogsTests(test.TestCase):
                 log.setLevel(level)
 
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'log_publish',)
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'log_publish',)
     })
     def test_log_publish(self):
         database = self.databases.first()
@@ -125,7 +130,8 @@ class LogsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, url)
 
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'log_publish',)
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'log_publish',)
     })
     def test_log_publish_exception(self):
         database = self.databases.first()
@@ -153,7 +159,8 @@ class LogsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, url)
 
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'log_enable',)
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'log_enable',)
     })
     def test_log_enable(self):
         database = self.databases.first()
@@ -181,7 +188,8 @@ class LogsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, url)
 
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'log_enable',)
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'log_enable',)
     })
     def test_log_enable_exception(self):
         database = self.databases.first()
@@ -209,7 +217,8 @@ class LogsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, url)
 
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'log_discard',)
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'log_discard',)
     })
     def test_log_discard(self):
         database = self.databases.first()
@@ -237,7 +246,8 @@ class LogsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, url)
 
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'log_discard',)
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'log_discard',)
     })
     def test_log_discard_exception(self):
         database = self.databases.first()
@@ -265,7 +275,8 @@ class LogsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, url)
 
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'log_disable',)
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'log_disable',)
     })
     def test_log_disable(self):
         database = self.databases.first()
@@ -293,7 +304,8 @@ class LogsTests(test.TestCase):
         self.assertRedirectsNoFollow(res, url)
 
     @test.create_mocks({
-        api.trove: ('flavor_get', 'instance_get', 'log_list', 'log_disable',)
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list', 'log_disable',)
     })
     def test_log_disable_exception(self):
         database = self.databases.first()
@@ -378,3 +390,185 @@ class LogsTests(test.TestCase):
             LINES,
             self.mock_Connection())
         self.assertContains(res, "Unable to load")
+
+    @test.create_mocks({
+        api.trove: ('log_tail',),
+        swift_client: ('Connection',),
+    })
+    def test_console_tail(self):
+        self.mock_log_tail.return_value = lambda: ['one\ntw', 'o\nthree\n']
+
+        url = reverse('horizon:project:databases:logs:console',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'length': 2})
+
+        self.mock_log_tail.assert_called_once_with(
+            test.IsHttpRequest(), 'id', 'guest.log', 2,
+            self.mock_Connection())
+        self.assertEqual(b'two\nthree\n', res.content)
+
+    @test.create_mocks({
+        api.trove: ('log_stream',),
+        swift_client: ('Connection',),
+    })
+    def test_full_log_streamed(self):
+        self.mock_log_stream.return_value = iter([b'one\n', b'two\n'])
+
+        url = reverse('horizon:project:databases:logs:full_log',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url)
+
+        self.mock_log_stream.assert_called_once_with(
+            test.IsHttpRequest(), 'id', 'guest.log', self.mock_Connection())
+        self.assertIsInstance(res, http.StreamingHttpResponse)
+        self.assertEqual(b'one\ntwo\n', b''.join(res.streaming_content))
+
+    @test.create_mocks({
+        api.trove: ('log_stream',),
+        swift_client: ('Connection',),
+    })
+    def test_view_full_log_streamed(self):
+        self.mock_log_stream.return_value = iter([b'one\n', b'two\n'])
+        request = self.factory.get('/')
+        request.user = self.request.user
+        request.session = self.client.session
+
+        res = views.LogContentsView.as_view()(
+            request, instance_id='id', filename='guest.log', lines='0')
+
+        self.assertIsInstance(res, http.StreamingHttpResponse)
+        self.assertEqual(b'one\ntwo\n', b''.join(res.streaming_content))
+
+    @test.create_mocks({
+        api.trove: ('log_stream',),
+        swift_client: ('Connection',),
+    })
+    def test_download_log_streamed(self):
+        self.mock_log_stream.return_value = iter([b'one\n', b'two\n'])
+
+        url = reverse('horizon:project:databases:logs:download_log',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url)
+
+        self.assertIsInstance(res, http.StreamingHttpResponse)
+        self.assertEqual('attachment; filename="guest.log.log"',
+                         res['Content-Disposition'])
+        self.assertEqual(b'one\ntwo\n', b''.join(res.streaming_content))
+
+    @test.create_mocks({
+        api.trove: ('log_stream',),
+        swift_client: ('Connection',),
+    })
+    def test_download_log_exception(self):
+        self.mock_log_stream.side_effect = self.exceptions.trove
+
+        url = reverse('horizon:project:databases:logs:download_log',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url)
+
+        self.assertEqual(302, res.status_code)
+        self.assertMessageCount(error=1)
+
+    @test.create_mocks({
+        api.trove: ('log_follow',),
+        swift_client: ('Connection',),
+    })
+    def test_console_follow(self):
+        self.mock_log_follow.return_value = ('new\n', (1, 42))
+
+        url = reverse('horizon:project:databases:logs:console',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'cursor': '0-10'})
+
+        self.assertEqual({'contents': 'new\n', 'cursor': '1-42'}, res.json())
+        self.mock_log_follow.assert_called_once_with(
+            test.IsHttpRequest(), 'id', 'guest.log', self.mock_Connection(),
+            (0, 10))
+
+    @test.create_mocks({
+        api.trove: ('log_follow',),
+        swift_client: ('Connection',),
+    })
+    def test_console_follow_without_new_lines(self):
+        self.mock_log_follow.return_value = ('', (0, 10))
+
+        url = reverse('horizon:project:databases:logs:console',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'cursor': '0-10'})
+
+        self.assertEqual({'contents': '', 'cursor': '0-10'}, res.json())
+        self.mock_log_follow.assert_called_once()
+
+    def test_console_follow_bad_cursor(self):
+        url = reverse('horizon:project:databases:logs:console',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'cursor': 'bad'})
+
+        self.assertEqual(400, res.status_code)
+
+    @test.create_mocks({
+        api.trove: ('log_stream',),
+        swift_client: ('Connection',),
+    })
+    def test_search(self):
+        read = []
+
+        def log_stream(request, instance_id, filename, swift):
+            for chunk in (b'one\ntw', b'o error\nthree\nfour error\n',
+                          b'five\nsix\n'):
+                read.append(chunk)
+                yield chunk
+        self.mock_log_stream.side_effect = log_stream
+
+        url = reverse('horizon:project:databases:logs:search',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'q': 'error', 'context': 1,
+                                    'limit': 1})
+
+        self.assertEqual({
+            'matches': [{'line': 2, 'text': 'two error',
+                         'before': ['one'], 'after': ['three']}],
+            'count': 1,
+            'truncated': True,
+        }, res.json())
+        # The search stopped before reading the rest of the log.
+        self.assertEqual(2, len(read))
+
+    @test.create_mocks({
+        api.trove: ('log_stream',),
+        swift_client: ('Connection',),
+    })
+    def test_search_pattern_literal(self):
+        # A pattern with catastrophic backtracking is searched for as a
+        # substring instead of being run as a regular expression.
+        self.mock_log_stream.return_value = (
+            chunk for chunk in [b'a' * 35 + b'!\n', b'(a|aa)+$ literal\n'])
+
+        url = reverse('horizon:project:databases:logs:search',
+                      args=('id', 'guest.log'))
+        start = time.monotonic()
+        res = self.client.get(url, {'q': '(a|aa)+$', 'regex': 1,
+                                    'context': 0})
+
+        self.assertLess(time.monotonic() - start, 1)
+        content = res.json()
+        self.assertEqual(['(a|aa)+$ literal'],
+                         [match['text'] for match in content['matches']])
+
+    @mock.patch.object(views, 'SEARCH_MAX_BYTES', 12)
+    @test.create_mocks({
+        api.trove: ('log_stream',),
+        swift_client: ('Connection',),
+    })
+    def test_search_byte_limit(self):
+        self.mock_log_stream.return_value = (
+            chunk for chunk in [b'error 1\nerr', b'or 2\nerror 3\n'])
+
+        url = reverse('horizon:project:databases:logs:search',
+                      args=('id', 'guest.log'))
+        res = self.client.get(url, {'q': 'error', 'context': 0})
+
+        content = res.json()
+        self.assertEqual(['error 1'],
+                         [match['text'] for match in content['matches']])
+        self.assertTrue(content['truncated'])
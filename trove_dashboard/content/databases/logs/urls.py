@@ -22,6 +22,7 @@ urlpatterns = [
     re_path(LOGS % 'console', views.console, name='console'),
     re_path(LOGS % 'download_log', views.download_log, name='download_log'),
     re_path(LOGS % 'full_log', views.full_log, name='full_log'),
+    re_path(LOGS % 'search', views.search, name='search'),
     re_path(LOGS % 'log_contents',
             views.LogContentsView.as_view(), name='log_contents'),
 ]
@@ -12,6 +12,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import codecs
+import collections
+import itertools
+
+from django.conf import settings
 from django import http
 from django import shortcuts
 from django.utils.translation import gettext_lazy as _
@@ -25,23 +30,39 @@ from trove_dashboard import api
 
 FULL_LOG_VALUE = 0
 DEFAULT_LINES = 50
+# Matches returned at most by a log search
+SEARCH_MAX_RESULTS = getattr(settings, 'TROVE_LOG_SEARCH_MAX_RESULTS', 100)
+# Lines of context shown at most around a match
+SEARCH_MAX_CONTEXT = 10
+# Bytes of a log read at most by a search
+SEARCH_MAX_BYTES = getattr(settings, 'TROVE_LOG_SEARCH_MAX_BYTES',
+                           32 * 1024 * 1024)
 
 
 class LogContentsView(generic.TemplateView):
     template_name = 'project/databases/logs/view_log.html'
     preload = False
 
+    def get_log_length(self):
+        try:
+            return int(self.kwargs['lines'])
+        except Exception:
+            return DEFAULT_LINES
+
+    def get(self, request, *args, **kwargs):
+        if self.get_log_length() == FULL_LOG_VALUE:
+            # The whole log is streamed rather than held in the page.
+            return full_log(request, kwargs['instance_id'],
+                            kwargs['filename'])
+        return super(LogContentsView, self).get(request, *args, **kwargs)
+
     def get_context_data(self, **kwargs):
         context = super(LogContentsView, self).get_context_data(**kwargs)
         context["instance_id"] = kwargs['instance_id']
         context["filename"] = kwargs['filename']
         context["publish"] = ''
 
-        try:
-            log_length = int(kwargs['lines'])
-        except Exception:
-            log_length = DEFAULT_LINES
-
+        log_length = self.get_log_length()
         context["log_length"] = log_length
         context["log_contents"] = get_contents(self.request,
                                                kwargs['instance_id'],
@@ -50,26 +71,71 @@ class LogContentsView(generic.TemplateView):
         return context
 
 
+def _prefetched(chunks):
+    """Return an iterator over chunks whose first one is already fetched.
+
+    A log which cannot be loaded is thus reported before anything of it is
+    sent.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return iter(())
+    return itertools.chain([first], chunks)
+
+
+def get_chunks(request, instance_id, filename, lines):
+    """Return an iterator over the text chunks of the last lines of a log.
+    """
+    log_generator = api.trove.log_tail(request,
+                                       instance_id,
+                                       filename,
+                                       lines,
+                                       dash_api.swift.swift_api(request))
+    return _prefetched(log_generator())
+
+
+def tail_lines(chunks, lines):
+    """Return the last lines of chunks, holding no more than that of them.
+
+    The whole log is never held this way, it is streamed with
+    stream_contents instead.
+    """
+    buffer = collections.deque(maxlen=lines)
+    partial = ''
+    for chunk in chunks:
+        chunk_lines = (partial + chunk).split('\n')
+        partial = chunk_lines.pop()
+        buffer.extend(chunk_lines)
+    if partial:
+        buffer.append(partial)
+    return ''.join(line + '\n' for line in buffer)
+
+
 def get_contents(request, instance_id, filename, lines):
     try:
-        log_generator = api.trove.log_tail(request,
-                                           instance_id,
-                                           filename,
-                                           lines,
-                                           dash_api.swift.swift_api(request))
-        data = ""
-        for log_part in log_generator():
-            data += log_part
+        data = tail_lines(get_chunks(request, instance_id, filename, lines),
+                          lines)
     except Exception as e:
         data = _('Unable to load {0} log\n{1}').format(filename, e)
     return data
 
 
+def stream_contents(request, instance_id, filename):
+    """Return the bytes of the whole log, chunk by chunk as they are read."""
+    return _prefetched(api.trove.log_stream(
+        request, instance_id, filename, dash_api.swift.swift_api(request)))
+
+
 def build_response(request, instance_id, filename, tail):
     data = (_('Unable to load {0} log for instance "{1}".')
             .format(filename, instance_id))
 
     try:
+        if int(tail) == FULL_LOG_VALUE:
+            return http.StreamingHttpResponse(
+                stream_contents(request, instance_id, filename),
+                content_type='text/plain')
         data = get_contents(request,
                             instance_id,
                             filename,
@@ -79,7 +145,46 @@ def build_response(request, instance_id, filename, tail):
     return http.HttpResponse(data.encode('utf-8'), content_type='text/plain')
 
 
+def encode_cursor(cursor):
+    return '%d-%d' % cursor
+
+
+def decode_cursor(cursor):
+    if not cursor:
+        return None
+    index, offset = cursor.split('-')
+    return int(index), int(offset)
+
+
+def follow(request, instance_id, filename, cursor):
+    """Return the lines of a log published after a cursor, as JSON.
+
+    Only what is already in Swift is read, the log is not published. The
+    request returns at once, also without new lines, so that it does
+    not hold a worker; the page waits longer between polls while the log
+    stays unchanged.
+    """
+    try:
+        cursor = decode_cursor(cursor)
+    except ValueError:
+        return http.HttpResponseBadRequest()
+
+    try:
+        data, next_cursor = api.trove.log_follow(
+            request, instance_id, filename,
+            dash_api.swift.swift_api(request), cursor)
+    except Exception:
+        error = exceptions.handle(request, ignore=True)
+        return http.HttpResponse(status=error.status_code)
+    return http.JsonResponse({'contents': data,
+                              'cursor': encode_cursor(next_cursor)})
+
+
 def console(request, instance_id, filename):
+    if 'cursor' in request.GET:
+        return follow(request, instance_id, filename,
+                      request.GET['cursor'])
+
     tail = request.GET.get('length')
     if not tail or (tail and not tail.isdigit()):
         msg = _('Log length must be a nonnegative integer.')
@@ -98,17 +203,116 @@ def full_log(request, instance_id, filename):
 
 def download_log(request, instance_id, filename):
     try:
-        data = get_contents(request,
-                            instance_id,
-                            filename,
-                            FULL_LOG_VALUE)
-        response = http.HttpResponse()
-        response.write(data)
+        response = http.StreamingHttpResponse(
+            stream_contents(request, instance_id, filename),
+            content_type='text/plain')
         response['Content-Disposition'] = ('attachment; '
                                            'filename="%s.log"' % filename)
-        response['Content-Length'] = str(len(response.content))
         return response
 
     except Exception as e:
         messages.error(request, _('Error downloading log file: %s') % e)
         return shortcuts.redirect(request.build_absolute_uri())
+
+
+def iter_lines(chunks):
+    """Yield the lines of the bytes chunks, holding a single line at once."""
+    decoder = codecs.getincrementaldecoder('utf-8')('replace')
+    partial = ''
+    for chunk in chunks:
+        lines = (partial + decoder.decode(chunk)).split('\n')
+        partial = lines.pop()
+        for line in lines:
+            yield line
+    partial += decoder.decode(b'', final=True)
+    if partial:
+        yield partial
+
+
+class ByteLimit(object):
+    """Iterator over the chunks of the first max_bytes bytes of chunks.
+
+    ``exceeded`` tells whether chunks held more than that once iterated.
+    """
+
+    def __init__(self, chunks, max_bytes):
+        self.chunks = iter(chunks)
+        self.remaining = max_bytes
+        self.exceeded = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.exceeded:
+            raise StopIteration
+        chunk = next(self.chunks)
+        if len(chunk) > self.remaining:
+            chunk = chunk[:self.remaining]
+            self.exceeded = True
+        self.remaining -= len(chunk)
+        return chunk
+
+
+def search_lines(lines, match, context, limit):
+    """Return the first ``limit`` lines matching and their context.
+
+    Returns a tuple (matches, truncated) where matches are dicts of the
+    number, text and surrounding lines of each match, and truncated tells
+    whether the search stopped before the end of the lines.
+    """
+    matches = []
+    before = collections.deque(maxlen=context)
+    # Matches still waiting for the lines following them
+    pending = []
+    for number, line in enumerate(lines, 1):
+        for result in pending:
+            result['after'].append(line)
+        pending = [result for result in pending
+                   if len(result['after']) < context]
+        if len(matches) == limit:
+            if not pending:
+                return matches, True
+        elif match(line):
+            result = {'line': number, 'text': line,
+                      'before': list(before), 'after': []}
+            matches.append(result)
+            if context:
+                pending.append(result)
+        before.append(line)
+    return matches, False
+
+
+def search(request, instance_id, filename):
+    query = request.GET.get('q')
+    if not query:
+        return http.HttpResponseBadRequest()
+    try:
+        context = min(int(request.GET.get('context', 2)), SEARCH_MAX_CONTEXT)
+        limit = min(int(request.GET.get('limit', SEARCH_MAX_RESULTS)),
+                    SEARCH_MAX_RESULTS)
+    except ValueError:
+        return http.HttpResponseBadRequest()
+    if context < 0 or limit < 1:
+        return http.HttpResponseBadRequest()
+
+    # Only substrings are searched for: a regular expression could make
+    # the search backtrack for minutes on a single line of the log.
+    def match(line):
+        return query in line
+
+    chunks = api.trove.log_stream(request, instance_id, filename,
+                                  dash_api.swift.swift_api(request))
+    scanned = ByteLimit(chunks, SEARCH_MAX_BYTES)
+    try:
+        matches, truncated = search_lines(iter_lines(scanned), match,
+                                          context, limit)
+    except Exception:
+        error = exceptions.handle(request, ignore=True)
+        return http.HttpResponse(status=error.status_code)
+    finally:
+        # Stop reading the log from Swift when the search ended early.
+        chunks.close()
+    return http.JsonResponse({'matches': matches,
+                              'count': len(matches),
+                              'truncated': truncated or scanned.exceeded})
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 from urllib import parse as urlparse
 
 from django.conf import settings
@@ -21,6 +22,7 @@ from django import urls
 from django.urls import reverse
 from django.utils import html
 from django.utils import safestring
+from django.utils import translation
 
 from django.utils.translation import gettext_lazy as _
 from django.utils.translation import ngettext_lazy
@@ -35,6 +37,7 @@ from horizon.utils import filters
 from trove_dashboard import api
 from trove_dashboard.content.database_backups \
     import tables as backup_tables
+from trove_dashboard.utils import tables as table_utils
 
 
 ACTIVE_STATES = ("ACTIVE", "HEALTHY",)
@@ -62,6 +65,7 @@ class DeleteInstance(tables.DeleteAction):
 
     def delete(self, request, obj_id):
         api.trove.instance_delete(request, obj_id)
+        api.catalog.instance_snapshot_invalidate(request)
 
 
 class RestartInstance(tables.BatchAction):
@@ -578,18 +582,28 @@ class ManageRootTable(tables.DataTable):
         row_actions = (EnableRootAction, DisableRootAction,)
 
 
-class UpdateRow(tables.Row):
-    ajax = True
+class InstanceRow(table_utils.RowProjection):
+    """An instance as listed in the InstancesTable."""
+    __slots__ = ('id', 'name', 'status', 'operating_status', 'datastore',
+                 'flavor', 'full_flavor', 'volume', 'hostname', 'ip',
+                 'addresses', 'replicas', 'replica_of', 'configuration')
 
-    def get_data(self, request, instance_id):
-        instance = api.trove.instance_get(request, instance_id)
+
+class UpdateRow(table_utils.BatchUpdateRow):
+    def extra_data(self, request, instance):
         try:
             flavor_id = instance.flavor['id']
-            instance.full_flavor = api.trove.flavor_get(request, flavor_id)
+            flavor = api.catalog.flavor_get(request, flavor_id)
         except Exception:
-            pass
-        instance.host = get_host(instance)
-        return instance
+            return InstanceRow(instance)
+        return InstanceRow(instance, full_flavor=flavor)
+
+    def get_data(self, request, instance_id):
+        instance = api.trove.instance_get(request, instance_id)
+        return self.extra_data(request, instance)
+
+    def get_page_data(self, request, marker=None):
+        return api.trove.instance_list(request, marker=marker)
 
 
 def get_datastore(instance):
@@ -608,17 +622,29 @@ def get_datastore_version(instance):
 # openstack_dashboard.dashboards.project.instances.tables.get_ips
 # Trove has a different instance addresses structure so we can't re-use
 # nova-related code as is.
+@functools.lru_cache(maxsize=1)
+def _get_ips_template():
+    return template.loader.get_template(
+        'project/instances/_instance_ips.html')
+
+
+@functools.lru_cache(maxsize=1024)
+def _render_ips(ip_groups, language):
+    # The language is part of the key as the template translates its text.
+    context = {
+        "ip_groups": dict((ip_type, list(ips)) for ip_type, ips in ip_groups),
+    }
+    return _get_ips_template().render(context)
+
+
 def get_ips(instance):
-    template_name = 'project/instances/_instance_ips.html'
     ip_groups = {}
 
     for address in getattr(instance, 'addresses', []):
-        ip_groups[address["type"]] = [address["address"]]
+        ip_groups[address["type"]] = (address["address"],)
 
-    context = {
-        "ip_groups": ip_groups,
-    }
-    return template.loader.render_to_string(template_name, context)
+    # Rows with the same addresses, e.g. polled again, share the markup.
+    return _render_ips(tuple(ip_groups.items()), translation.get_language())
 
 
 def get_host(instance):
@@ -660,26 +686,61 @@ class ReplicaColumn(tables.WrappingColumn):
         """
 
     instance_detail_url = "horizon:project:databases:detail"
+    _instance_names = None
+
+    @staticmethod
+    def _get_related_ids(instance):
+        related_ids = [replica["id"]
+                       for replica in getattr(instance, "replicas", [])]
+        if hasattr(instance, "replica_of"):
+            related_ids.append(instance.replica_of["id"])
+        return related_ids
 
-    def get_instance_link(self, instance_id):
-        request = self.table.request
+    def _get_instance_names(self, instance_ids):
+        """Map instance ids to names for the links of the table.
+
+        Names of the instances on the page are taken from the table data
+        and all the other instances the page links to are resolved in a
+        single concurrent pass the first time the column is rendered.
+        """
+        instance_ids = set(instance_ids)
+        if self._instance_names is None:
+            data = self.table.data or []
+            self._instance_names = dict((datum.id, datum.name)
+                                        for datum in data)
+            for datum in data:
+                instance_ids.update(self._get_related_ids(datum))
+
+        missing_ids = instance_ids.difference(self._instance_names)
+        if missing_ids:
+            instances = api.trove.instance_get_many(self.table.request,
+                                                    missing_ids)
+            for instance_id in missing_ids:
+                instance = instances.get(instance_id)
+                self._instance_names[instance_id] = getattr(instance, "name",
+                                                            None)
+        return self._instance_names
+
+    def get_instance_link(self, instance_id, name=None):
         url = reverse(self.instance_detail_url, args=(instance_id,))
-        instance = api.trove.instance_get(request, instance_id)
-        link = '<a href="%s">%s</a>' % (url, html.escape(instance.name))
+        # Fall back to the id for instances which no longer exist.
+        link = '<a href="%s">%s</a>' % (url, html.escape(name or instance_id))
         return link
 
     def get_raw_data(self, instance):
+        names = self._get_instance_names(self._get_related_ids(instance))
         if hasattr(instance, "replicas"):
             links = []
             for replica in instance.replicas:
                 instance_id = replica["id"]
-                links.append(self.get_instance_link(instance_id))
+                links.append(self.get_instance_link(instance_id,
+                                                    names.get(instance_id)))
             replicas = ', '.join(links)
             cell_text = ("Primary, has replicas: %s") % replicas
             return safestring.mark_safe(cell_text)
         if hasattr(instance, "replica_of"):
             instance_id = instance.replica_of["id"]
-            link = self.get_instance_link(instance_id)
+            link = self.get_instance_link(instance_id, names.get(instance_id))
             replica_of = _("Replica of %s")
             return safestring.mark_safe(replica_of % link)
         return _("-")
@@ -725,7 +786,14 @@ class UpdateInstance(tables.LinkAction):
         return (instance.status in ACTIVE_STATES)
 
 
-class InstancesTable(tables.DataTable):
+class InstancesFilterAction(table_utils.SnapshotFilterAction):
+    filter_choices = (('name', _("Instance Name ="), False),
+                      ('datastore', _("Datastore ="), False),
+                      ('status', _("Status ="), False))
+
+
+class InstancesTable(table_utils.BatchUpdateTableMixin,
+                     tables.DataTable):
     STATUS_CHOICES = (
         ("ACTIVE", True),
         ("HEALTHY", True),
@@ -795,7 +863,7 @@ class InstancesTable(tables.DataTable):
         verbose_name = _("Instances")
         status_columns = ["status"]
         row_class = UpdateRow
-        table_actions = (LaunchLink, DeleteInstance)
+        table_actions = (InstancesFilterAction, LaunchLink, DeleteInstance)
         row_actions = (CreateBackup,
                        UpdateInstance,
                        ResizeVolume,
@@ -844,7 +912,17 @@ def is_incremental(obj):
     return hasattr(obj, 'parent_id') and obj.parent_id is not None
 
 
-class InstanceBackupsTable(tables.DataTable):
+class InstanceBackupUpdateRow(table_utils.BatchUpdateRow):
+    def get_data(self, request, backup_id):
+        return api.trove.backup_get(request, backup_id)
+
+    def get_page_data(self, request, marker=None):
+        instance = self.table.kwargs['instance']
+        return api.trove.instance_backups(request, instance.id)
+
+
+class InstanceBackupsTable(table_utils.BatchUpdateTableMixin,
+                           tables.DataTable):
     name = tables.Column("name",
                          link="horizon:project:database_backups:detail",
                          verbose_name=_("Name"))
@@ -868,7 +946,7 @@ class InstanceBackupsTable(tables.DataTable):
         name = "backups"
         verbose_name = _("Backups")
         status_columns = ["status"]
-        row_class = UpdateRow
+        row_class = InstanceBackupUpdateRow
         table_actions = (backup_tables.LaunchLink, backup_tables.DeleteBackup)
         row_actions = (backup_tables.RestoreLink, backup_tables.DeleteBackup)
 
@@ -16,6 +16,7 @@ from django import template
 from django.utils.translation import gettext_lazy as _
 
 from horizon import exceptions
+from horizon import messages
 from horizon import tabs
 from oslo_log import log as logging
 
@@ -30,6 +31,20 @@ from trove_dashboard.content.databases import tables
 LOG = logging.getLogger(__name__)
 
 
+def get_prefetched(tab, name, fetch):
+    """Return the data prefetched by the detail view for a tab, or fetch it.
+
+    Errors met while prefetching are raised as fetch() would have.
+    """
+    prefetched = tab.tab_group.kwargs.get('prefetched') or {}
+    if name not in prefetched:
+        return fetch()
+    result = prefetched[name]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
 class OverviewTab(tabs.Tab):
     name = _("Overview")
     slug = "overview"
@@ -38,7 +53,9 @@ class OverviewTab(tabs.Tab):
         instance = self.tab_group.kwargs['instance']
         context = {"instance": instance}
         try:
-            root_show = api.trove.root_show(request, instance.id)
+            root_show = get_prefetched(
+                self, 'root_show',
+                lambda: api.trove.root_show(request, instance.id))
             context["root_enabled"] = template.defaultfilters.yesno(
                 root_show.rootEnabled)
         except Exception:
@@ -76,19 +93,24 @@ class UserTab(tabs.TableTab):
     def get_users_data(self):
         instance = self.tab_group.kwargs['instance']
         try:
-            data = api.trove.users_list(self.request, instance.id)
+            data = get_prefetched(
+                self, 'users_list',
+                lambda: api.trove.users_list(self.request, instance.id))
+            access, errors = api.trove.user_list_access_many(
+                self.request, instance.id,
+                [(user.name, user.host) for user in data])
             for user in data:
                 user.instance = instance
-                try:
-                    user.access = api.trove.user_list_access(self.request,
-                                                             instance.id,
-                                                             user.name,
-                                                             host=user.host)
-                except exceptions.NOT_FOUND:
-                    pass
-                except Exception:
-                    msg = _('Unable to get user access data.')
-                    exceptions.handle(self.request, msg)
+                if (user.name, user.host) in access:
+                    user.access = access[(user.name, user.host)]
+            for user, error in errors.items():
+                LOG.warning('Unable to get access data of user %(user)s: '
+                            '%(error)s', {'user': '%s@%s' % user,
+                                          'error': error})
+            if errors:
+                msg = (_('Unable to get user access data of %s.') %
+                       ', '.join(sorted('%s@%s' % user for user in errors)))
+                messages.warning(self.request, msg)
         except Exception:
             msg = _('Unable to get user data.')
             exceptions.handle(self.request, msg)
@@ -110,7 +132,9 @@ class DatabaseTab(tabs.TableTab):
     def get_databases_data(self):
         instance = self.tab_group.kwargs['instance']
         try:
-            data = api.trove.database_list(self.request, instance.id)
+            data = get_prefetched(
+                self, 'database_list',
+                lambda: api.trove.database_list(self.request, instance.id))
             for database in data:
                 setattr(database, 'instance', instance)
         except Exception:
@@ -134,7 +158,10 @@ class ConfigDefaultsTab(tabs.TableTab):
     def get_config_defaults_data(self):
         instance = self.tab_group.kwargs['instance']
         values_data = []
-        data = api.trove.configuration_default(self.request, instance.id)
+        data = get_prefetched(
+            self, 'configuration_default',
+            lambda: api.trove.configuration_default(self.request,
+                                                    instance.id))
         if data is not None:
             for k, v in data.configuration.items():
                 values_data.append(
@@ -153,7 +180,10 @@ class BackupsTab(tabs.TableTab):
     def get_backups_data(self):
         instance = self.tab_group.kwargs['instance']
         try:
-            data = api.trove.instance_backups(self.request, instance.id)
+            data = get_prefetched(
+                self, 'instance_backups',
+                lambda: api.trove.instance_backups(self.request,
+                                                   instance.id))
         except Exception:
             msg = _('Unable to get database backup data.')
             exceptions.handle(self.request, msg)
@@ -174,7 +204,9 @@ class LogsTab(tabs.TableTab):
     def get_logs_data(self):
         instance = self.tab_group.kwargs['instance']
         try:
-            logs = api.trove.log_list(self.request, instance.id)
+            logs = get_prefetched(
+                self, 'log_list',
+                lambda: api.trove.log_list(self.request, instance.id))
             return logs
         except Exception as e:
             LOG.exception(
@@ -13,17 +13,21 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
 import logging
+import threading
 import unittest
 from unittest import mock
 
 import django
 from django import http
+from django import template
 from django.urls import reverse
 from horizon import exceptions
 from openstack_auth import policy
 from openstack_dashboard import api as dash_api
 from troveclient import common
+from troveclient import exceptions as trove_exceptions
 
 from trove_dashboard import api
 from trove_dashboard.content.databases import forms
@@ -40,7 +44,8 @@ DETAILS_URL = reverse('horizon:project:databases:detail', args=['id'])
 
 class DatabaseTests(test.TestCase):
     @test.create_mocks(
-        {api.trove: ('instance_get', 'instance_list', 'flavor_list')})
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get', 'instance_list')})
     def test_index(self):
         # Mock database instances
         databases = common.Paginated(self.databases.list())
@@ -61,7 +66,107 @@ class DatabaseTests(test.TestCase):
         self.assertContains(res, 'trove.instance-2.com')
 
     @test.create_mocks(
-        {api.trove: ('instance_get', 'instance_list', 'flavor_list')})
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get', 'instance_list')})
+    def test_index_compact_rows(self):
+        databases = self.databases.list()
+        flavor = self.flavors.first()
+        for database in databases:
+            database.flavor = {'id': flavor.id}
+        self.mock_instance_list.return_value = common.Paginated(databases)
+        self.mock_flavor_list.return_value = self.flavors.list()
+
+        res = self.client.get(INDEX_URL)
+        rows = res.context['table'].data
+        self.assertEqual([d.id for d in databases], [r.id for r in rows])
+        for row in rows:
+            self.assertIsInstance(row, tables.InstanceRow)
+            self.assertFalse(hasattr(row, '__dict__'))
+            # Rows share the flavor of the page instead of a copy each.
+            self.assertIs(rows[0].full_flavor, row.full_flavor)
+        self.assertFalse(hasattr(rows[0], 'replicas'))
+        self.assertEqual(databases[-1].replicas, rows[-1].replicas)
+
+    @test.create_mocks(
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get', 'instance_get_many', 'instance_list',
+                     'instance_list_all')})
+    def test_index_filter_from_snapshot(self):
+        databases = self.databases.list()
+        match = databases[1]
+        self.mock_instance_list_all.return_value = databases
+        self.mock_instance_get_many.return_value = {match.id: match}
+        self.mock_flavor_list.return_value = self.flavors.list()
+
+        self.client.post(INDEX_URL, {
+            'databases__filter__q_field': 'name',
+            'databases__filter__q': 'with dns'})
+        res = self.client.get(INDEX_URL)
+
+        self.assertEqual([match.id],
+                         [row.id for row in res.context['table'].data])
+        self.mock_instance_list.assert_not_called()
+        self.mock_instance_list_all.assert_called_once_with(
+            test.IsHttpRequest())
+        self.mock_instance_get_many.assert_called_once_with(
+            test.IsHttpRequest(), [match.id])
+
+    @test.create_mocks(
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get_many', 'instance_list_all')})
+    def test_index_filter_from_snapshot_rechecked(self):
+        databases = self.databases.list()
+        building = copy.deepcopy(databases[1])
+        building._info['status'] = building.status = 'BUILD'
+        self.mock_instance_list_all.return_value = [databases[0], building]
+        # The instance became healthy since the snapshot was taken.
+        self.mock_instance_get_many.return_value = {
+            databases[1].id: databases[1]}
+        self.mock_flavor_list.return_value = self.flavors.list()
+
+        self.client.post(INDEX_URL, {
+            'databases__filter__q_field': 'status',
+            'databases__filter__q': 'build'})
+        res = self.client.get(INDEX_URL)
+
+        self.assertEqual([], list(res.context['table'].data))
+        self.mock_instance_get_many.assert_called_once_with(
+            test.IsHttpRequest(), [building.id])
+
+    def test_get_ips_markup(self):
+        instance = copy.deepcopy(self.databases.first())
+        instance.addresses.append({"type": "public",
+                                   "address": "172.24.4.10"})
+        expected = template.loader.render_to_string(
+            'project/instances/_instance_ips.html',
+            {'ip_groups': {'private': ['10.0.0.3'],
+                           'public': ['172.24.4.10']}})
+
+        self.assertEqual(expected, tables.get_ips(instance))
+        with mock.patch.object(tables, '_get_ips_template') as get_template:
+            self.assertEqual(expected, tables.get_ips(instance))
+        get_template.assert_not_called()
+
+    @test.create_mocks(
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get', 'instance_list')})
+    def test_index_replica_names_from_page(self):
+        databases = self.databases.list()
+        primary = databases[0]
+        databases[-1].replicas = [{'id': primary.id, 'links': []}]
+        self.mock_instance_list.return_value = common.Paginated(databases)
+        self.mock_flavor_list.return_value = self.flavors.list()
+
+        res = self.client.get(INDEX_URL)
+        self.mock_instance_get.assert_not_called()
+        self.assertContains(res, 'Primary, has replicas: <a href="%s">%s</a>'
+                            % (reverse('horizon:project:databases:detail',
+                                       args=[primary.id]),
+                               primary.name))
+
+    @test.create_mocks(
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get', 'instance_list')})
     def test_index_flavor_exception(self):
         # Mock database instances
         databases = common.Paginated(self.databases.list())
@@ -92,7 +197,8 @@ class DatabaseTests(test.TestCase):
         self.assertMessageCount(res, error=1)
 
     @test.create_mocks(
-        {api.trove: ('instance_get', 'instance_list', 'flavor_list')})
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get', 'instance_list')})
     def test_index_pagination(self):
         # Mock database instances
         databases = self.databases.list()
@@ -114,7 +220,8 @@ class DatabaseTests(test.TestCase):
             res, 'marker=' + last_record.id)
 
     @test.create_mocks(
-        {api.trove: ('instance_get', 'instance_list', 'flavor_list')})
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get', 'instance_list')})
     def test_index_flavor_list_exception(self):
         # Mocking instances.
         databases = common.Paginated(self.databases.list())
@@ -132,10 +239,36 @@ class DatabaseTests(test.TestCase):
         self.assertTemplateUsed(res, 'project/databases/index.html')
         self.assertMessageCount(res, error=1)
 
+    @test.create_mocks(
+        {api.catalog: ('flavor_get',),
+         api.trove: ('instance_get', 'instance_list')})
+    def test_index_rows_update(self):
+        on_page = self.databases.first()
+        self.mock_instance_list.return_value = common.Paginated([on_page])
+        self.mock_instance_get.side_effect = trove_exceptions.NotFound()
+        self.mock_flavor_get.return_value = self.database_flavors.first()
+
+        res = self.client.get(INDEX_URL,
+                              {'action': 'rows_update',
+                               'table': 'databases',
+                               'obj_id': [on_page.id, 'deleted']},
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.mock_instance_list.assert_called_once_with(
+            test.IsHttpRequest(), marker=None)
+        self.mock_instance_get.assert_called_once_with(
+            test.IsHttpRequest(), 'deleted')
+        content = res.json()
+        self.assertEqual(['deleted'], content['deleted'])
+        self.assertEqual([on_page.id], list(content['rows']))
+        self.assertIn('databases__row__%s' % on_page.id,
+                      content['rows'][on_page.id])
+
     @test.create_mocks({
-        api.trove: ('backup_list', 'configuration_list', 'datastore_flavors',
-                    'datastore_list', 'datastore_version_list', 'flavor_list',
-                    'instance_list'),
+        api.catalog: ('flavor_list', 'datastore_list',
+                      'datastore_version_list',
+                      'datastore_flavor_choices'),
+        api.trove: ('backup_list_all', 'configuration_list', 'instance_list'),
         dash_api.cinder: ('volume_type_list',),
         dash_api.neutron: ('network_list_for_tenant',),
         dash_api.nova: ('availability_zone_list',),
@@ -143,8 +276,9 @@ class DatabaseTests(test.TestCase):
     })
     def test_launch_instance(self):
         self.mock_check.return_value = True
-        self.mock_datastore_flavors.return_value = self.flavors.list()
-        self.mock_backup_list.return_value = self.database_backups.list()
+        self.mock_datastore_flavor_choices.return_value = [
+            (flavor.id, flavor.name) for flavor in self.flavors.list()]
+        self.mock_backup_list_all.return_value = self.database_backups.list()
         self.mock_configuration_list.return_value = []
         self.mock_instance_list.return_value = self.databases.list()
         # Mock datastores
@@ -163,12 +297,9 @@ class DatabaseTests(test.TestCase):
         res = self.client.get(LAUNCH_URL)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_check, 5, mock.call((), test.IsHttpRequest()))
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_datastore_flavors, 20,
-            mock.call(test.IsHttpRequest(),
-                      test.IsA(str),
-                      test.IsA(str)))
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_datastore_flavor_choices.assert_called_once_with(
+            test.IsHttpRequest(), test.IsA(str), test.IsA(str))
+        self.mock_backup_list_all.assert_called_once_with(test.IsHttpRequest())
         self.mock_configuration_list.assert_called_once_with(
             test.IsHttpRequest())
         self.mock_instance_list.assert_called_once_with(test.IsHttpRequest())
@@ -185,12 +316,27 @@ class DatabaseTests(test.TestCase):
             test.IsHttpRequest())
         self.assertTemplateUsed(res, 'project/databases/launch.html')
 
+    @test.create_mocks({api.catalog: ('datastore_flavor_choices',)})
+    def test_launch_flavors(self):
+        choices = [(flavor.id, flavor.name) for flavor in self.flavors.list()]
+        self.mock_datastore_flavor_choices.return_value = choices
+
+        res = self.client.get(
+            reverse('horizon:project:databases:launch_flavors'),
+            {'datastore': self._build_flavor_widget_name('mysql', '5.5')})
+
+        self.assertEqual(200, res.status_code)
+        self.assertEqual([list(choice) for choice in choices],
+                         res.json()['flavors'])
+        self.mock_datastore_flavor_choices.assert_called_once_with(
+            test.IsHttpRequest(), 'mysql', '5.5')
+
     # django 1.7 and later does not handle the thrown Http302
     # exception well enough.
     # TODO(mrunge): re-check when django-1.8 is stable
     @unittest.skipIf(django.VERSION >= (1, 7, 0),
                      'Currently skipped with Django >= 1.7')
-    @test.create_mocks({api.trove: ('flavor_list',)})
+    @test.create_mocks({api.catalog: ('flavor_list',)})
     def test_launch_instance_exception_on_flavors(self):
         trove_exception = self.exceptions.nova
         self.mock_flavor_list.side_effect = trove_exception
@@ -209,7 +355,7 @@ class DatabaseTests(test.TestCase):
         try:
             with self.assertRaises(exceptions.Http302):
                 self.client.get(LAUNCH_URL)
-                self.mock_datastore_flavors.assert_called_once_with(
+                self.mock_datastore_flavor_choices.assert_called_once_with(
                     test.IsHttpRequest(), mock.ANY, mock.ANY)
 
         finally:
@@ -218,8 +364,10 @@ class DatabaseTests(test.TestCase):
                 log.setLevel(level)
 
     @test.create_mocks({
-        api.trove: ('backup_list', 'configuration_list', 'datastore_flavors',
-                    'datastore_list', 'datastore_version_list', 'flavor_list',
+        api.catalog: ('flavor_list', 'datastore_list',
+                      'datastore_version_list',
+                      'datastore_flavor_choices'),
+        api.trove: ('backup_list_all', 'configuration_list',
                     'instance_create', 'instance_list'),
         dash_api.cinder: ('volume_type_list',),
         dash_api.neutron: ('network_list_for_tenant',),
@@ -228,8 +376,9 @@ class DatabaseTests(test.TestCase):
     })
     def test_create_simple_instance(self):
         self.mock_check.return_value = True
-        self.mock_datastore_flavors.return_value = self.flavors.list()
-        self.mock_backup_list.return_value = self.database_backups.list()
+        self.mock_datastore_flavor_choices.return_value = [
+            (flavor.id, flavor.name) for flavor in self.flavors.list()]
+        self.mock_backup_list_all.return_value = self.database_backups.list()
         self.mock_instance_list.return_value = self.databases.list()
         # Mock datastores
         self.mock_datastore_list.return_value = self.datastores.list()
@@ -258,7 +407,6 @@ class DatabaseTests(test.TestCase):
             'volume': '1',
             'flavor': 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa',
             'datastore': field_name,
-            field_name: 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa',
             'network': self.networks.first().id,
             'volume_type': 'no_type'
         }
@@ -266,12 +414,9 @@ class DatabaseTests(test.TestCase):
         res = self.client.post(LAUNCH_URL, post)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_check, 5, mock.call((), test.IsHttpRequest()))
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_datastore_flavors, 20,
-            mock.call(test.IsHttpRequest(),
-                      test.IsA(str),
-                      test.IsA(str)))
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_datastore_flavor_choices.assert_called_once_with(
+            test.IsHttpRequest(), datastore, datastore_version)
+        self.mock_backup_list_all.assert_called_once_with(test.IsHttpRequest())
         self.mock_instance_list.assert_called_once_with(test.IsHttpRequest())
         self.mock_datastore_list.assert_called_once_with(test.IsHttpRequest())
         self.assert_mock_multiple_calls_with_same_arguments(
@@ -305,8 +450,10 @@ class DatabaseTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_mocks({
-        api.trove: ('backup_list', 'configuration_list', 'datastore_flavors',
-                    'datastore_list', 'datastore_version_list', 'flavor_list',
+        api.catalog: ('flavor_list', 'datastore_list',
+                      'datastore_version_list',
+                      'datastore_flavor_choices'),
+        api.trove: ('backup_list_all', 'configuration_list',
                     'instance_create', 'instance_list'),
         dash_api.cinder: ('volume_type_list',),
         dash_api.neutron: ('network_list_for_tenant',),
@@ -316,8 +463,9 @@ class DatabaseTests(test.TestCase):
     def test_create_simple_instance_exception(self):
         self.mock_check.return_value = True
         trove_exception = self.exceptions.nova
-        self.mock_datastore_flavors.return_value = self.flavors.list()
-        self.mock_backup_list.return_value = self.database_backups.list()
+        self.mock_datastore_flavor_choices.return_value = [
+            (flavor.id, flavor.name) for flavor in self.flavors.list()]
+        self.mock_backup_list_all.return_value = self.database_backups.list()
         self.mock_instance_list.return_value = self.databases.list()
         # Mock datastores
         self.mock_datastore_list.return_value = self.datastores.list()
@@ -346,7 +494,6 @@ class DatabaseTests(test.TestCase):
             'volume': '1',
             'flavor': 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa',
             'datastore': field_name,
-            field_name: 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa',
             'network': self.networks.first().id,
             'volume_type': 'no_type'
         }
@@ -354,12 +501,9 @@ class DatabaseTests(test.TestCase):
         res = self.client.post(LAUNCH_URL, post)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_check, 5, mock.call((), test.IsHttpRequest()))
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_datastore_flavors, 20,
-            mock.call(test.IsHttpRequest(),
-                      test.IsA(str),
-                      test.IsA(str)))
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_datastore_flavor_choices.assert_called_once_with(
+            test.IsHttpRequest(), datastore, datastore_version)
+        self.mock_backup_list_all.assert_called_once_with(test.IsHttpRequest())
         self.mock_instance_list.assert_called_once_with(test.IsHttpRequest())
         self.mock_datastore_list.assert_called_once_with(test.IsHttpRequest())
         self.assert_mock_multiple_calls_with_same_arguments(
@@ -393,7 +537,8 @@ class DatabaseTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_mocks({
-        api.trove: ('instance_get', 'flavor_get', 'root_show')
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'root_show')
     })
     def _test_details(self, database, test_text, assert_contains=True):
         self.mock_instance_get.return_value = database
@@ -427,6 +572,57 @@ class DatabaseTests(test.TestCase):
             for (log, level) in loggers:
                 log.setLevel(level)
 
+    @test.create_mocks({
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'log_list')
+    })
+    def test_details_prefetch_tab_data(self):
+        database = self.databases.first()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def instance_get(request, instance_id):
+            # The log list must be requested while the instance is.
+            barrier.wait()
+            return database
+        self.mock_instance_get.side_effect = instance_get
+
+        def log_list(request, instance_id):
+            barrier.wait()
+            return self.logs.list()
+        self.mock_log_list.side_effect = log_list
+        self.mock_flavor_get.return_value = self.flavors.first()
+
+        res = self.client.get(DETAILS_URL + '?tab=instance_details__logs_tab')
+
+        self.assertContains(res, self.logs.first().name)
+        self.mock_instance_get.assert_called_once_with(
+            test.IsHttpRequest(), 'id')
+        self.mock_log_list.assert_called_once_with(
+            test.IsHttpRequest(), 'id')
+
+    @test.create_mocks({
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'instance_backups', 'root_show')
+    })
+    def test_details_rows_update_not_prefetched(self):
+        database = self.databases.first()
+        backup = self.database_backups.first()
+        self.mock_instance_get.return_value = database
+        self.mock_instance_backups.return_value = [backup]
+        self.mock_flavor_get.return_value = self.flavors.first()
+
+        res = self.client.get(DETAILS_URL,
+                              {'action': 'rows_update',
+                               'table': 'backups',
+                               'obj_id': [backup.id]},
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        self.assertEqual([backup.id], list(res.json()['rows']))
+        # The overview tab is not rendered, its data is not fetched.
+        self.mock_root_show.assert_not_called()
+        self.mock_instance_get.assert_called_once_with(
+            test.IsHttpRequest(), 'id')
+
     def test_details_with_ip(self):
         database = self.databases.first()
         self._test_details(database, database.ip[0])
@@ -639,7 +835,8 @@ class DatabaseTests(test.TestCase):
         self.assertEqual(table.data[0].password, "password")
 
     @test.create_mocks({
-        api.trove: ('instance_get', 'flavor_get', 'user_delete', 'users_list',
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'user_delete', 'users_list',
                     'user_list_access')
     })
     def test_user_delete(self):
@@ -682,6 +879,42 @@ class DatabaseTests(test.TestCase):
             test.IsA(str), host=test.IsA(str))
         self.assertRedirectsNoFollow(res, url)
 
+    @test.create_mocks({
+        api.catalog: ('flavor_get',),
+        api.trove: ('instance_get', 'users_list', 'user_list_access')
+    })
+    def test_users_tab_access(self):
+        database = self.databases.first()
+        user = self.database_users.first()
+        other_user = copy.copy(user)
+        other_user.name = 'other'
+        user_db = self.database_user_dbs.first()
+        self.mock_instance_get.return_value = database
+        self.mock_flavor_get.return_value = self.flavors.first()
+        self.mock_users_list.return_value = [user, other_user]
+
+        def user_list_access(request, instance_id, name, host=None):
+            if name == other_user.name:
+                raise self.exceptions.trove
+            return [user_db]
+        self.mock_user_list_access.side_effect = user_list_access
+
+        url = (reverse('horizon:project:databases:detail',
+                       args=[database.id]) +
+               '?tab=instance_details__users_tab')
+        res = self.client.get(url)
+
+        self.assertContains(res, user_db.name)
+        self.assertMessageCount(res, warning=1)
+        self.assertEqual(2, self.mock_user_list_access.call_count)
+
+        # The access lists retrieved are cached, the failed one is not.
+        self.client.get(url)
+        self.assertEqual(3, self.mock_user_list_access.call_count)
+        self.mock_user_list_access.assert_called_with(
+            test.IsHttpRequest(), database.id, other_user.name,
+            host=other_user.host)
+
     def test_create_user(self):
         user = self.users.first()
 
@@ -819,6 +1052,33 @@ class DatabaseTests(test.TestCase):
         self.assertTemplateUsed(
             res, 'project/databases/access_detail.html')
 
+    @test.create_mocks({api.trove: ('database_list', 'user_show_access')})
+    def test_access_detail_granted(self):
+        databases = self.databases.list()
+        barrier = threading.Barrier(2, timeout=5)
+
+        def database_list(request, instance_id):
+            # The access list must be requested while the databases are.
+            barrier.wait()
+            return databases
+        self.mock_database_list.side_effect = database_list
+
+        def user_show_access(request, instance_id, user_name, host=None):
+            barrier.wait()
+            return [databases[0]]
+        self.mock_user_show_access.side_effect = user_show_access
+
+        url = reverse('horizon:project:databases:access_detail',
+                      args=['id', 'name', 'host'])
+        res = self.client.get(url)
+
+        db_access = res.context['db_access']
+        self.assertEqual(sorted(db.name for db in databases),
+                         [access.name for access in db_access])
+        self.assertEqual([databases[0].name],
+                         [access.name for access in db_access
+                          if access.access])
+
     @test.create_mocks({api.trove: ('database_list', 'user_show_access')})
     def test_access_detail_get_exception(self):
         self.mock_database_list.return_value = self.databases.list()
@@ -977,8 +1237,8 @@ class DatabaseTests(test.TestCase):
             res, "New size for volume must be greater than current size.")
 
     @test.create_mocks(
-        {api.trove: ('instance_get',
-                     'flavor_list')})
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get',)})
     def test_resize_instance_get(self):
         database = self.databases.first()
 
@@ -1002,8 +1262,8 @@ class DatabaseTests(test.TestCase):
                 self.assertContains(res, option % (flavor.id, flavor.name))
 
     @test.create_mocks(
-        {api.trove: ('instance_get',
-                     'flavor_list',
+        {api.catalog: ('flavor_list',),
+         api.trove: ('instance_get',
                      'instance_resize')})
     def test_resize_instance(self):
         database = self.databases.first()
@@ -1035,8 +1295,10 @@ class DatabaseTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_mocks({
-        api.trove: ('backup_list', 'configuration_list', 'datastore_flavors',
-                    'datastore_list', 'datastore_version_list', 'flavor_list',
+        api.catalog: ('flavor_list', 'datastore_list',
+                      'datastore_version_list',
+                      'datastore_flavor_choices'),
+        api.trove: ('backup_list_all', 'configuration_list',
                     'instance_create', 'instance_get', 'instance_list_all'),
         dash_api.cinder: ('volume_type_list',),
         dash_api.neutron: ('network_list_for_tenant',),
@@ -1045,8 +1307,9 @@ class DatabaseTests(test.TestCase):
     })
     def test_create_replica_instance(self):
         self.mock_check.return_value = True
-        self.mock_datastore_flavors.return_value = self.flavors.list()
-        self.mock_backup_list.return_value = self.database_backups.list()
+        self.mock_datastore_flavor_choices.return_value = [
+            (flavor.id, flavor.name) for flavor in self.flavors.list()]
+        self.mock_backup_list_all.return_value = self.database_backups.list()
         self.mock_instance_list_all.return_value = self.databases.list()
         self.mock_datastore_list.return_value = self.datastores.list()
         self.mock_datastore_version_list.return_value = (
@@ -1075,7 +1338,6 @@ class DatabaseTests(test.TestCase):
             'volume': '1',
             'flavor': 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa',
             'datastore': field_name,
-            field_name: 'aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa',
             'network': self.networks.first().id,
             'initial_state': 'master',
             'master': self.databases.first().id,
@@ -1086,12 +1348,9 @@ class DatabaseTests(test.TestCase):
         res = self.client.post(LAUNCH_URL, post)
         self.assert_mock_multiple_calls_with_same_arguments(
             self.mock_check, 5, mock.call((), test.IsHttpRequest()))
-        self.assert_mock_multiple_calls_with_same_arguments(
-            self.mock_datastore_flavors, 20,
-            mock.call(test.IsHttpRequest(),
-                      test.IsA(str),
-                      test.IsA(str)))
-        self.mock_backup_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_datastore_flavor_choices.assert_called_once_with(
+            test.IsHttpRequest(), datastore, datastore_version)
+        self.mock_backup_list_all.assert_called_once_with(test.IsHttpRequest())
         self.mock_instance_list_all.assert_called_once_with(
             test.IsHttpRequest())
         self.mock_datastore_list.assert_called_once_with(test.IsHttpRequest())
@@ -1179,7 +1438,8 @@ class DatabaseTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_mocks({
-        api.trove: ('flavor_list', 'instance_list',
+        api.catalog: ('flavor_list',),
+        api.trove: ('instance_list',
                     'eject_replica_source',),
     })
     def test_eject_replica_source(self):
@@ -1202,7 +1462,8 @@ class DatabaseTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_mocks({
-        api.trove: ('flavor_list', 'instance_list',
+        api.catalog: ('flavor_list',),
+        api.trove: ('instance_list',
                     'eject_replica_source',),
     })
     def test_eject_replica_source_exception(self):
@@ -1231,20 +1492,19 @@ class DatabaseTests(test.TestCase):
     })
     def test_master_list_pagination(self):
         request = http.HttpRequest()
+        request.user = self.request.user
 
         first_part = common.Paginated(items=self.databases.list()[:1],
                                       next_marker='marker')
         second_part = common.Paginated(items=self.databases.list()[1:])
 
-        self.mock_instance_list.side_effect = [
-            first_part, second_part, first_part]
+        self.mock_instance_list.side_effect = [first_part, second_part]
 
         advanced_page = create_instance.AdvancedAction(request, None)
         choices = advanced_page.populate_master_choices(request, None)
         expected_calls = [
             mock.call(request),
-            mock.call(request, marker='marker'),
-            mock.call(request)]
+            mock.call(request, marker='marker')]
         self.assertEqual(expected_calls,
                          self.mock_instance_list.call_args_list)
         self.assertEqual(len(choices), len(self.databases.list()) + 1)
@@ -1318,8 +1578,8 @@ class DatabaseTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_mocks({
+        api.catalog: ('flavor_list',),
         api.trove: ('instance_list',
-                    'flavor_list',
                     'instance_detach_configuration',),
     })
     def test_detach_configuration(self):
@@ -1342,8 +1602,8 @@ class DatabaseTests(test.TestCase):
         self.assertRedirectsNoFollow(res, INDEX_URL)
 
     @test.create_mocks({
+        api.catalog: ('flavor_list',),
         api.trove: ('instance_list',
-                    'flavor_list',
                     'instance_detach_configuration',),
     })
     def test_detach_configuration_exception(self):
@@ -27,6 +27,8 @@ USERS = r'^(?P<instance_id>[^/]+)/(?P<user_name>[^/]+)/' \
 urlpatterns = [
     re_path(r'^$', views.IndexView.as_view(), name='index'),
     re_path(r'^launch$', views.LaunchInstanceView.as_view(), name='launch'),
+    re_path(r'^launch/flavors$', views.LaunchFlavorsView.as_view(),
+            name='launch_flavors'),
     re_path(INSTANCES % '', views.DetailView.as_view(), name='detail'),
     re_path(INSTANCES % 'edit_instance', views.UpdateInstanceView.as_view(),
             name='edit_instance'),
@@ -17,9 +17,11 @@ Views for managing database instances.
 """
 from collections import OrderedDict
 
+from django import http
 from django.urls import reverse
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
+from django.views import generic
 
 from horizon import exceptions
 from horizon import forms as horizon_forms
@@ -36,11 +38,16 @@ from trove_dashboard.content.databases import forms
 from trove_dashboard.content.databases import tables
 from trove_dashboard.content.databases import tabs
 from trove_dashboard.content.databases import workflows
+from trove_dashboard.content.databases.workflows import create_instance
+from trove_dashboard.utils import common as common_utils
+from trove_dashboard.utils import concurrency
+from trove_dashboard.utils import tables as table_utils
 
 LOG = logging.getLogger(__name__)
 
 
-class IndexView(horizon_tables.DataTableView):
+class IndexView(table_utils.SnapshotFilterMixin,
+                horizon_tables.DataTableView):
     table_class = tables.InstancesTable
     template_name = 'project/databases/index.html'
     page_title = _("Instances")
@@ -51,7 +58,7 @@ class IndexView(horizon_tables.DataTableView):
     @memoized.memoized_method
     def get_flavors(self):
         try:
-            flavors = api.trove.flavor_list(self.request)
+            flavors = api.catalog.flavor_list(self.request)
         except Exception:
             flavors = []
             msg = _('Unable to retrieve database size information.')
@@ -60,35 +67,45 @@ class IndexView(horizon_tables.DataTableView):
                            for flavor in flavors)
 
     def _extra_data(self, instance):
+        # Rows refer to the flavors of the page rather than copies.
         flavor = self.get_flavors().get(instance.flavor["id"])
         if flavor is not None:
-            instance.full_flavor = flavor
-        instance.host = tables.get_host(instance)
-        return instance
+            return tables.InstanceRow(instance, full_flavor=flavor)
+        return tables.InstanceRow(instance)
+
+    def get_snapshot(self):
+        return api.catalog.instance_snapshot(self.request)
 
     def get_data(self):
         marker = self.request.GET.get(
             tables.InstancesTable._meta.pagination_param)
+        snapshot_filter = self.get_snapshot_filter()
         # Gather our instances
         try:
-            instances = api.trove.instance_list(self.request, marker=marker)
-            self._more = instances.next or False
+            if snapshot_filter:
+                instances = self.get_current_data(
+                    *snapshot_filter, get_many=api.trove.instance_get_many)
+            else:
+                instances = api.trove.instance_list(self.request,
+                                                    marker=marker)
+                self._more = instances.next or False
         except Exception:
             self._more = False
             instances = []
             msg = _('Unable to retrieve database instances.')
             exceptions.handle(self.request, msg)
+        rows = []
         for instance in instances:
             # The instance might have gotten deleted since we last collected
             #  our instance list. Try to be a bit graceful if it's gone.
             try:
-                self._extra_data(instance)
+                rows.append(self._extra_data(instance))
             except Exception:
                 msg = _('Unable to retrieve details for instance %s' %
                         instance.id)
                 redirect = reverse('horizon:project:databases:index')
                 exceptions.handle(self.request, msg, redirect=redirect)
-        return instances
+        return rows
 
 
 class LaunchInstanceView(horizon_workflows.WorkflowView):
@@ -103,6 +120,27 @@ class LaunchInstanceView(horizon_workflows.WorkflowView):
         return initial
 
 
+class LaunchFlavorsView(generic.View):
+    """Sorted flavor choices of the datastore version of the launch form."""
+
+    def get(self, request, *args, **kwargs):
+        try:
+            datastore, datastore_version = (
+                create_instance.parse_datastore_and_version_text(
+                    common_utils.unhexlify(request.GET.get('datastore', ''))))
+        except ValueError:
+            return http.HttpResponseBadRequest()
+        if not datastore:
+            return http.HttpResponseBadRequest()
+        try:
+            choices = api.catalog.datastore_flavor_choices(
+                request, datastore, datastore_version)
+        except Exception:
+            error = exceptions.handle(request, ignore=True)
+            return http.HttpResponse(status=error.status_code)
+        return http.JsonResponse({'flavors': choices})
+
+
 class UpdateInstanceView(horizon_forms.ModalFormView):
     form_class = forms.UpdateInstanceForm
     form_id = "attach_config_form"
@@ -214,36 +252,41 @@ class AccessDetailView(horizon_tables.DataTableView):
         instance_id = self.kwargs['instance_id']
         user_name = self.kwargs['user_name']
         user_host = self.kwargs['user_host']
+        fetchers = {
+            'databases': lambda: api.trove.database_list(self.request,
+                                                         instance_id),
+            'granted': lambda: api.trove.user_show_access(
+                self.request, instance_id, user_name, host=user_host),
+        }
+        # The two lists don't depend on each other, fetch them together.
+        results, errors = concurrency.call_parallel(
+            lambda name: fetchers[name](), fetchers)
+        results.update(errors)
+        redirect = reverse('horizon:project:databases:detail',
+                           args=[instance_id])
         try:
-            databases = api.trove.database_list(self.request, instance_id)
+            databases = results['databases']
+            if isinstance(databases, Exception):
+                raise databases
         except Exception:
             databases = []
-            redirect = reverse('horizon:project:databases:detail',
-                               args=[instance_id])
             exceptions.handle(self.request,
                               _('Unable to retrieve databases.'),
                               redirect=redirect)
         try:
-            granted = api.trove.user_show_access(
-                self.request, instance_id, user_name, host=user_host)
+            granted = results['granted']
+            if isinstance(granted, Exception):
+                raise granted
         except Exception:
             granted = []
-            redirect = reverse('horizon:project:databases:detail',
-                               args=[instance_id])
             exceptions.handle(self.request,
                               _('Unable to retrieve accessible databases.'),
                               redirect=redirect)
 
-        db_access_list = []
-        for database in databases:
-            if database in granted:
-                access = True
-            else:
-                access = False
-
-            db_access = DBAccess(database.name, access)
-            db_access_list.append(db_access)
-
+        granted_names = set(database.name for database in granted)
+        db_access_list = [DBAccess(database.name,
+                                   database.name in granted_names)
+                          for database in databases]
         return sorted(db_access_list, key=lambda data: (data.name))
 
     def get_context_data(self, **kwargs):
@@ -301,12 +344,51 @@ class DetailView(horizon_tabs.TabbedTableView):
         context["actions"] = table.render_row_actions(instance)
         return context
 
+    # Calls returning the data of each tab, keyed on the tab slug. The ones
+    # of the tab shown are made together with the instance lookup.
+    tab_prefetch = {
+        'overview': ('root_show',),
+        'users_tab': ('users_list',),
+        'database_tab': ('database_list',),
+        'backups_tab': ('instance_backups',),
+        'logs_tab': ('log_list',),
+        'config_defaults': ('configuration_default',),
+    }
+
+    def get_selected_tab_slug(self):
+        tab_group_class = self.tab_group_class
+        selected = self.request.GET.get(tab_group_class.param_name, '')
+        tab_group, separator, tab_slug = selected.partition('__')
+        if tab_group == tab_group_class.slug and tab_slug:
+            return tab_slug
+        return tab_group_class.tabs[0].slug
+
+    @memoized.memoized_method
+    def get_prefetched_data(self):
+        """Return the instance and a dict of the tab data prefetched."""
+        instance_id = self.kwargs['instance_id']
+        names = ('instance_get',)
+        # Table actions and row updates are handled without rendering the
+        # tabs, their data is not needed.
+        table_name, action, obj_id = (
+            horizon_tables.DataTable.check_handler(self.request))
+        if not table_name:
+            names += self.tab_prefetch.get(self.get_selected_tab_slug(), ())
+        results, errors = concurrency.call_parallel(
+            lambda name: getattr(api.trove, name)(self.request, instance_id),
+            names)
+        # The tabs raise the errors as the calls would have.
+        results.update(errors)
+        return results.pop('instance_get'), results
+
     @memoized.memoized_method
     def get_data(self):
+        instance_id = self.kwargs['instance_id']
         try:
             LOG.info("Obtaining instance for detailed view ")
-            instance_id = self.kwargs['instance_id']
-            instance = api.trove.instance_get(self.request, instance_id)
+            instance, prefetched = self.get_prefetched_data()
+            if isinstance(instance, Exception):
+                raise instance
             instance.host = tables.get_host(instance)
         except Exception:
             msg = _('Unable to retrieve details '
@@ -314,7 +396,7 @@ class DetailView(horizon_tabs.TabbedTableView):
             exceptions.handle(self.request, msg,
                               redirect=self.get_redirect_url())
         try:
-            instance.full_flavor = api.trove.flavor_get(
+            instance.full_flavor = api.catalog.flavor_get(
                 self.request, instance.flavor["id"])
         except Exception:
             LOG.error('Unable to retrieve flavor details'
@@ -323,7 +405,9 @@ class DetailView(horizon_tabs.TabbedTableView):
 
     def get_tabs(self, request, *args, **kwargs):
         instance = self.get_data()
-        return self.tab_group_class(request, instance=instance, **kwargs)
+        prefetched = self.get_prefetched_data()[1]
+        return self.tab_group_class(request, instance=instance,
+                                    prefetched=prefetched, **kwargs)
 
     @staticmethod
     def get_redirect_url():
@@ -415,7 +499,7 @@ class ResizeInstanceView(horizon_forms.ModalFormView):
             if flavor_id in flavors:
                 instance.flavor_name = flavors[flavor_id]
             else:
-                flavor = api.trove.flavor_get(self.request, flavor_id)
+                flavor = api.catalog.flavor_get(self.request, flavor_id)
                 instance.flavor_name = flavor.name
             return instance
         except Exception:
@@ -433,7 +517,7 @@ class ResizeInstanceView(horizon_forms.ModalFormView):
     @memoized.memoized_method
     def get_flavors(self, *args, **kwargs):
         try:
-            flavors = api.trove.flavor_list(self.request)
+            flavors = api.catalog.flavor_list(self.request)
             return instance_utils.sort_flavor_list(self.request, flavors)
         except Exception:
             redirect = reverse("horizon:project:databases:index")
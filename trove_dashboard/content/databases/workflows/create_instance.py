@@ -14,6 +14,7 @@
 
 from django.conf import settings
 from django.urls import reverse
+from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 
 from horizon import exceptions
@@ -103,6 +104,14 @@ class SetInstanceDetailsAction(workflows.Action):
             'class': 'switchable',
             'data-slug': 'datastore'
         }))
+    flavor = forms.ChoiceField(
+        label=_("Flavor"),
+        help_text=_("Size of image to launch."),
+        required=False,
+        widget=forms.Select(attrs={
+            'data-flavors-url': reverse_lazy(
+                'horizon:project:databases:launch_flavors')
+        }))
 
     def __init__(self, request, *args, **kwargs):
         if args:
@@ -136,15 +145,9 @@ class SetInstanceDetailsAction(workflows.Action):
         if not datastore_and_version:
             msg = _("You must select a datastore type and version.")
             self._errors["datastore"] = self.error_class([msg])
-        else:
-            datastore, datastore_version = parse_datastore_and_version_text(
-                common_utils.unhexlify(datastore_and_version))
-            field_name = self._build_flavor_field_name(datastore,
-                                                       datastore_version)
-            flavor = self.data.get(field_name, None)
-            if not flavor:
-                msg = _("You must select a flavor.")
-                self._errors[field_name] = self.error_class([msg])
+        elif not self.cleaned_data.get("flavor"):
+            msg = _("You must select a flavor.")
+            self._errors["flavor"] = self.error_class([msg])
 
         if not self.data.get("locality", None):
             self.cleaned_data["locality"] = None
@@ -152,16 +155,8 @@ class SetInstanceDetailsAction(workflows.Action):
         return self.cleaned_data
 
     def handle(self, request, context):
-        datastore_and_version = context["datastore"]
-        if datastore_and_version:
-            datastore, datastore_version = parse_datastore_and_version_text(
-                common_utils.unhexlify(context["datastore"]))
-            field_name = self._build_flavor_field_name(datastore,
-                                                       datastore_version)
-            flavor = self.data[field_name]
-            if flavor:
-                context["flavor"] = flavor
-                return context
+        if context["datastore"] and context["flavor"]:
+            return context
         return None
 
     @memoized.memoized_method
@@ -192,9 +187,9 @@ class SetInstanceDetailsAction(workflows.Action):
         return zone_list
 
     @memoized.memoized_method
-    def datastore_flavors(self, request, datastore_name, datastore_version):
+    def flavor_choices(self, request, datastore_name, datastore_version):
         try:
-            return api.trove.datastore_flavors(
+            return api.catalog.datastore_flavor_choices(
                 request, datastore_name, datastore_version)
         except Exception:
             LOG.exception("Exception while obtaining flavors list")
@@ -217,7 +212,7 @@ class SetInstanceDetailsAction(workflows.Action):
     @memoized.memoized_method
     def datastores(self, request):
         try:
-            return api.trove.datastore_list(request)
+            return api.catalog.datastore_list(request)
         except Exception:
             LOG.exception("Exception while obtaining datastores list")
             self._datastores = []
@@ -225,7 +220,7 @@ class SetInstanceDetailsAction(workflows.Action):
     @memoized.memoized_method
     def datastore_versions(self, request, datastore):
         try:
-            return api.trove.datastore_version_list(request, datastore)
+            return api.catalog.datastore_version_list(request, datastore)
         except Exception:
             LOG.exception("Exception while obtaining datastore version list")
             self._datastore_versions = []
@@ -239,7 +234,7 @@ class SetInstanceDetailsAction(workflows.Action):
             return None
 
     def populate_datastore_choices(self, request, context):
-        choices = ()
+        choices = []
         datastores = self.datastores(request)
         if datastores is not None:
             if self.backup_id:
@@ -251,7 +246,6 @@ class SetInstanceDetailsAction(workflows.Action):
                 versions = self.datastore_versions(request, ds.name)
                 if versions:
                     # only add to choices if datastore has at least one version
-                    version_choices = ()
                     for v in versions:
                         # NOTE(zhaochao): please refer to the comment about
                         # the same change for 'populate_datastore_choices'
@@ -267,37 +261,23 @@ class SetInstanceDetailsAction(workflows.Action):
                             ds.name, v.name)
                         widget_text = self._build_widget_field_name(
                             ds.name, v.name)
-                        version_choices = (version_choices +
-                                           ((widget_text, selection_text),))
-                        self._add_datastore_flavor_field(request,
-                                                         ds.name,
-                                                         v.name)
-                    choices = choices + version_choices
+                        choices.append((widget_text, selection_text))
         return choices
 
-    def _add_datastore_flavor_field(self,
-                                    request,
-                                    datastore,
-                                    datastore_version):
-        name = self._build_widget_field_name(datastore, datastore_version)
-        attr_key = 'data-datastore-' + name
-        field_name = self._build_flavor_field_name(datastore,
-                                                   datastore_version)
-        self.fields[field_name] = forms.ChoiceField(
-            label=_("Flavor"),
-            help_text=_("Size of image to launch."),
-            required=False,
-            widget=forms.Select(attrs={
-                'class': 'switched',
-                'data-switch-on': 'datastore',
-                attr_key: _("Flavor")
-            }))
-        valid_flavors = self.datastore_flavors(request,
-                                               datastore,
-                                               datastore_version)
-        if valid_flavors:
-            self.fields[field_name].choices = instance_utils.sort_flavor_list(
-                request, valid_flavors)
+    def populate_flavor_choices(self, request, context):
+        # Only the flavors of the selected datastore version are rendered,
+        # the flavor list is refilled from the launch_flavors view when
+        # another one is selected.
+        datastore_choices = [choice for choice, label
+                             in self.fields['datastore'].choices]
+        datastore_and_version = self.data.get('datastore')
+        if datastore_and_version not in datastore_choices:
+            if not datastore_choices:
+                return []
+            datastore_and_version = datastore_choices[0]
+        datastore, datastore_version = parse_datastore_and_version_text(
+            common_utils.unhexlify(datastore_and_version))
+        return self.flavor_choices(request, datastore, datastore_version) or []
 
     def _build_datastore_display_text(self, datastore, datastore_version):
         return datastore + ' - ' + datastore_version
@@ -309,10 +289,6 @@ class SetInstanceDetailsAction(workflows.Action):
         return common_utils.hexlify(
             self._build_datastore_display_text(datastore, datastore_version))
 
-    def _build_flavor_field_name(self, datastore, datastore_version):
-        return self._build_widget_field_name(datastore,
-                                             datastore_version)
-
 
 TROVE_ADD_USER_PERMS = getattr(settings, 'TROVE_ADD_USER_PERMS', [])
 TROVE_ADD_DATABASE_PERMS = getattr(settings, 'TROVE_ADD_DATABASE_PERMS', [])
@@ -480,7 +456,7 @@ class AdvancedAction(workflows.Action):
     def populate_backup_choices(self, request, context):
         try:
             choices = []
-            backups = api.trove.backup_list(request)
+            backups = api.trove.backup_list_all(request)
             for b in backups:
                 if self.backup_id and b.id != self.backup_id:
                     continue
@@ -496,9 +472,9 @@ class AdvancedAction(workflows.Action):
         return choices
 
     def _get_instances(self):
-        instances = []
+        instances = api.catalog.InstanceSnapshot([])
         try:
-            instances = api.trove.instance_list_all(self.request)
+            instances = api.catalog.instance_snapshot(self.request)
         except Exception:
             msg = _('Unable to retrieve database instances.')
             exceptions.handle(self.request, msg)
@@ -508,7 +484,7 @@ class AdvancedAction(workflows.Action):
         try:
             instances = self._get_instances()
             choices = sorted([(i.id, i.name) for i in
-                             instances if i.status == 'HEALTHY'],
+                              instances.with_status('HEALTHY')],
                              key=lambda i: i[1])
         except Exception:
             choices = []
@@ -700,6 +676,7 @@ class LaunchInstance(workflows.Workflow):
                                       locality=self._get_locality(context),
                                       availability_zone=avail_zone,
                                       access=self._get_access(context))
+            api.catalog.instance_snapshot_invalidate(request)
             return True
         except Exception:
             exceptions.handle(request)
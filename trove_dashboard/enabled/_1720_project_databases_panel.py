@@ -29,3 +29,9 @@ ADD_EXCEPTIONS = {
     'recoverable': exceptions.RECOVERABLE,
     'unauthorized': exceptions.UNAUTHORIZED
 }
+
+ADD_JS_FILES = [
+    'dashboard/project/trove/horizon.trove.launch.js',
+    'dashboard/project/trove/horizon.trove.logs.js',
+    'dashboard/project/trove/horizon.trove.tables.js',
+]
@@ -39,8 +39,21 @@
 
     return service;
 
-  function getBackups() {
-    return apiService.get('/api/trove/backups/')
+  /**
+   * @name getBackups
+   * @description
+   * Get a page of backups.
+   *
+   * @param {Object} params
+   * Optional query parameters: 'limit', the size of the page, and
+   * 'marker', the id of the last backup of the previous page.
+   *
+   * The result is an object with 'items', the backups of the page, and
+   * 'has_more_data', true when further pages can be requested.
+   */
+  function getBackups(params) {
+    var config = params ? {'params': params} : {};
+    return apiService.get('/api/trove/backups/', config)
       .catch(function() {
         toastService.add('error', gettext('Unable to retrieve the Backups.'));
       });
@@ -41,6 +41,8 @@
     ctrl.config = config;
     ctrl.backups = [];
     ctrl.backupsSrc = [];
+    ctrl.hasMore = false;
+    ctrl.loadMore = loadMore;
 
     init();
 
@@ -50,8 +52,15 @@
       trove.getBackups().success(getBackupsSuccess);
     }
 
+    function loadMore() {
+      var last = ctrl.backupsSrc[ctrl.backupsSrc.length - 1];
+      trove.getBackups({marker: last.id}).success(getBackupsSuccess);
+    }
+
     function getBackupsSuccess(response) {
-      ctrl.backups = response;
+      ctrl.backupsSrc = ctrl.backupsSrc.concat(response.items);
+      ctrl.backups = ctrl.backupsSrc;
+      ctrl.hasMore = response.has_more_data;
     }
   }
 
@@ -0,0 +1,79 @@
+/**
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may
+ * not use this file except in compliance with the License. You may obtain
+ * a copy of the License at
+ *
+ *    http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations
+ * under the License.
+ */
+
+/* Flavor field of the launch database workflow.
+ *
+ * Only the flavors of the selected datastore version are rendered with the
+ * form, they are fetched from the URL given by the data-flavors-url
+ * attribute of the flavor field when another one is selected.
+ */
+horizon.trove = horizon.trove || {};
+
+horizon.trove.launch = {
+  // Flavor choices already fetched, by datastore version.
+  flavors: {},
+
+  update_flavors: function ($datastore) {
+    var $flavor = $datastore.closest('form').find('select[data-flavors-url]');
+    var datastore = $datastore.val();
+
+    if (!$flavor.length || !datastore) { return; }
+
+    if (datastore in horizon.trove.launch.flavors) {
+      horizon.trove.launch.fill_flavors(
+        $flavor, horizon.trove.launch.flavors[datastore]);
+      return;
+    }
+
+    $flavor.prop('disabled', true);
+    $.ajax({
+      url: $flavor.attr('data-flavors-url'),
+      data: {datastore: datastore},
+      dataType: 'json',
+      success: function (data) {
+        horizon.trove.launch.flavors[datastore] = data.flavors;
+        // Ignore the answer if another datastore was selected meanwhile.
+        if ($datastore.val() === datastore) {
+          horizon.trove.launch.fill_flavors($flavor, data.flavors);
+        }
+      },
+      error: function () {
+        horizon.toast.add('error', gettext('Unable to obtain flavors.'));
+      },
+      complete: function () {
+        $flavor.prop('disabled', false);
+      }
+    });
+  },
+
+  fill_flavors: function ($flavor, flavors) {
+    var selected = $flavor.val();
+    $flavor.empty();
+    $.each(flavors, function (index, flavor) {
+      $('<option>').val(flavor[0]).text(flavor[1]).appendTo($flavor);
+    });
+    if (selected && $flavor.find('option').filter(function () {
+      return this.value === selected;
+    }).length) {
+      $flavor.val(selected);
+    }
+    $flavor.trigger('change');
+  }
+};
+
+horizon.addInitFunction(horizon.trove.launch.init = function () {
+  $(document).on('change', 'form select[name="datastore"]', function () {
+    horizon.trove.launch.update_flavors($(this));
+  });
+});
@@ -0,0 +1,154 @@
+/**
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may
+ * not use this file except in compliance with the License. You may obtain
+ * a copy of the License at
+ *
+ *    http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations
+ * under the License.
+ */
+
+/* Follow mode and search of the guest log view.
+ *
+ * While "Refresh Published Log" is checked the console view is asked for
+ * the lines published after a cursor, which it returns with the cursor to
+ * ask from next, and those lines are appended to the log shown. Only what
+ * the guest already published to Swift is read, lines written since the
+ * last publish only show up once the log is published again.
+ *
+ * Searches are run by the search view, the matching lines and their
+ * context replace the log shown.
+ */
+horizon.trove = horizon.trove || {};
+
+horizon.trove.logs = {
+  // Lines kept in the page while following a log.
+  max_lines: 5000,
+  // Milliseconds to wait before asking again after new lines, doubled
+  // after every poll without new lines up to max_interval.
+  min_interval: 2 * 1000,
+  max_interval: 30 * 1000,
+  // Milliseconds to wait before asking again after an error.
+  retry_interval: 10 * 1000,
+  cursor: null,
+  interval: null,
+  request: null,
+  timer: null,
+
+  start: function () {
+    horizon.trove.logs.cursor = '';
+    horizon.trove.logs.interval = horizon.trove.logs.min_interval;
+    horizon.trove.logs.poll();
+  },
+
+  stop: function () {
+    horizon.trove.logs.cursor = null;
+    clearTimeout(horizon.trove.logs.timer);
+    if (horizon.trove.logs.request) {
+      horizon.trove.logs.request.abort();
+      horizon.trove.logs.request = null;
+    }
+  },
+
+  poll: function () {
+    var cursor = horizon.trove.logs.cursor;
+    if (cursor === null) { return; }
+
+    horizon.trove.logs.request = $.ajax({
+      url: $('#tail_length').attr('action'),
+      data: {cursor: cursor},
+      dataType: 'json',
+      success: function (data) {
+        if (horizon.trove.logs.cursor !== cursor) { return; }
+        horizon.trove.logs.append(data.contents);
+        horizon.trove.logs.cursor = data.cursor;
+        // The server answers at once, back off while nothing is published.
+        if (data.contents || data.cursor !== cursor) {
+          horizon.trove.logs.interval = horizon.trove.logs.min_interval;
+        } else {
+          horizon.trove.logs.interval = Math.min(
+            horizon.trove.logs.interval * 2, horizon.trove.logs.max_interval);
+        }
+        horizon.trove.logs.schedule(horizon.trove.logs.interval);
+      },
+      error: function (xhr, status) {
+        if (status === 'abort') { return; }
+        horizon.trove.logs.schedule(horizon.trove.logs.retry_interval);
+      }
+    });
+  },
+
+  schedule: function (delay) {
+    var cursor = horizon.trove.logs.cursor;
+    clearTimeout(horizon.trove.logs.timer);
+    horizon.trove.logs.timer = setTimeout(function () {
+      // Unless following was stopped or restarted meanwhile.
+      if (horizon.trove.logs.cursor === cursor) {
+        horizon.trove.logs.poll();
+      }
+    }, delay);
+  },
+
+  search: function ($form) {
+    horizon.trove.logs.stop();
+    $('#follow_log').prop('checked', false);
+    $.ajax({
+      url: $form.attr('action'),
+      data: $form.serialize(),
+      dataType: 'json',
+      success: function (data) {
+        horizon.trove.logs.show_matches(data);
+      },
+      error: function (xhr) {
+        horizon.toast.add('error', xhr.status === 400 && xhr.responseText ?
+          xhr.responseText : gettext('Unable to search the log.'));
+      }
+    });
+  },
+
+  show_matches: function (data) {
+    var blocks = $.map(data.matches, function (match) {
+      var lines = [];
+      var number = match.line - match.before.length;
+      $.each(match.before.concat([match.text], match.after), function (i, text) {
+        lines.push((number + i) + (number + i === match.line ? ': ' : '- ') + text);
+      });
+      return lines.join('\n');
+    });
+    var summary = interpolate(
+      ngettext('%s match', '%s matches', data.count), [data.count]);
+    if (data.truncated) {
+      summary += ' ' + gettext('(search stopped before the end of the log)');
+    }
+    $('pre.logs').text(summary + '\n\n' + blocks.join('\n--\n'));
+  },
+
+  append: function (contents) {
+    if (!contents) { return; }
+    var $logs = $('pre.logs');
+    var lines = ($logs.text() + contents).split('\n');
+    if (lines.length > horizon.trove.logs.max_lines) {
+      lines = lines.slice(lines.length - horizon.trove.logs.max_lines);
+    }
+    $logs.text(lines.join('\n'));
+    $logs.scrollTop($logs[0].scrollHeight);
+  }
+};
+
+horizon.addInitFunction(horizon.trove.logs.init = function () {
+  $(document).on('submit', '#log_search', function (evt) {
+    evt.preventDefault();
+    horizon.trove.logs.search($(this));
+  });
+  $(document).on('change', '#follow_log', function () {
+    if (this.checked) {
+      horizon.trove.logs.start();
+    } else {
+      horizon.trove.logs.stop();
+    }
+  });
+});
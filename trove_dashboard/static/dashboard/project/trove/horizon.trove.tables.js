@@ -0,0 +1,167 @@
+/**
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may
+ * not use this file except in compliance with the License. You may obtain
+ * a copy of the License at
+ *
+ *    http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations
+ * under the License.
+ */
+
+/* Batched status polling of the Trove tables.
+ *
+ * Rows rendered with the "ajax-batch-update" class are refreshed with one
+ * request per table and poll interval, instead of one request per row as
+ * done by horizon.datatables.update.
+ */
+horizon.trove = horizon.trove || {};
+
+horizon.trove.tables = {
+  update: function () {
+    $('table.datatable').each(function () {
+      var $table = $(this);
+      if ($table.find('tr.warning.ajax-batch-update').length &&
+          !$table.data('batch-update-scheduled')) {
+        horizon.trove.tables.update_table($table);
+      }
+    });
+  },
+
+  schedule: function ($table, interval) {
+    var decay_constant = ($table.data('batch-update-decay') || 0) + 1;
+    // Limit the interval to 30 secs, as horizon.datatables.update does.
+    var next_poll = Math.min(interval * decay_constant, 30 * 1000);
+    $table.data('batch-update-decay', decay_constant);
+    $table.data('batch-update-scheduled', true);
+    setTimeout(function () {
+      $table.data('batch-update-scheduled', false);
+      horizon.trove.tables.update_table($table);
+    }, next_poll);
+  },
+
+  update_table: function ($table) {
+    var $rows_to_update = $table.find('tr.warning.ajax-batch-update');
+    var interval = $rows_to_update.attr('data-update-interval');
+
+    // do nothing if there are no rows to update.
+    if ($rows_to_update.length <= 0) { return; }
+
+    // Do not update the rows while an action menu is expanded.
+    if ($rows_to_update.find('.actions_column .btn-group.open').length) {
+      $table.removeData('batch-update-decay');
+      horizon.trove.tables.schedule($table, interval);
+      return;
+    }
+
+    var obj_ids = $rows_to_update.map(function () {
+      return $(this).attr('data-object-id');
+    }).get();
+
+    horizon.ajax.queue({
+      url: $rows_to_update.attr('data-batch-update-url'),
+      data: {obj_id: obj_ids},
+      traditional: true,
+      dataType: 'json',
+      error: function () {
+        console.log(gettext("An error occurred while updating."));
+      },
+      success: function (data) {
+        var changed = false;
+        $rows_to_update.each(function () {
+          var $row = $(this);
+          var obj_id = $row.attr('data-object-id');
+          if ($.inArray(obj_id, data.deleted) !== -1) {
+            horizon.trove.tables.remove_row($table, $row);
+            changed = true;
+          } else if (obj_id in data.rows) {
+            changed = horizon.trove.tables.replace_row(
+              $row, $(data.rows[obj_id])) || changed;
+          }
+        });
+        if (changed) {
+          recompileAngularContent($table);
+          // Reset tablesorter's data cache.
+          $table.trigger("update");
+          // Reset decay constant.
+          $table.removeData('batch-update-decay');
+          // Reset quicksearch's data cache.
+          if ($table.attr('id') in horizon.datatables.qs) {
+            horizon.datatables.qs[$table.attr('id')].cache();
+          }
+          horizon.datatables.update_actions();
+        }
+      },
+      complete: function () {
+        // Revalidate the button check for the updated table
+        horizon.datatables.validate_button();
+        horizon.trove.tables.schedule($table, interval);
+      }
+    });
+  },
+
+  remove_row: function ($table, $row) {
+    // existing count minus one for the row we're removing
+    var row_count = horizon.datatables.update_footer_count($table, -1);
+
+    if (row_count === 0) {
+      var colspan = $table.find('.table_column_header th').length;
+      var template = horizon.templates.compiled_templates["#empty_row_template"];
+      $row.replaceWith(template.render({
+        colspan: colspan,
+        no_items_label: gettext("No items to display.")
+      }));
+    } else {
+      $row.remove();
+    }
+  },
+
+  replace_row: function ($row, $new_row) {
+    if ($new_row.hasClass('warning')) {
+      var $container = $(document.createElement('div'))
+        .addClass('progress-text horizon-loading-bar');
+
+      var $progress = $(document.createElement('div'))
+        .addClass('progress progress-striped active')
+        .appendTo($container);
+
+      // Incomplete progress bar addition
+      var width = $new_row.find('[percent]:first').attr('percent') || "100%";
+
+      $(document.createElement('div'))
+        .addClass('progress-bar')
+        .css("width", width)
+        .appendTo($progress);
+
+      // if action/confirm is required, show progress-bar with "?"
+      // icon to indicate user action is required
+      if ($new_row.find('.btn-action-required').length > 0) {
+        $(document.createElement('span'))
+          .addClass('fa fa-question-circle progress-bar-text')
+          .appendTo($container);
+      }
+      $new_row.find("td.warning:last").prepend($container);
+    }
+
+    // Only replace row if the html content has changed
+    if ($new_row.html() === $row.html()) {
+      return false;
+    }
+    var $checkbox = $row.find('.table-row-multi-select');
+    if ($checkbox.length && $checkbox[0].checked) {
+      // Preserve the checkbox if it's already clicked
+      $new_row.find('.table-row-multi-select').prop('checked', true);
+    }
+    $row.replaceWith($new_row);
+    return true;
+  }
+};
+
+horizon.addInitFunction(horizon.trove.tables.init = function () {
+  horizon.trove.tables.update();
+  // Tables loaded later, e.g. in tabs, are picked up as well.
+  $(document).on('shown.bs.tab', horizon.trove.tables.update);
+});
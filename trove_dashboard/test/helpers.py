@@ -11,6 +11,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from django.core import cache
 from openstack_dashboard.test import helpers
 
 from trove_dashboard.test.test_data import utils
@@ -29,6 +30,12 @@ IsHttpRequest = helpers.IsHttpRequest
 
 
 class TroveTestsMixin(object):
+    def setUp(self):
+        super(TroveTestsMixin, self).setUp()
+        # Catalog data is cached across requests, don't leak it from one
+        # test into the next.
+        cache.cache.clear()
+
     def _setup_test_data(self):
         super(TroveTestsMixin, self)._setup_test_data()
         utils.load_test_data(self)
@@ -40,3 +47,7 @@ class TestCase(TroveTestsMixin, helpers.TestCase):
 
 class BaseAdminViewTests(TroveTestsMixin, helpers.TestCase):
     pass
+
+
+class APITestCase(TroveTestsMixin, helpers.APITestCase):
+    pass
@@ -0,0 +1,187 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from trove_dashboard import api
+from trove_dashboard.test import helpers as test
+
+
+class FlavorCatalogTests(test.APITestCase):
+    def _new_request(self):
+        request = self.factory.get('/')
+        request.user = self.request.user
+        return request
+
+    @test.create_mocks({api.trove: ('flavor_list', 'flavor_get')})
+    def test_flavor_list_cached_across_requests(self):
+        self.mock_flavor_list.return_value = self.database_flavors.list()
+
+        first = api.catalog.flavor_list(self._new_request())
+        second = api.catalog.flavor_list(self._new_request())
+
+        self.assertEqual(self.database_flavors.list(), first)
+        self.assertEqual(first, second)
+        self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_flavor_get.assert_not_called()
+
+    @test.create_mocks({api.trove: ('flavor_list', 'flavor_get')})
+    def test_flavor_get_from_index(self):
+        flavor = self.database_flavors.first()
+        self.mock_flavor_list.return_value = self.database_flavors.list()
+
+        self.assertEqual(flavor,
+                         api.catalog.flavor_get(self.request, flavor.id))
+        self.mock_flavor_list.assert_called_once_with(test.IsHttpRequest())
+        self.mock_flavor_get.assert_not_called()
+
+    @test.create_mocks({api.trove: ('flavor_list', 'flavor_get')})
+    def test_flavor_get_missing_falls_back(self):
+        flavor = self.database_flavors.first()
+        self.mock_flavor_list.return_value = []
+        self.mock_flavor_get.return_value = flavor
+
+        self.assertEqual(flavor,
+                         api.catalog.flavor_get(self.request, flavor.id))
+        self.mock_flavor_get.assert_called_once_with(test.IsHttpRequest(),
+                                                     flavor.id)
+
+    @test.create_mocks({api.trove: ('datastore_flavors',)})
+    def test_datastore_flavor_choices_sorted_and_cached(self):
+        flavors = self.database_flavors.list()
+        self.mock_datastore_flavors.return_value = list(reversed(flavors))
+        expected = [(f.id, f.name)
+                    for f in sorted(flavors, key=lambda f: f.ram)]
+
+        for request in (self._new_request(), self._new_request()):
+            self.assertEqual(expected, api.catalog.datastore_flavor_choices(
+                request, 'mysql', '5.5'))
+
+        self.mock_datastore_flavors.assert_called_once_with(
+            test.IsHttpRequest(), 'mysql', '5.5')
+
+
+class DatastoreCatalogTests(test.APITestCase):
+    def _new_request(self):
+        request = self.factory.get('/')
+        request.user = self.request.user
+        return request
+
+    @test.create_mocks({api.trove: ('datastore_list',
+                                    'datastore_version_list',
+                                    'configuration_parameters_list')})
+    def test_cached_across_requests(self):
+        datastore = self.datastores.first()
+        self.mock_datastore_list.return_value = self.datastores.list()
+        self.mock_datastore_version_list.return_value = (
+            self.datastore_versions.list())
+        self.mock_configuration_parameters_list.return_value = (
+            self.configuration_parameters.list())
+
+        for request in (self._new_request(), self._new_request()):
+            self.assertEqual(
+                [ds.name for ds in self.datastores.list()],
+                [ds.name for ds in api.catalog.datastore_list(request)])
+            self.assertEqual(
+                [v.id for v in self.datastore_versions.list()],
+                [v.id for v in api.catalog.datastore_version_list(
+                    request, datastore.name)])
+            self.assertEqual(
+                [p.name for p in self.configuration_parameters.list()],
+                [p.name for p in api.catalog.configuration_parameters_list(
+                    request, datastore.name, '5.5')])
+
+        self.mock_datastore_list.assert_called_once_with(
+            test.IsHttpRequest())
+        self.mock_datastore_version_list.assert_called_once_with(
+            test.IsHttpRequest(), datastore.name)
+        self.mock_configuration_parameters_list.assert_called_once_with(
+            test.IsHttpRequest(), datastore.name, '5.5')
+
+    @test.create_mocks({api.trove: ('datastore_list',)})
+    def test_stale_entry_refreshed(self):
+        datastores = self.datastores.list()
+        self.mock_datastore_list.side_effect = [datastores, datastores[:1]]
+        api.catalog.datastore_list(self._new_request())
+
+        with mock.patch.object(api.catalog.time, 'time',
+                               return_value=(api.catalog.time.time() +
+                                             api.catalog.CATALOG_CACHE_TTL +
+                                             1)):
+            refreshed = api.catalog.datastore_list(self._new_request())
+
+        self.assertEqual(1, len(refreshed))
+        self.assertEqual(2, self.mock_datastore_list.call_count)
+
+    @test.create_mocks({api.trove: ('datastore_list',)})
+    def test_stale_entry_served_on_refresh_error(self):
+        self.mock_datastore_list.side_effect = [self.datastores.list(),
+                                                self.exceptions.trove]
+        api.catalog.datastore_list(self._new_request())
+
+        with mock.patch.object(api.catalog.time, 'time',
+                               return_value=(api.catalog.time.time() +
+                                             api.catalog.CATALOG_CACHE_TTL +
+                                             1)):
+            datastores = api.catalog.datastore_list(self._new_request())
+
+        self.assertEqual(len(self.datastores.list()), len(datastores))
+        self.assertEqual(2, self.mock_datastore_list.call_count)
+
+
+class InstanceSnapshotTests(test.APITestCase):
+    def _new_request(self):
+        request = self.factory.get('/')
+        request.user = self.request.user
+        return request
+
+    @test.create_mocks({api.trove: ('instance_list_all',)})
+    def test_indexed_and_cached_across_requests(self):
+        instances = self.databases.list()
+        self.mock_instance_list_all.return_value = instances
+
+        for request in (self._new_request(), self._new_request()):
+            snapshot = api.catalog.instance_snapshot(request)
+            self.assertEqual([i.id for i in instances],
+                             [i.id for i in snapshot])
+            self.assertEqual(instances[0].name,
+                             snapshot.get(instances[0].id).name)
+            self.assertIsNone(snapshot.get('missing'))
+            self.assertEqual(
+                [i.id for i in instances if i.status == 'HEALTHY'],
+                [i.id for i in snapshot.with_status('HEALTHY')])
+
+        self.mock_instance_list_all.assert_called_once_with(
+            test.IsHttpRequest())
+
+    @test.create_mocks({api.trove: ('instance_list_all',)})
+    def test_search(self):
+        instances = self.databases.list()
+        self.mock_instance_list_all.return_value = instances
+
+        snapshot = api.catalog.instance_snapshot(self.request)
+
+        self.assertEqual([instances[1].id],
+                         [i.id for i in snapshot.search('name', 'DNS')])
+        self.assertEqual([i.id for i in instances],
+                         [i.id for i in snapshot.search('name', 'test')])
+        self.assertEqual([], snapshot.search('datastore', 'redis'))
+
+    @test.create_mocks({api.trove: ('instance_list_all',)})
+    def test_invalidate(self):
+        self.mock_instance_list_all.return_value = self.databases.list()
+
+        api.catalog.instance_snapshot(self._new_request())
+        api.catalog.instance_snapshot_invalidate(self.request)
+        api.catalog.instance_snapshot(self._new_request())
+
+        self.assertEqual(2, self.mock_instance_list_all.call_count)
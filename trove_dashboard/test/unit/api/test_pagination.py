@@ -0,0 +1,56 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+from troveclient import common
+
+from trove_dashboard import api
+from trove_dashboard.test import helpers as test
+
+
+class PaginationTests(test.APITestCase):
+    def _pages(self):
+        databases = self.databases.list()
+        return [
+            common.Paginated(databases[:1], next_marker='m1'),
+            common.Paginated(databases[1:2], next_marker='m2'),
+            common.Paginated(databases[2:]),
+        ]
+
+    @test.create_mocks({api.trove: ('instance_list',)})
+    def test_instance_list_all(self):
+        self.mock_instance_list.side_effect = self._pages()
+
+        result = api.trove.instance_list_all(self.request)
+
+        self.assertEqual(self.databases.list(), result)
+        self.assertEqual(
+            [mock.call(self.request),
+             mock.call(self.request, marker='m1'),
+             mock.call(self.request, marker='m2')],
+            self.mock_instance_list.call_args_list)
+
+    def test_paginate_is_lazy(self):
+        list_page = mock.Mock(side_effect=self._pages())
+
+        resources = api.pagination.paginate(list_page, self.request)
+
+        self.assertEqual(self.databases.first(), next(resources))
+        self.assertEqual(1, list_page.call_count)
+
+    def test_unpaginated_list(self):
+        list_page = mock.Mock(return_value=self.databases.list())
+
+        self.assertEqual(self.databases.list(), list(
+            api.pagination.paginate(list_page, self.request)))
+        list_page.assert_called_once_with(self.request)
@@ -0,0 +1,79 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from troveclient import common
+
+from trove_dashboard import api
+from trove_dashboard.api.rest import trove as rest_trove
+from trove_dashboard.test import helpers as test
+
+
+class BackupsRestTests(test.APITestCase):
+    def _ajax_request(self, **params):
+        request = self.factory.get('/', params,
+                                   HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        request.user = self.request.user
+        return request
+
+    @test.create_mocks({api.trove: ('backup_list', 'instance_get')})
+    def test_get_looks_up_each_instance_once(self):
+        backups = self.database_backups.list()
+        deleted_id = backups[0].instance_id
+        instance = self.databases.first()
+
+        def instance_get(request, instance_id):
+            if instance_id == deleted_id:
+                raise self.exceptions.trove
+            return instance
+
+        self.mock_backup_list.return_value = common.Paginated(backups)
+        self.mock_instance_get.side_effect = instance_get
+
+        response = rest_trove.Backups().get(self._ajax_request())
+
+        self.assertEqual(200, response.status_code)
+        content = json.loads(response.content)['items']
+        self.assertEqual([b.id for b in backups],
+                         [b['id'] for b in content])
+        self.assertEqual(deleted_id, content[0]['database'])
+        self.assertEqual(instance.name, content[-1]['database'])
+        instance_ids = set(b.instance_id for b in backups if b.instance_id)
+        self.assertEqual(len(instance_ids),
+                         self.mock_instance_get.call_count)
+
+    @test.create_mocks({api.trove: ('backup_list', 'instance_get')})
+    def test_get_page(self):
+        backups = self.database_backups.list()[:1]
+        self.mock_backup_list.return_value = common.Paginated(
+            backups, next_marker=backups[0].id)
+        self.mock_instance_get.return_value = self.databases.first()
+
+        response = rest_trove.Backups().get(
+            self._ajax_request(limit=1, marker='previous'))
+
+        self.assertEqual(200, response.status_code)
+        content = json.loads(response.content)
+        self.assertTrue(content['has_more_data'])
+        self.assertEqual([backups[0].id],
+                         [b['id'] for b in content['items']])
+        self.mock_backup_list.assert_called_once_with(
+            test.IsHttpRequest(), marker='previous', limit=1)
+
+    @test.create_mocks({api.trove: ('backup_list',)})
+    def test_get_invalid_limit(self):
+        for limit in ('ten', '-1'):
+            response = rest_trove.Backups().get(
+                self._ajax_request(limit=limit))
+            self.assertEqual(400, response.status_code)
+        self.mock_backup_list.assert_not_called()
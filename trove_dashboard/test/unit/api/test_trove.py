@@ -0,0 +1,196 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+from unittest import mock
+
+from django.utils import timezone
+
+from trove_dashboard import api
+from trove_dashboard.test import helpers as test
+
+
+class ClientPoolTests(test.APITestCase):
+    def setUp(self):
+        super(ClientPoolTests, self).setUp()
+        self.pool = api.trove.ClientPool(2)
+        self.expires = timezone.now() + datetime.timedelta(hours=1)
+
+    def test_get_reuses_client(self):
+        factory = mock.Mock(side_effect=lambda: object())
+
+        first = self.pool.get(('token', 'region', 'url'), self.expires,
+                              factory)
+        second = self.pool.get(('token', 'region', 'url'), self.expires,
+                               factory)
+
+        self.assertIs(first, second)
+        factory.assert_called_once_with()
+
+    def test_get_rebuilds_expired_client(self):
+        factory = mock.Mock(side_effect=lambda: object())
+        expired = timezone.now() - datetime.timedelta(seconds=1)
+
+        first = self.pool.get(('token', 'region', 'url'), expired, factory)
+        second = self.pool.get(('token', 'region', 'url'), self.expires,
+                               factory)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(2, factory.call_count)
+
+    def test_get_evicts_least_recently_used(self):
+        factory = mock.Mock(side_effect=lambda: object())
+
+        first = self.pool.get('a', self.expires, factory)
+        self.pool.get('b', self.expires, factory)
+        # Touch 'a' so 'b' becomes the least recently used entry.
+        self.pool.get('a', self.expires, factory)
+        self.pool.get('c', self.expires, factory)
+
+        self.assertEqual(2, len(self.pool))
+        self.assertIs(first, self.pool.get('a', self.expires, factory))
+        self.assertEqual(3, factory.call_count)
+
+    @mock.patch.object(api.trove.base, 'url_for',
+                       return_value='http://trove.example.com:8779/v1.0')
+    def test_troveclient_shared_between_requests(self, mock_url_for):
+        api.trove._client_pool.clear()
+        other_request = self.factory.get('/')
+        other_request.user = self.request.user
+
+        client = api.trove.troveclient(self.request)
+
+        self.assertIs(client, api.trove.troveclient(other_request))
+
+
+class UserAccessCacheTests(test.APITestCase):
+    def setUp(self):
+        super(UserAccessCacheTests, self).setUp()
+        patcher = mock.patch.object(api.trove, 'troveclient')
+        self.users = patcher.start().return_value.users
+        self.addCleanup(patcher.stop)
+        self.users.list_access.return_value = []
+        self.access_user = ('user1', None)
+
+    def _list_access(self):
+        return api.trove.user_list_access_many(self.request, 'id',
+                                               [self.access_user])
+
+    def test_invalidated_after_grant(self):
+        self._list_access()
+        api.trove.user_grant_access(self.request, 'id', 'user1', ['db1'])
+        self._list_access()
+
+        self.assertEqual(2, self.users.list_access.call_count)
+
+    def test_kept_when_grant_fails(self):
+        self._list_access()
+        self.users.grant.side_effect = self.exceptions.trove
+        self.assertRaises(type(self.exceptions.trove),
+                          api.trove.user_grant_access,
+                          self.request, 'id', 'user1', ['db1'])
+        self._list_access()
+
+        self.assertEqual(1, self.users.list_access.call_count)
+
+
+class PublishedLogTests(test.APITestCase):
+    def setUp(self):
+        super(PublishedLogTests, self).setUp()
+        self.objects = {
+            'log/1': b''.join(b'old %d\n' % i for i in range(100)),
+            'log/2': b''.join(b'new %d\n' % i for i in range(100)),
+        }
+        self.swift = mock.Mock()
+        self.swift.get_container.return_value = ({}, [
+            {'name': 'log/1', 'bytes': len(self.objects['log/1']),
+             'last_modified': '2016-01-01T00:00:00'},
+            {'name': 'log/2', 'bytes': len(self.objects['log/2']),
+             'last_modified': '2016-01-02T00:00:00'},
+            {'name': 'log/metafile', 'bytes': 10,
+             'last_modified': '2016-01-02T00:00:00'},
+        ])
+        self.swift.get_object.side_effect = self._get_object
+        log_info = mock.Mock(container='logs', prefix='log/',
+                             metafile='log/metafile')
+        patcher = mock.patch.object(api.trove, 'troveclient')
+        troveclient = patcher.start()
+        self.addCleanup(patcher.stop)
+        troveclient.return_value.instances.log_show.return_value = log_info
+
+    def _get_object(self, container, name, headers):
+        start, end = headers['Range'][len('bytes='):].split('-')
+        return {}, self.objects[name][int(start):int(end) + 1]
+
+    def _tail(self, lines):
+        return ''.join(api.trove.log_tail(self.request, 'id', 'guest.log',
+                                          lines, self.swift)())
+
+    @mock.patch.object(api.trove, 'LOG_TAIL_BLOCK_SIZE', 64)
+    def test_tail_reads_trailing_ranges(self):
+        self.assertEqual('new 97\nnew 98\nnew 99\n', self._tail(3))
+
+        # Only the end of the newest object is read.
+        self.swift.get_object.assert_called_once_with(
+            'logs', 'log/2', headers={'Range': 'bytes=626-689'})
+
+    @mock.patch.object(api.trove, 'LOG_TAIL_BLOCK_SIZE', 64)
+    def test_tail_spanning_objects(self):
+        tail = self._tail(102).splitlines()
+
+        self.assertEqual(102, len(tail))
+        self.assertEqual(['old 98', 'old 99', 'new 0'], tail[:3])
+        self.assertEqual('new 99', tail[-1])
+        read = [call[0][1] for call in self.swift.get_object.call_args_list]
+        self.assertNotIn('log/metafile', read)
+
+    def test_follow_without_cursor_returns_end(self):
+        self.assertEqual(('', (1, 690)), api.trove.log_follow(
+            self.request, 'id', 'guest.log', self.swift))
+        self.swift.get_object.assert_not_called()
+
+    def test_follow_from_cursor(self):
+        data, cursor = api.trove.log_follow(self.request, 'id', 'guest.log',
+                                            self.swift, (0, 683))
+
+        self.assertEqual('old 99\n' + self.objects['log/2'].decode(), data)
+        self.assertEqual((1, 690), cursor)
+        self.assertEqual(('', (1, 690)), api.trove.log_follow(
+            self.request, 'id', 'guest.log', self.swift, cursor))
+
+    @mock.patch.object(api.trove, 'LOG_FOLLOW_MAX_BYTES', 10)
+    def test_follow_stops_at_line_end(self):
+        data, cursor = api.trove.log_follow(self.request, 'id', 'guest.log',
+                                            self.swift, (1, 0))
+
+        self.assertEqual('new 0\n', data)
+        self.assertEqual((1, 6), cursor)
+
+    def test_stream(self):
+        self.swift.get_object.side_effect = (
+            lambda container, name, resp_chunk_size: (
+                {}, iter([self.objects[name]])))
+
+        data = b''.join(api.trove.log_stream(self.request, 'id', 'guest.log',
+                                             self.swift))
+
+        self.assertEqual(self.objects['log/1'] + self.objects['log/2'], data)
+
+    def test_tail_whole_log_streamed(self):
+        self.swift.get_object.side_effect = (
+            lambda container, name, resp_chunk_size: (
+                {}, iter([self.objects[name][:5], self.objects[name][5:]])))
+
+        self.assertEqual(
+            (self.objects['log/1'] + self.objects['log/2']).decode(),
+            self._tail(0))
+        self.assertEqual(2, self.swift.get_object.call_count)
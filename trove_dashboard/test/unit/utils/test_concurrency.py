@@ -0,0 +1,78 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+from unittest import mock
+
+from django import test
+
+from trove_dashboard.utils import concurrency
+
+
+class CallParallelTests(test.SimpleTestCase):
+    def test_results_and_errors(self):
+        def func(item):
+            if item == 'bad':
+                raise ValueError(item)
+            return item.upper()
+
+        results, errors = concurrency.call_parallel(func,
+                                                    ['a', 'bad', 'b'])
+
+        self.assertEqual({'a': 'A', 'b': 'B'}, results)
+        self.assertEqual(['bad'], list(errors))
+        self.assertIsInstance(errors['bad'], ValueError)
+
+    def test_duplicates_called_once(self):
+        func = mock.Mock(side_effect=lambda item: item)
+
+        results, errors = concurrency.call_parallel(func, [1, 2, 1, 2])
+
+        self.assertEqual({1: 1, 2: 2}, results)
+        self.assertEqual(2, func.call_count)
+
+    def test_no_items(self):
+        self.assertEqual(({}, {}), concurrency.call_parallel(None, []))
+
+    def test_timeout(self):
+        release = threading.Event()
+
+        def func(item):
+            if item == 'slow':
+                release.wait(5)
+            return item
+
+        try:
+            results, errors = concurrency.call_parallel(
+                func, ['slow', 'fast'], timeout=0.1)
+        finally:
+            release.set()
+
+        self.assertEqual({'fast': 'fast'}, results)
+        self.assertIsInstance(errors['slow'], concurrency.CallTimeout)
+
+    def test_timeout_of_queued_calls(self):
+        release = threading.Event()
+
+        def func(item):
+            release.wait(5)
+            return item
+
+        try:
+            results, errors = concurrency.call_parallel(
+                func, ['hung', 'queued'], max_workers=1, timeout=0.1)
+        finally:
+            release.set()
+
+        self.assertEqual({}, results)
+        self.assertIsInstance(errors['hung'], concurrency.CallTimeout)
+        self.assertIsInstance(errors['queued'], concurrency.CallTimeout)
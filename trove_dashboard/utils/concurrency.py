@@ -0,0 +1,76 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+import time
+
+from django.conf import settings
+
+# Upper bound of concurrent API calls issued on behalf of a single request
+MAX_WORKERS = getattr(settings, 'TROVE_API_MAX_WORKERS', 10)
+# Seconds the API calls issued together may take before their results are
+# abandoned
+CALL_TIMEOUT = getattr(settings, 'TROVE_API_CALL_TIMEOUT', 30)
+
+
+class CallTimeout(Exception):
+    pass
+
+
+def call_parallel(func, items, max_workers=None, timeout=None):
+    """Call func once for every distinct item on a bounded thread pool.
+
+    :param func: callable taking a single item.
+    :param items: iterable of hashable items, duplicates are called once.
+    :param max_workers: maximum number of concurrent calls.
+    :param timeout: seconds after which the calls still pending, whether
+        running or waiting for a worker, are given up.
+    :returns: a tuple (results, errors) of dicts keyed on item, holding
+        the value returned for every successful call and the exception
+        raised (or CallTimeout) for every failed one.
+    """
+    items = list(dict.fromkeys(items))
+    results = {}
+    errors = {}
+    if not items:
+        return results, errors
+
+    max_workers = min(max_workers or MAX_WORKERS, len(items))
+    timeout = timeout or CALL_TIMEOUT
+    deadline = time.monotonic() + timeout
+
+    executor = futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        pending = dict((executor.submit(func, item), item)
+                       for item in items)
+        while pending:
+            done, _ = futures.wait(
+                pending, timeout=max(deadline - time.monotonic(), 0),
+                return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                try:
+                    results[item] = future.result()
+                except Exception as e:
+                    errors[item] = e
+            if pending and time.monotonic() >= deadline:
+                # Running workers can't be interrupted, their results are
+                # simply not waited for anymore, queued calls are dropped.
+                for item in pending.values():
+                    errors[item] = CallTimeout(
+                        'Call for %s timed out after %s seconds'
+                        % (item, timeout))
+                pending = {}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results, errors
@@ -0,0 +1,243 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Batched AJAX updates of table rows, compact rows and server filters.
+
+Horizon refreshes every row in a transitional status with its own request
+per poll interval. Rows of the tables below are refreshed instead with a
+single request per table which returns all of them, see
+``horizon.trove.tables.js`` for the polling side.
+"""
+import collections
+import logging
+from urllib.parse import urlencode
+
+from django import http
+
+from horizon import exceptions
+from horizon import tables
+from horizon.tables import actions as table_actions
+from horizon.utils import functions as utils
+from horizon.utils import http as http_utils
+
+from trove_dashboard import exceptions as trove_exceptions
+from trove_dashboard.utils import concurrency
+
+LOG = logging.getLogger(__name__)
+
+
+class BatchUpdateRow(tables.Row):
+    """Row refreshed together with the other rows of its table.
+
+    ``get_page_data`` returns the listing the rows most likely belong to,
+    from a single call. Rows not found in it are retrieved with
+    ``get_data`` concurrently, as for a plain AJAX row.
+    """
+    ajax = True
+    batch_update_action_name = "rows_update"
+
+    def load_cells(self, datum=None):
+        super(BatchUpdateRow, self).load_cells(datum)
+        if self.ajax:
+            # Keep horizon from polling this row on its own.
+            self.classes.remove("ajax-update")
+            self.classes.append("ajax-batch-update")
+            self.attrs['data-batch-update-url'] = (
+                self.get_batch_update_url())
+
+    def get_batch_update_url(self):
+        table_url = self.table.get_absolute_url()
+        marker_name = self.table._meta.pagination_param
+        marker = self.table.request.GET.get(marker_name, None)
+        request_params = [
+            ("action", self.batch_update_action_name),
+            ("table", self.table.name),
+        ]
+        if marker:
+            request_params.append((marker_name, marker))
+        params = urlencode(collections.OrderedDict(request_params))
+        return "%s?%s" % (table_url, params)
+
+    def get_page_data(self, request, marker=None):
+        """Return the listing the refreshed rows are taken from."""
+        return []
+
+    def extra_data(self, request, datum):
+        """Complete a datum taken from ``get_page_data``."""
+        return datum
+
+    def get_data_many(self, request, obj_ids):
+        """Return a tuple (data, deleted) for the given row ids.
+
+        ``data`` maps the id of every row which could be refreshed to its
+        datum and ``deleted`` lists the ids of the rows whose object no
+        longer exists. Rows in neither are left as they are.
+        """
+        marker = request.GET.get(self.table._meta.pagination_param)
+        data = {}
+        for datum in self.get_page_data(request, marker=marker):
+            obj_id = str(self.table.get_object_id(datum))
+            if obj_id in obj_ids:
+                data[obj_id] = self.extra_data(request, datum)
+
+        missing_ids = [obj_id for obj_id in obj_ids if obj_id not in data]
+        found, errors = concurrency.call_parallel(
+            lambda obj_id: self.get_data(request, obj_id), missing_ids)
+        data.update(found)
+        deleted = []
+        for obj_id, error in errors.items():
+            if isinstance(error, trove_exceptions.NOT_FOUND):
+                deleted.append(obj_id)
+            else:
+                LOG.warning('Unable to refresh row %(id)s: %(error)s',
+                            {'id': obj_id, 'error': error})
+        return data, deleted
+
+
+class RowProjection(object):
+    """Compact view of a resource holding only what its table renders.
+
+    Subclasses name in ``__slots__`` the attributes read by the columns
+    and row actions of their table, these are the only ones copied from
+    the resource. Attributes the resource does not have are left unset,
+    so ``hasattr`` checks behave as they do on the resource. Keyword
+    arguments set further attributes, e.g. a flavor shared by the rows.
+    """
+    __slots__ = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(name for klass in reversed(cls.__mro__)
+                            for name in getattr(klass, '__slots__', ()))
+
+    def __init__(self, resource, **attrs):
+        for name in self._fields:
+            if name in attrs:
+                continue
+            try:
+                value = getattr(resource, name)
+            except AttributeError:
+                continue
+            setattr(self, name, value)
+        for name, value in attrs.items():
+            setattr(self, name, value)
+
+    def __repr__(self):
+        return '<%s %s>' % (self.__class__.__name__,
+                            getattr(self, 'id', None))
+
+
+class BatchUpdateTableMixin(object):
+    """Table answering batched row updates of ``BatchUpdateRow`` rows."""
+
+    def __init__(self, request, *args, **kwargs):
+        super(BatchUpdateTableMixin, self).__init__(request, *args, **kwargs)
+        # Rendered rows need the same multi select column as the page.
+        row_class = self._meta.row_class
+        if (request.GET.get('action') ==
+                getattr(row_class, 'batch_update_action_name', None)):
+            batch_actions = [action for action in self.get_table_actions()
+                             if isinstance(action, table_actions.BatchAction)]
+            self.set_multiselect_column_visibility(bool(batch_actions))
+
+    def maybe_preempt(self):
+        table_name, action_name, obj_id = self.check_handler(self.request)
+        row_class = self._meta.row_class
+        if (table_name == self.name and
+                http_utils.is_ajax(self.request) and action_name ==
+                getattr(row_class, 'batch_update_action_name', None)):
+            return self.handle_batch_update()
+        return super(BatchUpdateTableMixin, self).maybe_preempt()
+
+    def handle_batch_update(self):
+        request = self.request
+        obj_ids = request.GET.getlist('obj_id')
+        try:
+            data, deleted = self._meta.row_class(self).get_data_many(
+                request, obj_ids)
+        except Exception:
+            error = exceptions.handle(request, ignore=True)
+            return http.HttpResponse(status=error.status_code)
+        # Columns resolving the resources the rows refer to do it once for
+        # all the refreshed rows, as they do for a page.
+        self.data = list(data.values())
+        rows = {}
+        for obj_id, datum in data.items():
+            row = self._meta.row_class(self)
+            row.load_cells(datum)
+            rows[obj_id] = row.render()
+        return http.JsonResponse({'rows': rows, 'deleted': deleted})
+
+
+class SnapshotFilterAction(tables.FilterAction):
+    """Server side filter of a table shown by a SnapshotFilterMixin view.
+
+    Fields flagged as API filters in ``filter_choices`` are passed to the
+    list call, the others are looked up in a snapshot of the listing.
+    """
+    filter_type = "server"
+
+    def filter(self, table, data, filter_string):
+        # The view only returns the matching rows.
+        return data
+
+
+class SnapshotFilterMixin(object):
+    """Table view answering the filters the list API lacks.
+
+    Views define ``get_snapshot``, returning a cached ResourceIndex of the
+    whole listing. When the table is filtered on a field which is not an
+    API filter, the rows are the resources of that snapshot whose value
+    for that field contains the filter string. They are paginated like
+    the listing.
+    """
+    _more = False
+
+    def get_snapshot_filter(self):
+        """Return the (field, string) filter on the snapshot, or None."""
+        filter_actions = [action for action in self.table.get_table_actions()
+                          if isinstance(action, SnapshotFilterAction)]
+        if not filter_actions:
+            return None
+        field = self.table.get_filter_field()
+        string = (self.table.get_filter_string() or '').strip()
+        if (not field or not string or
+                filter_actions[0].is_api_filter(field)):
+            return None
+        return field, string
+
+    def get_snapshot_data(self, field, string):
+        matches = self.get_snapshot().search(field, string)
+        marker = self.request.GET.get(self.table._meta.pagination_param)
+        if marker:
+            ids = [resource.id for resource in matches]
+            if marker in ids:
+                matches = matches[ids.index(marker) + 1:]
+        page_size = utils.get_page_size(self.request)
+        self._more = len(matches) > page_size
+        return matches[:page_size]
+
+    def get_current_data(self, field, string, get_many):
+        """Return the page of snapshot matches as they are now.
+
+        The snapshot can be out of date, the matches are retrieved again
+        with ``get_many(request, ids)`` and those which were deleted or no
+        longer match the filter are left out.
+        """
+        matches = self.get_snapshot_data(field, string)
+        found = get_many(self.request,
+                         [resource.id for resource in matches])
+        snapshot = self.get_snapshot()
+        return [found[resource.id] for resource in matches
+                if resource.id in found and
+                snapshot.match(field, found[resource.id], string)]